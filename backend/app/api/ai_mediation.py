@@ -1,51 +1,59 @@
 """AI Mediation endpoints."""
 
+import json
 import logging
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
 
 from bson import ObjectId
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import (
+    AuthContext,
+    get_auth_context,
+    get_couple_context,
+    has_couple_access,
+)
 from app.api.schemas import (
     AICheckInsResponse,
     AIGoalsResponse,
+    JobAccepted,
 )
 from app.core.limiter import limiter
-from app.core.sanitization import validate_object_id
+from app.core.sanitization import PyObjectId
 from app.db.database import get_database
 from app.models.argument import ArgumentInDB, ArgumentPriority, ArgumentStatus
-from app.models.couple import CoupleInDB
+from app.models.job import JobType
 from app.models.perspective import PerspectiveInDB
-from app.models.user import UserInDB
 from app.services.ai_service import ai_service
 from app.services.ai_suggestion_cache import ai_suggestion_cache_service
+from app.services.couple_service import find_couple_for_user
+from app.services.couple_summary_service import couple_summary_service
+from app.services.job_queue import job_queue_service
+from app.services.llm_router import LLMUnavailableError
+from app.services.safety_service import safety_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/ai", tags=["AI Mediation"])
 
 
-@router.post("/arguments/{argument_id}/analyze")
-@limiter.limit("10/hour")  # Prevent API cost abuse - 10 analyses per hour per IP
-async def analyze_argument(
-    request: Request,
-    argument_id: str,
-    current_user: UserInDB = Depends(get_current_user),
-    db: AsyncIOMotorDatabase = Depends(get_database)
-):
-    """Trigger AI mediation analysis for an argument."""
-    
-    # Validate ObjectId
-    try:
-        validated_argument_id = validate_object_id(argument_id)
-        argument_oid = ObjectId(validated_argument_id)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    
+async def _load_analysis_inputs(
+    argument_oid: ObjectId,
+    ctx: AuthContext,
+    db: AsyncIOMotorDatabase
+) -> Tuple[str, ObjectId, ArgumentInDB, str, str, Dict]:
+    """
+    Validate that an argument can be analyzed and collect both perspectives.
+
+    The safety check combines the verdicts stored when the perspectives were
+    submitted instead of rescanning them.
+
+    Returns:
+        (argument_id, argument ObjectId, argument, perspective_1, perspective_2, safety_check)
+    """
     # Get argument
     arg_doc = await db.arguments.find_one({"_id": argument_oid})
     if not arg_doc:
@@ -57,19 +65,17 @@ async def analyze_argument(
     argument = ArgumentInDB.from_mongo(arg_doc)
     
     # Verify user has access
-    couple_doc = await db.couples.find_one({
-        "_id": ObjectId(argument.couple_id),
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ]
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
+    if ctx.couple_id == argument.couple_id:
+        couple = ctx.couple
+    else:
+        couple = await find_couple_for_user(
+            ctx.user_id, db, couple_id=argument.couple_id, active_only=False
         )
+        if not couple:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
     
     # Check if both perspectives exist
     perspectives_cursor = db.perspectives.find({"argument_id": argument_oid})
@@ -94,25 +100,110 @@ async def analyze_argument(
             detail="AI analysis already exists for this argument"
         )
     
-    # Get couple to identify which perspective belongs to which user
-    couple = CoupleInDB.from_mongo(couple_doc)
-    
-    # Identify perspectives
+    # Identify which perspective belongs to which user
     perspective_1 = None
     perspective_2 = None
     
     for persp in perspectives_list:
         if persp.user_id == couple.user1_id:
-            perspective_1 = persp.content
+            perspective_1 = persp
         elif persp.user_id == couple.user2_id:
-            perspective_2 = persp.content
+            perspective_2 = persp
     
     if not perspective_1 or not perspective_2:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Both partners must submit perspectives"
         )
-    
+
+    safety_check = safety_service.combine_verdicts(
+        safety_service.verdict_for(perspective_1),
+        safety_service.verdict_for(perspective_2)
+    )
+
+    return (
+        str(argument_oid), argument_oid, argument,
+        perspective_1.content, perspective_2.content, safety_check
+    )
+
+
+def _safety_block_exception(error_msg: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={
+            "error": "safety_concern",
+            "message": error_msg.replace("SAFETY_BLOCK: ", ""),
+            "action": "show_crisis_resources"
+        }
+    )
+
+
+async def _enqueue_analysis(
+    ctx: AuthContext,
+    argument_id: str,
+    argument: ArgumentInDB,
+    perspective_1: str,
+    perspective_2: str,
+    safety_check: Dict,
+    db: AsyncIOMotorDatabase
+) -> JSONResponse:
+    """Queue a mediation job (reusing one already in flight) and answer 202."""
+    # Safety blocks are answered now rather than discovered by the worker
+    try:
+        ai_service.build_mediation_request(
+            perspective_1, perspective_2, argument.category.value, safety_check=safety_check
+        )
+    except ValueError as e:
+        error_msg = str(e)
+        logger.warning(f"Safety block triggered for argument {argument_id}: {error_msg}")
+        raise _safety_block_exception(error_msg)
+
+    job = await job_queue_service.find_active(
+        JobType.MEDIATE_ARGUMENT, {"argument_id": argument_id}, db
+    )
+    if job is None:
+        job = await job_queue_service.enqueue(
+            JobType.MEDIATE_ARGUMENT,
+            # Only references: the worker re-reads the perspectives and their verdicts
+            {"argument_id": argument_id, "category": argument.category.value},
+            db,
+            user_id=ctx.user_id,
+            couple_id=argument.couple_id
+        )
+
+    status_url = f"/api/jobs/{job.id}"
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobAccepted(job_id=job.id, status=job.status.value, status_url=status_url).model_dump(),
+        headers={"Location": status_url},
+    )
+
+
+@router.post("/arguments/{argument_id}/analyze")
+@limiter.shared_limit("10/hour", scope="ai_analyze")  # Prevent API cost abuse - shared with /analyze/stream
+async def analyze_argument(
+    request: Request,
+    argument_id: PyObjectId,
+    background: bool = Query(False, description="Queue the analysis and return 202 with a job id"),
+    ctx: AuthContext = Depends(get_auth_context),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Trigger AI mediation analysis for an argument.
+
+    With ``background=true`` the analysis is queued for a job worker and the
+    response is 202 with a job id; poll ``GET /api/jobs/{job_id}`` for the
+    result (the same body this endpoint returns inline).
+    """
+    (
+        validated_argument_id, argument_oid, argument, perspective_1, perspective_2, safety_check
+    ) = await _load_analysis_inputs(argument_id, ctx, db)
+
+    if background:
+        return await _enqueue_analysis(
+            ctx, validated_argument_id, argument, perspective_1, perspective_2, safety_check, db
+        )
+
     # Generate AI insights
     try:
         insights = await ai_service.mediate_argument(
@@ -120,7 +211,9 @@ async def analyze_argument(
             perspective_1=perspective_1,
             perspective_2=perspective_2,
             category=argument.category.value,
-            db=db
+            db=db,
+            couple_id=argument.couple_id,
+            safety_check=safety_check
         )
         
         # Update argument status to analyzed
@@ -128,6 +221,9 @@ async def analyze_argument(
             {"_id": argument_oid},
             {"$set": {"status": ArgumentStatus.ANALYZED.value}}
         )
+        await couple_summary_service.argument_status_changed(
+            argument.couple_id, argument.id, ArgumentStatus.ANALYZED, db
+        )
         
         return insights
         
@@ -136,18 +232,13 @@ async def analyze_argument(
         # Check if this is a safety block
         if "SAFETY_BLOCK" in error_msg:
             logger.warning(f"Safety block triggered for argument {validated_argument_id}: {error_msg}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "error": "safety_concern",
-                    "message": error_msg.replace("SAFETY_BLOCK: ", ""),
-                    "action": "show_crisis_resources"
-                }
-            )
+            raise _safety_block_exception(error_msg)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=error_msg
         )
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"AI analysis failed: {e}")
         raise HTTPException(
@@ -156,26 +247,78 @@ async def analyze_argument(
         )
 
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/arguments/{argument_id}/analyze/stream")
+@limiter.shared_limit("10/hour", scope="ai_analyze")
+async def analyze_argument_stream(
+    request: Request,
+    argument_id: PyObjectId,
+    ctx: AuthContext = Depends(get_auth_context),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Streaming variant of analyze_argument (Server-Sent Events).
+
+    Emits a `field` event ({"name", "value"}) for each part of the analysis
+    as soon as the model has finished writing it, then a `done` event with
+    the same body analyze_argument returns once the insight is saved. On
+    failure an `error` event is sent and nothing is persisted.
+    """
+    (
+        validated_argument_id, argument_oid, argument, perspective_1, perspective_2, safety_check
+    ) = await _load_analysis_inputs(argument_id, ctx, db)
+
+    # Safety pre-check runs before the stream opens so it can still be a 400
+    try:
+        payload, safety_check = ai_service.build_mediation_request(
+            perspective_1, perspective_2, argument.category.value, safety_check=safety_check
+        )
+    except ValueError as e:
+        error_msg = str(e)
+        logger.warning(f"Safety block triggered for argument {validated_argument_id}: {error_msg}")
+        raise _safety_block_exception(error_msg)
+
+    async def event_stream():
+        try:
+            async for event, data in ai_service.stream_mediation(
+                validated_argument_id, payload, safety_check, db,
+                couple_id=argument.couple_id
+            ):
+                if event == "done":
+                    await db.arguments.update_one(
+                        {"_id": argument_oid},
+                        {"$set": {"status": ArgumentStatus.ANALYZED.value}}
+                    )
+                    await couple_summary_service.argument_status_changed(
+                        argument.couple_id, argument.id, ArgumentStatus.ANALYZED, db
+                    )
+                yield _sse(event, data)
+        except LLMUnavailableError as e:
+            yield _sse("error", {"detail": str(e), "retry_after": e.retry_after})
+        except Exception as e:
+            logger.error(f"Streaming AI analysis failed: {e}")
+            yield _sse("error", {"detail": "AI analysis failed"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/arguments/{argument_id}/insights")
 async def get_ai_insights(
-    argument_id: str,
-    current_user: UserInDB = Depends(get_current_user),
+    argument_id: PyObjectId,
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Get AI insights for an argument."""
     
-    # Validate ObjectId
-    try:
-        validated_argument_id = validate_object_id(argument_id)
-        argument_oid = ObjectId(validated_argument_id)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    
     # Verify access
-    arg_doc = await db.arguments.find_one({"_id": argument_oid})
+    arg_doc = await db.arguments.find_one({"_id": argument_id})
     
     if not arg_doc:
         raise HTTPException(
@@ -186,15 +329,7 @@ async def get_ai_insights(
     argument = ArgumentInDB.from_mongo(arg_doc)
     
     # Verify user has access
-    couple_doc = await db.couples.find_one({
-        "_id": ObjectId(argument.couple_id),
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ]
-    })
-    
-    if not couple_doc:
+    if not await has_couple_access(ctx, argument.couple_id, db):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
@@ -202,7 +337,7 @@ async def get_ai_insights(
     
     # Get AI insights
     insight_doc = await db.ai_insights.find_one({
-        "argument_id": argument_oid
+        "argument_id": argument_id
     })
     
     if not insight_doc:
@@ -231,63 +366,37 @@ async def get_ai_insights(
 @limiter.limit("10/hour")  # Rate limit to prevent abuse
 async def get_goal_suggestions(
     request: Request,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database),
 ):
     """
     Get AI-generated goal suggestions for the user's couple.
-    Returns cached suggestions if available, otherwise generates new ones synchronously.
+    Cached suggestions are returned even when stale (a refresh runs in the
+    background); only a couple with nothing cached waits for generation.
     """
-    couple = await get_user_couple(current_user, db)
-    suggestion_type = "goals"
+    couple = ctx.couple
 
-    # 1. Check cache first
-    cached = await ai_suggestion_cache_service.get_cached_suggestions(
-        couple.id, suggestion_type, db
-    )
-    
-    if cached:
-        return AIGoalsResponse(suggestions=cached.suggestions)
-
-    # 2. Cache miss - generate synchronously
-    try:
+    async def generate():
         # Get top 1-2 high-priority arguments
-        args_cursor = db.arguments.find({
+        arguments = await db.arguments.find({
             "couple_id": ObjectId(couple.id),
             "priority": {"$in": [ArgumentPriority.HIGH.value, ArgumentPriority.URGENT.value]},
             "status": {"$in": [ArgumentStatus.ACTIVE.value, ArgumentStatus.ANALYZED.value]}
-        }).sort("priority", -1).sort("created_at", -1).limit(2)
-        
-        arguments = await args_cursor.to_list(length=2)
-        
+        }).sort("priority", -1).sort("created_at", -1).limit(2).to_list(length=2)
+
         if not arguments:
-            # No high-priority arguments - return empty suggestions
-            return AIGoalsResponse(suggestions=[])
-        
-        # Convert to dict format for AI service
-        args_list = []
-        linked_ids = []
-        for arg_doc in arguments:
-            args_list.append(arg_doc)
-            linked_ids.append(str(arg_doc["_id"]))
-        
-        # Generate suggestions using AI service
-        suggestions, linked_argument_ids = await ai_service.generate_goal_suggestions(
-            args_list, db
-        )
-        
-        # Save to cache
-        await ai_suggestion_cache_service.save_suggestions(
-            couple.id,
-            suggestion_type,
-            suggestions,
-            linked_argument_ids,
-            db,
-            ai_model=ai_service.model
+            # No high-priority arguments - nothing to suggest
+            return None
+        return await ai_service.generate_goal_suggestions(arguments, db)
+
+    try:
+        suggestions = await ai_suggestion_cache_service.get_or_generate(
+            couple.id, "goals", generate, db, ai_model=ai_service.model
         )
-        
         return AIGoalsResponse(suggestions=suggestions)
-        
+
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Error generating goal suggestions: {e}", exc_info=True)
         raise HTTPException(
@@ -300,66 +409,38 @@ async def get_goal_suggestions(
 @limiter.limit("10/hour")  # Rate limit to prevent abuse
 async def get_checkin_suggestions(
     request: Request,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database),
 ):
     """
     Get AI-generated check-in questions for the user's couple.
-    Returns cached questions if available, otherwise generates new ones synchronously.
+    Cached questions are returned even when stale (a refresh runs in the
+    background); only a couple with nothing cached waits for generation.
     """
-    couple = await get_user_couple(current_user, db)
-    suggestion_type = "checkins"
+    couple = ctx.couple
 
-    # 1. Check cache first
-    cached = await ai_suggestion_cache_service.get_cached_suggestions(
-        couple.id, suggestion_type, db
-    )
-    
-    if cached:
-        return AICheckInsResponse(suggestions=cached.suggestions)
-
-    # 2. Cache miss - generate synchronously
-    try:
+    async def generate():
         # Get recent arguments from last 2-4 weeks
-        from datetime import datetime, timedelta
         weeks_ago = datetime.utcnow() - timedelta(weeks=4)
-        
-        args_cursor = db.arguments.find({
+        arguments = await db.arguments.find({
             "couple_id": ObjectId(couple.id),
             "created_at": {"$gte": weeks_ago},
             "status": {"$in": [ArgumentStatus.ACTIVE.value, ArgumentStatus.ANALYZED.value]}
-        }).sort("created_at", -1).limit(5)
-        
-        arguments = await args_cursor.to_list(length=5)
-        
+        }).sort("created_at", -1).limit(5).to_list(length=5)
+
         if not arguments:
-            # No recent arguments - return empty suggestions
-            return AICheckInsResponse(suggestions=[])
-        
-        # Convert to dict format for AI service
-        args_list = []
-        linked_ids = []
-        for arg_doc in arguments:
-            args_list.append(arg_doc)
-            linked_ids.append(str(arg_doc["_id"]))
-        
-        # Generate questions using AI service
-        suggestions, linked_argument_ids = await ai_service.generate_checkin_questions(
-            args_list, db
-        )
-        
-        # Save to cache
-        await ai_suggestion_cache_service.save_suggestions(
-            couple.id,
-            suggestion_type,
-            suggestions,
-            linked_argument_ids,
-            db,
-            ai_model=ai_service.model
+            # No recent arguments - nothing to suggest
+            return None
+        return await ai_service.generate_checkin_questions(arguments, db)
+
+    try:
+        suggestions = await ai_suggestion_cache_service.get_or_generate(
+            couple.id, "checkins", generate, db, ai_model=ai_service.model
         )
-        
         return AICheckInsResponse(suggestions=suggestions)
-        
+
+    except LLMUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Error generating check-in suggestions: {e}", exc_info=True)
         raise HTTPException(
@@ -368,37 +449,25 @@ async def get_checkin_suggestions(
         )
 
 
-
 @router.post("/arguments/{argument_id}/generate-goals", response_model=AIGoalsResponse)
 @limiter.limit("60/hour")
 async def generate_argument_goals(
     request: Request,
-    argument_id: str,
-    current_user: UserInDB = Depends(get_current_user),
+    argument_id: PyObjectId,
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database),
 ):
     """
     Generate goal suggestions based on a specific argument.
     """
-    # Validate and fetch argument
-    try:
-        validated_id = validate_object_id(argument_id)
-        arg_oid = ObjectId(validated_id)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    
-    arg_doc = await db.arguments.find_one({"_id": arg_oid})
+    arg_doc = await db.arguments.find_one({"_id": argument_id})
     if not arg_doc:
         raise HTTPException(status_code=404, detail="Argument not found")
         
     argument = ArgumentInDB.from_mongo(arg_doc)
     
     # Verify access
-    couple_doc = await db.couples.find_one({
-        "_id": ObjectId(argument.couple_id),
-        "$or": [{"user1_id": ObjectId(current_user.id)}, {"user2_id": ObjectId(current_user.id)}]
-    })
-    if not couple_doc:
+    if not await has_couple_access(ctx, argument.couple_id, db):
         raise HTTPException(status_code=403, detail="Access denied")
         
     # Reuse existing AI service logic with single argument
@@ -410,49 +479,23 @@ async def generate_argument_goals(
 @limiter.limit("60/hour")
 async def generate_argument_checkins(
     request: Request,
-    argument_id: str,
-    current_user: UserInDB = Depends(get_current_user),
+    argument_id: PyObjectId,
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database),
 ):
     """
     Generate check-in questions based on a specific argument.
     """
-    # Validate and fetch argument
-    try:
-        validated_id = validate_object_id(argument_id)
-        arg_oid = ObjectId(validated_id)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    
-    arg_doc = await db.arguments.find_one({"_id": arg_oid})
+    arg_doc = await db.arguments.find_one({"_id": argument_id})
     if not arg_doc:
         raise HTTPException(status_code=404, detail="Argument not found")
         
     argument = ArgumentInDB.from_mongo(arg_doc)
     
     # Verify access
-    couple_doc = await db.couples.find_one({
-        "_id": ObjectId(argument.couple_id),
-        "$or": [{"user1_id": ObjectId(current_user.id)}, {"user2_id": ObjectId(current_user.id)}]
-    })
-    if not couple_doc:
+    if not await has_couple_access(ctx, argument.couple_id, db):
         raise HTTPException(status_code=403, detail="Access denied")
         
     # Reuse existing AI service logic with single argument
     suggestions, _ = await ai_service.generate_checkin_questions([arg_doc], db)
     return AICheckInsResponse(suggestions=suggestions)
-
-
-async def get_user_couple(user: UserInDB, db: AsyncIOMotorDatabase) -> CoupleInDB:
-    """Helper to get the couple associated with the current user."""
-    couple_doc = await db.couples.find_one({
-        "$or": [{"user1_id": ObjectId(user.id)}, {"user2_id": ObjectId(user.id)}],
-        "status": "active"
-    })
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Active couple not found for this user."
-        )
-    return CoupleInDB.from_mongo(couple_doc)
-
@@ -7,18 +7,25 @@ from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import (
+    AuthContext,
+    get_auth_context,
+    has_couple_access,
+    sparse_fields,
+)
 from app.api.schemas import ArgumentCreate, ArgumentResponse, ArgumentUpdate
-from app.core.sanitization import sanitize_text, validate_object_id
+from app.core.pagination import NEXT_CURSOR_HEADER, created_at_keyset
+from app.core.responses import ORJSONResponse, public_document
+from app.core.sanitization import PyObjectId, sanitize_text
 from app.db.database import get_database
+from app.db.repositories import argument_repository
 from app.models.argument import (
     ArgumentCategory,
     ArgumentInDB,
     ArgumentPriority,
     ArgumentStatus,
 )
-from app.models.couple import CoupleStatus
-from app.models.user import UserInDB
+from app.services.couple_summary_service import couple_summary_service
 
 router = APIRouter(prefix="/api/arguments", tags=["Arguments"])
 
@@ -26,7 +33,7 @@ router = APIRouter(prefix="/api/arguments", tags=["Arguments"])
 @router.post("/create", response_model=ArgumentResponse, status_code=status.HTTP_201_CREATED)
 async def create_argument(
     argument_data: ArgumentCreate,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Create a new argument."""
@@ -41,33 +48,24 @@ async def create_argument(
         )
     
     # Verify user is in an active couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
+    if not ctx.couple:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You must be in an active couple to create arguments"
         )
     
-    from app.models.couple import CoupleInDB
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     
     # Check usage limits
     from app.models.usage import UsageType
-    from app.services.subscription_service import subscription_service
     from app.services.usage_service import usage_service
     
-    subscription = await subscription_service.get_or_create_subscription(couple.id, db)
+    summary = await couple_summary_service.get(couple.id, db)
+    subscription = summary.subscription
     
     # Check if we can create an argument
-    is_allowed, current_count, limit = await usage_service.check_usage_limit(
-        couple.id, UsageType.ARGUMENT_RESOLUTION, subscription, db
+    is_allowed, current_count, limit = couple_summary_service.check_usage_limit(
+        summary, UsageType.ARGUMENT_RESOLUTION
     )
     
     if not is_allowed:
@@ -111,6 +109,7 @@ async def create_argument(
     
     result = await db.arguments.insert_one(argument.to_mongo())
     argument.id = str(result.inserted_id)
+    await couple_summary_service.argument_created(argument, db)
     
     # Invalidate suggestion cache when any new argument is created to ensure fresh insights
     from app.services.ai_suggestion_cache import ai_suggestion_cache_service
@@ -141,27 +140,25 @@ async def create_argument(
 async def get_arguments(
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = None,
     status_filter: Optional[str] = None,
     category_filter: Optional[str] = None,
-    current_user: UserInDB = Depends(get_current_user),
+    fields: Optional[List[str]] = Depends(sparse_fields(argument_repository, "response")),
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    """Get all arguments for current user's couple."""
+    """
+    Get all arguments for current user's couple, newest first.
+
+    Pages by ``cursor`` (the X-Next-Cursor header of the previous page) or,
+    for older clients, by ``offset``.
+    """
     
     # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
+    if not ctx.couple:
         return []
     
-    from app.models.couple import CoupleInDB
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     
     if limit < 1 or limit > 100:
         raise HTTPException(
@@ -173,56 +170,46 @@ async def get_arguments(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="offset must be >= 0"
         )
+    if cursor and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or offset, not both"
+        )
 
     query: Dict[str, Any] = {"couple_id": ObjectId(couple.id)}
     if status_filter:
         query["status"] = status_filter
     if category_filter:
         query["category"] = category_filter
+    try:
+        query.update(created_at_keyset.after(cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    cursor = (
-        db.arguments.find(query)
-        .sort("created_at", -1)
+    # Documents go to the serializer as stored; ids and datetimes are encoded on render
+    arg_docs = await (
+        argument_repository.find(db, query, "response", created_at_keyset.fields(fields))
+        .sort(created_at_keyset.sort)
         .skip(offset)
         .limit(limit)
-    )
-    arguments: List[ArgumentResponse] = []
+    ).to_list(length=limit)
+    next_cursor = created_at_keyset.next_cursor(arg_docs, limit)
 
-    async for arg_doc in cursor:
-        arg = ArgumentInDB.from_mongo(arg_doc)
-        arguments.append(ArgumentResponse(
-            id=arg.id,
-            couple_id=arg.couple_id,
-            title=arg.title,
-            category=arg.category.value,
-            priority=arg.priority.value,
-            status=arg.status.value,
-            created_at=arg.created_at,
-            updated_at=arg.updated_at
-        ))
-    
-    return arguments
+    response = ORJSONResponse([public_document(arg_doc, fields) for arg_doc in arg_docs])
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
 
 
 @router.get("/{argument_id}", response_model=ArgumentResponse)
 async def get_argument(
-    argument_id: str,
-    current_user: UserInDB = Depends(get_current_user),
+    argument_id: PyObjectId,
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Get a specific argument."""
     
-    # Validate ObjectId
-    try:
-        validated_argument_id = validate_object_id(argument_id)
-        argument_oid = ObjectId(validated_argument_id)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    
-    arg_doc = await db.arguments.find_one({"_id": argument_oid})
+    arg_doc = await db.arguments.find_one({"_id": argument_id})
     
     if not arg_doc:
         raise HTTPException(
@@ -233,15 +220,7 @@ async def get_argument(
     # Verify user has access to this argument (through couple)
     argument = ArgumentInDB.from_mongo(arg_doc)
     
-    couple_doc = await db.couples.find_one({
-        "_id": ObjectId(argument.couple_id),
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ]
-    })
-    
-    if not couple_doc:
+    if not await has_couple_access(ctx, argument.couple_id, db):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this argument"
@@ -261,25 +240,15 @@ async def get_argument(
 
 @router.patch("/{argument_id}/status", response_model=ArgumentResponse)
 async def update_argument_status(
-    argument_id: str,
+    argument_id: PyObjectId,
     status_update: ArgumentUpdate,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Update argument status."""
     
-    # Validate ObjectId
-    try:
-        validated_argument_id = validate_object_id(argument_id)
-        argument_oid = ObjectId(validated_argument_id)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    
     # Get argument and verify it exists
-    arg_doc = await db.arguments.find_one({"_id": argument_oid})
+    arg_doc = await db.arguments.find_one({"_id": argument_id})
     
     if not arg_doc:
         raise HTTPException(
@@ -290,15 +259,7 @@ async def update_argument_status(
     # Verify user has access to this argument (through couple)
     argument = ArgumentInDB.from_mongo(arg_doc)
     
-    couple_doc = await db.couples.find_one({
-        "_id": ObjectId(argument.couple_id),
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ]
-    })
-    
-    if not couple_doc:
+    if not await has_couple_access(ctx, argument.couple_id, db):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this argument"
@@ -323,12 +284,13 @@ async def update_argument_status(
     updated_at = datetime.utcnow()
     
     await db.arguments.update_one(
-        {"_id": argument_oid},
+        {"_id": argument_id},
         {"$set": {
             "status": new_status.value,
             "updated_at": updated_at
         }}
     )
+    await couple_summary_service.argument_status_changed(argument.couple_id, argument.id, new_status, db)
     
     # Return updated argument
     argument.status = new_status
@@ -348,24 +310,14 @@ async def update_argument_status(
 
 @router.delete("/{argument_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_argument(
-    argument_id: str,
-    current_user: UserInDB = Depends(get_current_user),
+    argument_id: PyObjectId,
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Delete an argument and all associated data."""
     
-    # Validate ObjectId
-    try:
-        validated_argument_id = validate_object_id(argument_id)
-        argument_oid = ObjectId(validated_argument_id)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    
     # Get argument and verify it exists
-    arg_doc = await db.arguments.find_one({"_id": argument_oid})
+    arg_doc = await db.arguments.find_one({"_id": argument_id})
     
     if not arg_doc:
         raise HTTPException(
@@ -376,25 +328,18 @@ async def delete_argument(
     # Verify user has access to this argument (through couple)
     argument = ArgumentInDB.from_mongo(arg_doc)
     
-    couple_doc = await db.couples.find_one({
-        "_id": ObjectId(argument.couple_id),
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ]
-    })
-    
-    if not couple_doc:
+    if not await has_couple_access(ctx, argument.couple_id, db):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this argument"
         )
     
     # Delete associated data: perspectives
-    await db.perspectives.delete_many({"argument_id": argument_oid})
+    await db.perspectives.delete_many({"argument_id": argument_id})
     
     # Delete the argument itself
-    await db.arguments.delete_one({"_id": argument_oid})
+    await db.arguments.delete_one({"_id": argument_id})
+    await couple_summary_service.argument_deleted(argument.couple_id, argument.id, db)
     
     return None
 
@@ -18,8 +18,15 @@ from app.api.schemas import (
     UserResponse,
 )
 from app.core.limiter import limiter
+from app.core.principal_cache import principal_cache
 from app.core.sanitization import sanitize_email, sanitize_text
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.security import (
+    PasswordHashingBusyError,
+    create_access_token,
+    get_password_hash_async,
+    needs_rehash,
+    verify_password_async,
+)
 from app.db.database import get_database
 from app.models.user import UserInDB
 from app.services.email_service import email_service
@@ -79,11 +86,14 @@ async def register(
             detail="You must accept the Privacy Policy to register"
         )
     
+    # Hash outside the try block so a saturated hashing pool surfaces as 503
+    password_hash = await get_password_hash_async(user_data.password)
+    
     try:
         # Create user document
         user = UserInDB(
             email=sanitized_email,
-            password_hash=get_password_hash(user_data.password),
+            password_hash=password_hash,
             name=sanitized_name,
             age=user_data.age,
             is_active=True,
@@ -147,13 +157,25 @@ async def login(
     # Verify password
     user = UserInDB.from_mongo(user_doc)
     
-    if not verify_password(form_data.password, user.password_hash):
+    if not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade hashes made with a different cost now that we have the plaintext
+    if needs_rehash(user.password_hash):
+        try:
+            new_hash = await get_password_hash_async(form_data.password)
+            await db.users.update_one(
+                {"_id": ObjectId(user.id), "password_hash": user.password_hash},
+                {"$set": {"password_hash": new_hash}}
+            )
+        except PasswordHashingBusyError:
+            # Not worth failing the login over; retry on a later login
+            pass
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -317,12 +339,13 @@ async def reset_password(
         )
         
     # Update password and clear token
-    hashed_password = get_password_hash(payload.new_password)
+    hashed_password = await get_password_hash_async(payload.new_password)
     await db.users.update_one(
         {"_id": user_doc["_id"]},
         {"$set": {"password_hash": hashed_password},
          "$unset": {"reset_password_token": "", "reset_password_expires": ""}}
     )
+    principal_cache.invalidate_user(str(user_doc["_id"]))
     
     return {"message": "Password successfully reset. You can now log in."}
 
@@ -2,17 +2,20 @@
 
 import logging
 from datetime import date, datetime, timedelta
+from typing import Optional
 
 from bson import ObjectId
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import AuthContext, get_couple_context
 from app.api.schemas import CheckInCreate, CheckInResponse
+from app.core.pagination import week_start_keyset
 from app.db.database import get_database
-from app.models.couple import CoupleInDB, CoupleStatus
+from app.models.job import JobType
 from app.models.relationship_checkin import CheckInStatus, RelationshipCheckInInDB
-from app.models.user import UserInDB
+from app.services.couple_summary_service import couple_summary_service
+from app.services.job_queue import job_queue_service
 
 logger = logging.getLogger(__name__)
 
@@ -30,27 +33,12 @@ def get_monday_of_week(target_date: date = None) -> date:
 
 @router.get("/current")
 async def get_current_checkin(
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Get current week's check-in for the user's couple."""
     
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
-    
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     
     # Get Monday of current week
     week_start = get_monday_of_week()
@@ -74,15 +62,16 @@ async def get_current_checkin(
         )
         result = await db.relationship_checkins.insert_one(checkin.to_mongo())
         checkin.id = str(result.inserted_id)
+        await couple_summary_service.checkin_changed(checkin.to_mongo(), db)
         
-    partner_id = couple.user1_id if current_user.id == couple.user2_id else couple.user2_id
+    partner_id = ctx.partner_id
     
     return CheckInResponse(
         id=checkin.id,
         couple_id=checkin.couple_id,
         week_start_date=checkin.week_start_date.isoformat(),
         status=checkin.status.value,
-        responses=checkin.user_responses.get(current_user.id),
+        responses=checkin.user_responses.get(ctx.user_id),
         partner_responses=checkin.user_responses.get(partner_id) if checkin.status == CheckInStatus.COMPLETED else None,
         completed_by=checkin.completed_by,
         completed_at=checkin.completed_at,
@@ -94,29 +83,13 @@ async def get_current_checkin(
 @router.post("/current/complete")
 async def complete_checkin(
     checkin_data: CheckInCreate,
-    background_tasks: BackgroundTasks,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Complete the current week's check-in."""
     
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
-    
-    couple = CoupleInDB.from_mongo(couple_doc)
-    partner_id = couple.user1_id if current_user.id == couple.user2_id else couple.user2_id
+    couple = ctx.couple
+    partner_id = ctx.partner_id
     
     # Get Monday of current week
     week_start = get_monday_of_week()
@@ -136,9 +109,9 @@ async def complete_checkin(
     checkin = RelationshipCheckInInDB.from_mongo(checkin_doc)
     
     # Update local object first to calculate new status
-    checkin.user_responses[current_user.id] = checkin_data.responses
-    if current_user.id not in checkin.completed_by:
-        checkin.completed_by.append(current_user.id)
+    checkin.user_responses[ctx.user_id] = checkin_data.responses
+    if ctx.user_id not in checkin.completed_by:
+        checkin.completed_by.append(ctx.user_id)
         
     is_fully_completed = partner_id in checkin.completed_by
     new_status = CheckInStatus.COMPLETED if is_fully_completed else CheckInStatus.AWAITING_PARTNER
@@ -146,7 +119,7 @@ async def complete_checkin(
     update_data = {
         "$set": {
             "status": new_status.value,
-            f"user_responses.{current_user.id}": checkin_data.responses,
+            f"user_responses.{ctx.user_id}": checkin_data.responses,
             "completed_by": checkin.completed_by,
             "updated_at": datetime.utcnow()
         }
@@ -154,14 +127,17 @@ async def complete_checkin(
     
     if is_fully_completed and not checkin.completed_at:
         update_data["$set"]["completed_at"] = datetime.utcnow()
-        # Trigger AI Harmony Report background task
-        from app.services.ai_service import ai_service
-        background_tasks.add_task(
-            ai_service.generate_harmony_report,
-            checkin_id=checkin.id,
-            db=db,
-            user1_responses=checkin.user_responses.get(couple.user1_id, {}),
-            user2_responses=checkin.user_responses.get(couple.user2_id, {})
+        # Queue the AI Harmony Report (durable across restarts, retried on failure)
+        await job_queue_service.enqueue(
+            JobType.HARMONY_REPORT,
+            {
+                "checkin_id": checkin.id,
+                "user1_responses": checkin.user_responses.get(couple.user1_id, {}),
+                "user2_responses": checkin.user_responses.get(couple.user2_id, {}),
+            },
+            db,
+            user_id=ctx.user_id,
+            couple_id=checkin.couple_id
         )
     
     await db.relationship_checkins.update_one(
@@ -171,6 +147,7 @@ async def complete_checkin(
     
     # Refresh object
     updated_doc = await db.relationship_checkins.find_one({"_id": ObjectId(checkin.id)})
+    await couple_summary_service.checkin_changed(updated_doc, db)
     checkin = RelationshipCheckInInDB.from_mongo(updated_doc)
     
     return CheckInResponse(
@@ -178,7 +155,7 @@ async def complete_checkin(
         couple_id=checkin.couple_id,
         week_start_date=checkin.week_start_date.isoformat(),
         status=checkin.status.value,
-        responses=checkin.user_responses.get(current_user.id),
+        responses=checkin.user_responses.get(ctx.user_id),
         partner_responses=checkin.user_responses.get(partner_id) if checkin.status == CheckInStatus.COMPLETED else None,
         completed_by=checkin.completed_by,
         completed_at=checkin.completed_at,
@@ -191,27 +168,18 @@ async def complete_checkin(
 async def get_checkin_history(
     limit: int = 10,
     offset: int = 0,
-    current_user: UserInDB = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    """Get check-in history for the user's couple."""
-    
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
+    """
+    Get check-in history for the user's couple, most recent week first.
+
+    Pages by ``cursor`` (``next_cursor`` of the previous page) or, for older
+    clients, by ``offset``.
+    """
     
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     
     if limit < 1 or limit > 50:
         raise HTTPException(
@@ -223,16 +191,24 @@ async def get_checkin_history(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="offset must be >= 0"
         )
+    if cursor and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or offset, not both"
+        )
+
+    query = {"couple_id": ObjectId(couple.id)}
+    try:
+        query.update(week_start_keyset.after(cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    cursor = (
-        db.relationship_checkins.find({
-            "couple_id": ObjectId(couple.id)
-        })
-        .sort("week_start_date", -1)
+    checkins_docs = await (
+        db.relationship_checkins.find(query)
+        .sort(week_start_keyset.sort)
         .skip(offset)
         .limit(limit)
-    )
-    checkins_docs = await cursor.to_list(length=limit)
+    ).to_list(length=limit)
     
     checkins = [RelationshipCheckInInDB.from_mongo(doc) for doc in checkins_docs]
     
@@ -248,6 +224,7 @@ async def get_checkin_history(
             }
             for checkin in checkins
         ],
-        "next_offset": next_offset
+        "next_offset": next_offset,
+        "next_cursor": week_start_keyset.next_cursor(checkins_docs, limit)
     }
 
@@ -9,7 +9,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel, EmailStr
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import (
+    AuthContext,
+    get_auth_context,
+    get_couple_context,
+    get_current_user,
+)
+from app.core.sanitization import PyObjectId
 from app.db.database import get_database
 from app.models.couple import CoupleInDB, CoupleStatus
 from app.models.invitation import InvitationInDB, InvitationStatus
@@ -29,7 +35,7 @@ class InviteRequest(BaseModel):
 @router.post("/invite")
 async def invite_partner(
     invite_data: InviteRequest,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Invite a partner to create a couple profile."""
@@ -37,15 +43,7 @@ async def invite_partner(
     partner_email = invite_data.partner_email.lower()
     
     # Check if user already has a couple
-    existing_couple = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if existing_couple:
+    if ctx.couple:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already have an active couple profile"
@@ -53,7 +51,7 @@ async def invite_partner(
     
     # Check if there's already a pending invitation
     existing_invitation = await db.invitations.find_one({
-        "inviter_id": ObjectId(current_user.id),
+        "inviter_id": ObjectId(ctx.user_id),
         "invitee_email": partner_email,
         "status": InvitationStatus.PENDING.value
     })
@@ -79,7 +77,7 @@ async def invite_partner(
     
     # Create invitation
     invitation = InvitationInDB(
-        inviter_id=current_user.id,
+        inviter_id=ctx.user_id,
         invitee_email=partner_email,
         token=invitation_token,
         status=InvitationStatus.PENDING,
@@ -93,7 +91,7 @@ async def invite_partner(
     # Send invitation email
     await email_service.send_invitation_email(
         to_email=partner_email,
-        inviter_name=current_user.name,
+        inviter_name=ctx.user.name,
         invitation_token=invitation_token
     )
     
@@ -106,7 +104,7 @@ async def invite_partner(
 
 @router.post("/resend-invitation/{invitation_id}")
 async def resend_invitation(
-    invitation_id: str,
+    invitation_id: PyObjectId,
     current_user: UserInDB = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
@@ -114,7 +112,7 @@ async def resend_invitation(
     
     # Find invitation
     invitation_doc = await db.invitations.find_one({
-        "_id": ObjectId(invitation_id),
+        "_id": invitation_id,
         "inviter_id": ObjectId(current_user.id)
     })
     
@@ -198,7 +196,7 @@ async def get_pending_invitations(
 @router.post("/accept-invitation/{token}")
 async def accept_invitation(
     token: str,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Accept a couple invitation."""
@@ -229,7 +227,7 @@ async def accept_invitation(
         )
     
     # Verify email matches
-    if invitation.invitee_email.lower() != current_user.email.lower():
+    if invitation.invitee_email.lower() != ctx.user.email.lower():
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="This invitation is for a different email address"
@@ -244,15 +242,7 @@ async def accept_invitation(
         )
     
     # Check if user already has a couple
-    existing_couple = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if existing_couple:
+    if ctx.couple:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already have an active couple profile"
@@ -261,7 +251,7 @@ async def accept_invitation(
     # Create couple profile
     couple = CoupleInDB(
         user1_id=invitation.inviter_id,
-        user2_id=current_user.id,
+        user2_id=ctx.user_id,
         status=CoupleStatus.ACTIVE
     )
     
@@ -293,26 +283,11 @@ async def accept_invitation(
 
 @router.get("/me")
 async def get_my_couple(
-    current_user: UserInDB = Depends(get_current_user),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    ctx: AuthContext = Depends(get_couple_context)
 ):
     """Get current user's couple profile."""
     
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
-    
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     
     return {
         "id": couple.id,
@@ -1,126 +1,55 @@
 """Dashboard overview endpoint for mobile/web clients."""
 
-from datetime import date, datetime, timedelta
-from typing import Any, Dict, Optional
+from datetime import date, timedelta
+from typing import Any, Dict
 
-from bson import ObjectId
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import AuthContext, get_couple_context
+from app.core.server_timing import ServerTiming
 from app.db.database import get_database
-from app.models.couple import CoupleInDB, CoupleStatus
 from app.models.relationship_checkin import CheckInStatus
 from app.models.usage import UsageType
-from app.models.user import UserInDB
+from app.services.couple_summary_service import couple_summary_service
 from app.services.subscription_service import subscription_service
-from app.services.usage_service import usage_service
 
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
-MAX_RECENT_ARGUMENTS = 5
-
-
-async def _get_couple(
-    user_id: str,
-    db: AsyncIOMotorDatabase,
-) -> Optional[CoupleInDB]:
-    couple_doc = await db.couples.find_one(
-        {
-            "$or": [
-                {"user1_id": ObjectId(user_id)},
-                {"user2_id": ObjectId(user_id)},
-            ],
-            "status": CoupleStatus.ACTIVE.value,
-        }
-    )
-    if not couple_doc:
-        return None
-    return CoupleInDB.from_mongo(couple_doc)
+MAX_DASHBOARD_GOALS = 5
 
 
 @router.get("/overview")
 async def get_dashboard_overview(
-    current_user: UserInDB = Depends(get_current_user),
+    response: Response,
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database),
 ):
-    """Aggregate data for dashboard home screen."""
-
-    couple = await _get_couple(user_id=current_user.id, db=db)
-    if not couple:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found",
-        )
-
-    subscription = await subscription_service.get_or_create_subscription(couple.id, db)
-    usage_count = await usage_service.get_usage_count(
-        couple.id, UsageType.ARGUMENT_RESOLUTION, subscription, db
-    )
-    limit = subscription_service.get_argument_limit(subscription)
-    period_start, period_end = usage_service.get_period_dates(subscription)
-
-    # Recent arguments
-    arguments_cursor = (
-        db.arguments.find({"couple_id": ObjectId(couple.id)})
-        .sort("created_at", -1)
-        .limit(MAX_RECENT_ARGUMENTS)
-    )
-    arguments = []
-    async for arg_doc in arguments_cursor:
-        arguments.append(
-            {
-                "id": str(arg_doc["_id"]),
-                "title": arg_doc.get("title", ""),
-                "priority": arg_doc.get("priority", ""),
-                "status": arg_doc.get("status", ""),
-                "category": arg_doc.get("category", ""),
-                "created_at": arg_doc.get("created_at"),
-            }
-        )
+    """
+    Aggregate data for dashboard home screen.
 
-    # Active goals
-    goals_cursor = (
-        db.relationship_goals.find(
-            {
-                "couple_id": ObjectId(couple.id),
-                "status": "active",
-            }
-        )
-        .sort("created_at", -1)
-        .limit(5)
-    )
-    goals = []
-    async for goal_doc in goals_cursor:
-        goals.append(
-            {
-                "id": str(goal_doc["_id"]),
-                "title": goal_doc.get("title", ""),
-                "status": goal_doc.get("status", ""),
-                "target_date": goal_doc.get("target_date"),
-            }
-        )
+    Everything comes from the couple's summary document: one indexed read,
+    however much history the couple has. Its duration is reported in the
+    Server-Timing header.
+    """
 
-    # Current check-in status
+    couple = ctx.couple
     today = date.today()
     week_start_date = today - timedelta(days=today.weekday())
-    current_week_start = datetime.combine(week_start_date, datetime.min.time())
-    checkin_doc = await db.relationship_checkins.find_one(
-        {
-            "couple_id": ObjectId(couple.id),
-            "week_start_date": current_week_start,
-        }
-    )
-    if not checkin_doc:
-        current_checkin = {
-            "status": CheckInStatus.PENDING.value,
-            "completed_at": None,
-        }
-    elif checkin_doc:
+
+    timing = ServerTiming()
+    summary = await timing.measure("summary", couple_summary_service.get(couple.id, db))
+    response.headers["Server-Timing"] = timing.header()
+
+    subscription = summary.subscription
+    limit = subscription_service.get_argument_limit(subscription)
+
+    checkin = summary.latest_checkin
+    if checkin and checkin.week_start_date.date() == week_start_date:
         current_checkin = {
-            "id": str(checkin_doc["_id"]),
-            "status": checkin_doc.get("status", ""),
-            "completed_at": checkin_doc.get("completed_at"),
+            "id": checkin.id,
+            "status": checkin.status,
+            "completed_at": checkin.completed_at,
         }
     else:
         current_checkin = {
@@ -137,14 +66,22 @@ async def get_dashboard_overview(
             "period_end": subscription.current_period_end,
         },
         "usage": {
-            "count": usage_count,
+            "count": couple_summary_service.usage_count(summary, UsageType.ARGUMENT_RESOLUTION),
             "limit": limit,
             "is_unlimited": limit == -1,
-            "period_start": period_start,
-            "period_end": period_end,
+            "period_start": summary.usage.period_start.date(),
+            "period_end": summary.usage.period_end.date(),
         },
-        "arguments": arguments,
-        "goals": goals,
+        "arguments": [argument.model_dump() for argument in summary.recent_arguments],
+        "goals": [
+            {
+                "id": goal.id,
+                "title": goal.title,
+                "status": goal.status,
+                "target_date": goal.target_date,
+            }
+            for goal in summary.active_goals[:MAX_DASHBOARD_GOALS]
+        ],
         "current_checkin": current_checkin,
         "week_start_date": week_start_date.isoformat(),
     }
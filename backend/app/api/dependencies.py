@@ -1,15 +1,24 @@
 """Dependencies for API endpoints."""
 
+import logging
+from typing import List, Optional
 
 from bson import ObjectId
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel
 
 from app.config import settings
+from app.core.principal_cache import principal_cache
 from app.db.database import get_database
+from app.db.repositories import Repository
+from app.models.couple import CoupleInDB
 from app.models.user import UserInDB
+from app.services.couple_service import find_couple_for_user
+
+logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -26,16 +35,14 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    # Verify token with detailed logging
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info(f"🔍 Validating token - preview: {token[:30] if token else 'None'}...")
+    cached = principal_cache.get(token) if token else None
+    if cached is not None:
+        return cached[1]
     
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        logger.info(f"✅ Token valid - user_id: {payload.get('sub')}")
     except JWTError as e:
-        logger.error(f"❌ Token validation failed: {str(e)} - token preview: {token[:30] if token else 'None'}...")
+        logger.warning(f"Token validation failed: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Token invalid: {str(e)}",
@@ -66,5 +73,93 @@ async def get_current_user(
             detail="User account is inactive"
         )
     
+    principal_cache.put(token, payload, user)
     return user
 
+
+class AuthContext(BaseModel):
+    """Authenticated user together with their active couple.
+
+    Resolved once per request so routers don't repeat the couple lookup.
+    """
+
+    user: UserInDB
+    couple: Optional[CoupleInDB] = None
+    partner_id: Optional[str] = None
+
+    @property
+    def user_id(self) -> str:
+        return self.user.id
+
+    @property
+    def couple_id(self) -> Optional[str]:
+        return self.couple.id if self.couple else None
+
+
+async def get_auth_context(
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+) -> AuthContext:
+    """Resolve the current user and their active couple (if any)."""
+    couple = await find_couple_for_user(current_user.id, db)
+    if couple is None:
+        return AuthContext(user=current_user)
+
+    partner_id = couple.user1_id if current_user.id == couple.user2_id else couple.user2_id
+    return AuthContext(user=current_user, couple=couple, partner_id=partner_id)
+
+
+async def get_couple_context(
+    ctx: AuthContext = Depends(get_auth_context)
+) -> AuthContext:
+    """Like get_auth_context, but requires an active couple."""
+    if ctx.couple is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No active couple profile found"
+        )
+    return ctx
+
+
+async def has_couple_access(
+    ctx: AuthContext,
+    couple_id: str,
+    db: AsyncIOMotorDatabase,
+    *,
+    active_only: bool = False
+) -> bool:
+    """Check that the current user belongs to the given couple.
+
+    The active couple is already on the context, so the common case needs no
+    query; only documents owned by an older couple fall back to the database.
+    """
+    if ctx.couple_id and ctx.couple_id == str(couple_id):
+        return True
+
+    couple = await find_couple_for_user(
+        ctx.user_id, db, couple_id=couple_id, active_only=active_only
+    )
+    return couple is not None
+
+
+def sparse_fields(repository: Repository, view: str):
+    """Dependency parsing a ``fields=`` sparse fieldset for a repository view.
+
+    Resolves to None when the parameter is absent, otherwise to the requested
+    field names with ``id`` first. Unknown fields are a 400.
+    """
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return (id is always included)"
+        )
+    ) -> Optional[List[str]]:
+        if not fields:
+            return None
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        try:
+            repository.check_fields(view, requested)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return list(dict.fromkeys(["id", *requested]))
+
+    return dependency
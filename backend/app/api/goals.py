@@ -2,61 +2,106 @@
 
 import logging
 from datetime import date, datetime
-from typing import List
+from typing import List, Optional
 
 from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import AuthContext, get_couple_context, sparse_fields
 from app.api.schemas import (
     GoalCreate,
     GoalProgressUpdate,
     GoalReactionCreate,
     GoalResponse,
 )
+from app.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, created_at_keyset
+from app.core.responses import ORJSONResponse
+from app.core.sanitization import PyObjectId
 from app.db.database import get_database
-from app.models.couple import CoupleInDB, CoupleStatus
+from app.db.repositories import goal_repository
 from app.models.relationship_goal import GoalProgress, GoalStatus, RelationshipGoalInDB
-from app.models.user import UserInDB
+from app.services.couple_summary_service import couple_summary_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/goals", tags=["Relationship Goals"])
 
 
+def _iso_date(value):
+    """Stored dates are midnight datetimes; responses carry the bare date."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat() if value else None
+
+
+async def _raise_goal_not_found_or(
+    goal_id: ObjectId,
+    couple_id: str,
+    db: AsyncIOMotorDatabase,
+    error: HTTPException
+) -> None:
+    """After a conditional update matched nothing: 404 if the goal is missing, else ``error``."""
+    exists = await db.relationship_goals.find_one(
+        {"_id": goal_id, "couple_id": ObjectId(couple_id)}, {"_id": 1}
+    )
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Goal not found"
+        )
+    raise error
+
+
+def goal_response(doc: dict, fields: Optional[List[str]] = None) -> dict:
+    """
+    Shape a stored goal document as a GoalResponse payload, without building models.
+
+    With a sparse fieldset the document only carries (and the payload only
+    returns) the requested fields.
+    """
+    payload = {
+        "id": doc["_id"],
+        "couple_id": doc.get("couple_id"),
+        "title": doc.get("title"),
+        "description": doc.get("description"),
+        "status": doc.get("status", GoalStatus.ACTIVE.value),
+        "target_date": _iso_date(doc.get("target_date")),
+        "progress": [{
+            "id": p.get("id"),
+            "user_id": p.get("user_id"),
+            "date": _iso_date(p["date"]),
+            "notes": p.get("notes"),
+            "progress_value": p.get("progress_value"),
+            "reactions": p.get("reactions", []),
+        } for p in doc.get("progress", [])],
+        "created_by_user_id": doc.get("created_by_user_id"),
+        "progress_updates": doc.get("progress_updates", 0),
+        "created_at": doc.get("created_at"),
+        "updated_at": doc.get("updated_at"),
+        "completed_at": doc.get("completed_at"),
+    }
+    if fields is None:
+        return payload
+    return {field: payload[field] for field in fields}
+
+
 @router.post("/create", response_model=GoalResponse, status_code=status.HTTP_201_CREATED)
 async def create_goal(
     goal_data: GoalCreate,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Create a new relationship goal."""
     
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
-    
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     
     # Check goal limit (max 10 active goals per couple)
-    active_goals_count = await db.relationship_goals.count_documents({
-        "couple_id": ObjectId(couple.id),
-        "status": GoalStatus.ACTIVE.value
-    })
+    summary = await couple_summary_service.get(couple.id, db)
     
-    if active_goals_count >= 10:
+    if len(summary.active_goals) >= 10:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Maximum of 10 active goals allowed per couple"
@@ -80,33 +125,17 @@ async def create_goal(
         description=goal_data.description,
         status=GoalStatus.ACTIVE,
         target_date=target_date_obj,
-        created_by_user_id=current_user.id,
+        created_by_user_id=ctx.user_id,
         progress=[]
     )
     
     result = await db.relationship_goals.insert_one(goal.to_mongo())
     goal.id = str(result.inserted_id)
+    await couple_summary_service.goal_created(goal, db)
     
-    return GoalResponse(
-        id=goal.id,
-        couple_id=goal.couple_id,
-        title=goal.title,
-        description=goal.description,
-        status=goal.status.value,
-        target_date=goal.target_date.isoformat() if goal.target_date else None,
-        progress=[{
-            "id": p.id if hasattr(p, 'id') else None,
-            "user_id": p.user_id if hasattr(p, 'user_id') else None,
-            "date": p.date.isoformat(), 
-            "notes": p.notes, 
-            "progress_value": p.progress_value,
-            "reactions": p.reactions if hasattr(p, 'reactions') else []
-        } for p in goal.progress],
-        created_by_user_id=goal.created_by_user_id,
-        progress_updates=goal.progress_updates,
-        created_at=goal.created_at,
-        updated_at=goal.updated_at,
-        completed_at=goal.completed_at
+    return ORJSONResponse(
+        goal_response(goal.to_mongo()),
+        status_code=status.HTTP_201_CREATED
     )
 
 
@@ -115,27 +144,19 @@ async def get_goals(
     status_filter: str = None,
     limit: int = 20,
     offset: int = 0,
-    current_user: UserInDB = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = Depends(sparse_fields(goal_repository, "response")),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
-    """Get all goals for the user's couple."""
-    
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
+    """
+    Get all goals for the user's couple, newest first.
+
+    Pages by ``cursor`` (the X-Next-Cursor header of the previous page) or,
+    for older clients, by ``offset``.
+    """
     
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     
     if limit < 1 or limit > 100:
         raise HTTPException(
@@ -147,76 +168,51 @@ async def get_goals(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="offset must be >= 0"
         )
+    if cursor and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or offset, not both"
+        )
 
     query = {"couple_id": ObjectId(couple.id)}
     if status_filter:
         query["status"] = status_filter
+    try:
+        query.update(created_at_keyset.after(cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     # Get goals
     goals_docs = await (
-        db.relationship_goals.find(query)
-        .sort("created_at", -1)
+        goal_repository.find(db, query, "response", created_at_keyset.fields(fields))
+        .sort(created_at_keyset.sort)
         .skip(offset)
         .limit(limit)
     ).to_list(length=limit)
-    goals = [RelationshipGoalInDB.from_mongo(doc) for doc in goals_docs]
+    next_cursor = created_at_keyset.next_cursor(goals_docs, limit)
     
-    return [
-        GoalResponse(
-            id=goal.id,
-            couple_id=goal.couple_id,
-            title=goal.title,
-            description=goal.description,
-            status=goal.status.value,
-            target_date=goal.target_date.isoformat() if goal.target_date else None,
-            progress=[{
-                "id": p.id if hasattr(p, 'id') else None,
-                "user_id": p.user_id if hasattr(p, 'user_id') else None,
-                "date": p.date.isoformat(), 
-                "notes": p.notes, 
-                "progress_value": p.progress_value,
-                "reactions": p.reactions if hasattr(p, 'reactions') else []
-            } for p in goal.progress],
-            created_by_user_id=goal.created_by_user_id,
-            progress_updates=goal.progress_updates,
-            created_at=goal.created_at,
-            updated_at=goal.updated_at,
-            completed_at=goal.completed_at
-        )
-        for goal in goals
-    ]
+    response = ORJSONResponse([goal_response(doc, fields) for doc in goals_docs])
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
 
 
 @router.get("/{goal_id}", response_model=GoalResponse)
 async def get_goal(
-    goal_id: str,
-    current_user: UserInDB = Depends(get_current_user),
+    goal_id: PyObjectId,
+    fields: Optional[List[str]] = Depends(sparse_fields(goal_repository, "response")),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Get a specific goal by ID."""
     
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
-    
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     
     # Get goal
-    goal_doc = await db.relationship_goals.find_one({
-        "_id": ObjectId(goal_id),
+    goal_doc = await goal_repository.find_one(db, {
+        "_id": goal_id,
         "couple_id": ObjectId(couple.id)
-    })
+    }, "response", fields)
     
     if not goal_doc:
         raise HTTPException(
@@ -224,326 +220,134 @@ async def get_goal(
             detail="Goal not found"
         )
     
-    goal = RelationshipGoalInDB.from_mongo(goal_doc)
-    
-    return GoalResponse(
-        id=goal.id,
-        couple_id=goal.couple_id,
-        title=goal.title,
-        description=goal.description,
-        status=goal.status.value,
-        target_date=goal.target_date.isoformat() if goal.target_date else None,
-        progress=[{
-            "id": p.id if hasattr(p, 'id') else None,
-            "user_id": p.user_id if hasattr(p, 'user_id') else None,
-            "date": p.date.isoformat(), 
-            "notes": p.notes, 
-            "progress_value": p.progress_value,
-            "reactions": p.reactions if hasattr(p, 'reactions') else []
-        } for p in goal.progress],
-        created_by_user_id=goal.created_by_user_id,
-        progress_updates=goal.progress_updates,
-        created_at=goal.created_at,
-        updated_at=goal.updated_at,
-        completed_at=goal.completed_at
-    )
+    return ORJSONResponse(goal_response(goal_doc, fields))
 
 
 @router.post("/{goal_id}/progress")
 async def update_goal_progress(
-    goal_id: str,
+    goal_id: PyObjectId,
     progress_data: GoalProgressUpdate,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Update progress for a goal."""
     
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
-    
-    couple = CoupleInDB.from_mongo(couple_doc)
-    
-    # Get goal
-    goal_doc = await db.relationship_goals.find_one({
-        "_id": ObjectId(goal_id),
-        "couple_id": ObjectId(couple.id)
-    })
-    
-    if not goal_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Goal not found"
-        )
-    
-    goal = RelationshipGoalInDB.from_mongo(goal_doc)
-    
-    if goal.status != GoalStatus.ACTIVE.value:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Can only update progress for active goals"
-        )
+    couple = ctx.couple
     
-    # Add progress entry
-    import uuid
     new_progress = GoalProgress(
-        id=str(uuid.uuid4()),
-        user_id=current_user.id,
+        user_id=ctx.user_id,
         date=date.today(),
         notes=progress_data.notes,
         progress_value=progress_data.progress_value,
-        reactions=[]
     )
+    push = {"$each": [new_progress.to_mongo()]}
+    if settings.GOAL_PROGRESS_MAX_ENTRIES > 0:
+        push["$slice"] = -settings.GOAL_PROGRESS_MAX_ENTRIES
     
-    # Update goal
-    goal.progress.append(new_progress)
-    goal.progress_updates += 1
-    goal.updated_at = datetime.utcnow()
-    
-    # Convert progress to MongoDB format
-    progress_list = []
-    for p in goal.progress:
-        p_dict = p.model_dump() if hasattr(p, 'model_dump') else p
-        if isinstance(p_dict.get('date'), date):
-            p_dict['date'] = datetime.combine(p_dict['date'], datetime.min.time())
-        progress_list.append(p_dict)
-    
-    await db.relationship_goals.update_one(
-        {"_id": ObjectId(goal_id)},
+    # One atomic write: concurrent updates from both partners all land
+    updated_doc = await db.relationship_goals.find_one_and_update(
         {
-            "$set": {
-                "progress": progress_list,
-                "progress_updates": goal.progress_updates,
-                "updated_at": goal.updated_at
-            }
-        }
+            "_id": goal_id,
+            "couple_id": ObjectId(couple.id),
+            "status": GoalStatus.ACTIVE.value
+        },
+        {
+            "$push": {"progress": push},
+            "$inc": {"progress_updates": 1},
+            "$set": {"updated_at": datetime.utcnow()}
+        },
+        return_document=ReturnDocument.AFTER
     )
     
-    # Fetch updated goal
-    updated_doc = await db.relationship_goals.find_one({"_id": ObjectId(goal_id)})
-    updated_goal = RelationshipGoalInDB.from_mongo(updated_doc)
+    if not updated_doc:
+        await _raise_goal_not_found_or(goal_id, couple.id, db, HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Can only update progress for active goals"
+        ))
     
-    return GoalResponse(
-        id=updated_goal.id,
-        couple_id=updated_goal.couple_id,
-        title=updated_goal.title,
-        description=updated_goal.description,
-        status=updated_goal.status.value,
-        target_date=updated_goal.target_date.isoformat() if updated_goal.target_date else None,
-        progress=[{
-            "id": p.id if hasattr(p, 'id') else None,
-            "user_id": p.user_id if hasattr(p, 'user_id') else None,
-            "date": p.date.isoformat(), 
-            "notes": p.notes, 
-            "progress_value": p.progress_value,
-            "reactions": p.reactions if hasattr(p, 'reactions') else []
-        } for p in updated_goal.progress],
-        created_by_user_id=updated_goal.created_by_user_id,
-        progress_updates=updated_goal.progress_updates,
-        created_at=updated_goal.created_at,
-        updated_at=updated_goal.updated_at,
-        completed_at=updated_goal.completed_at
-    )
+    return ORJSONResponse(goal_response(updated_doc))
 
 
 @router.post("/{goal_id}/complete")
 async def complete_goal(
-    goal_id: str,
-    current_user: UserInDB = Depends(get_current_user),
+    goal_id: PyObjectId,
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Mark a goal as completed."""
     
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
-    
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     
-    # Get goal
-    goal_doc = await db.relationship_goals.find_one({
-        "_id": ObjectId(goal_id),
-        "couple_id": ObjectId(couple.id)
-    })
-    
-    if not goal_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Goal not found"
-        )
-    
-    # Update goal
-    await db.relationship_goals.update_one(
-        {"_id": ObjectId(goal_id)},
+    now = datetime.utcnow()
+    updated_doc = await db.relationship_goals.find_one_and_update(
+        {"_id": goal_id, "couple_id": ObjectId(couple.id)},
         {
             "$set": {
                 "status": GoalStatus.COMPLETED.value,
-                "completed_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
+                "completed_at": now,
+                "updated_at": now
             }
-        }
+        },
+        return_document=ReturnDocument.AFTER
     )
     
-    # Fetch updated goal
-    updated_doc = await db.relationship_goals.find_one({"_id": ObjectId(goal_id)})
-    updated_goal = RelationshipGoalInDB.from_mongo(updated_doc)
+    if not updated_doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Goal not found"
+        )
+    await couple_summary_service.goal_closed(couple.id, str(goal_id), db)
     
-    return GoalResponse(
-        id=updated_goal.id,
-        couple_id=updated_goal.couple_id,
-        title=updated_goal.title,
-        description=updated_goal.description,
-        status=updated_goal.status.value,
-        target_date=updated_goal.target_date.isoformat() if updated_goal.target_date else None,
-        progress=[{
-            "id": p.id if hasattr(p, 'id') else None,
-            "user_id": p.user_id if hasattr(p, 'user_id') else None,
-            "date": p.date.isoformat(), 
-            "notes": p.notes, 
-            "progress_value": p.progress_value,
-            "reactions": p.reactions if hasattr(p, 'reactions') else []
-        } for p in updated_goal.progress],
-        created_by_user_id=updated_goal.created_by_user_id,
-        progress_updates=updated_goal.progress_updates,
-        created_at=updated_goal.created_at,
-        updated_at=updated_goal.updated_at,
-        completed_at=updated_goal.completed_at
-    )
+    return ORJSONResponse(goal_response(updated_doc))
 
 
 @router.post("/{goal_id}/progress/{progress_id}/react")
 async def react_to_goal_progress(
-    goal_id: str,
+    goal_id: PyObjectId,
     progress_id: str,
     reaction_data: GoalReactionCreate,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Add or toggle a reaction on a progress update."""
     
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
+    couple = ctx.couple
     
-    couple = CoupleInDB.from_mongo(couple_doc)
+    reaction = {"user_id": ctx.user_id, "emoji": reaction_data.emoji}
+    goal_filter = {"_id": goal_id, "couple_id": ObjectId(couple.id)}
+    entry_filter = [{"entry.id": progress_id}]
+    now = datetime.utcnow()
     
-    # Get goal
-    goal_doc = await db.relationship_goals.find_one({
-        "_id": ObjectId(goal_id),
-        "couple_id": ObjectId(couple.id)
-    })
+    # Toggle off: only matches when this reaction is already on the entry
+    updated_doc = await db.relationship_goals.find_one_and_update(
+        {
+            **goal_filter,
+            "progress": {"$elemMatch": {"id": progress_id, "reactions": {"$elemMatch": reaction}}}
+        },
+        {
+            "$pull": {"progress.$[entry].reactions": reaction},
+            "$set": {"updated_at": now}
+        },
+        array_filters=entry_filter,
+        return_document=ReturnDocument.AFTER
+    )
     
-    if not goal_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Goal not found"
+    if not updated_doc:
+        # Toggle on; $addToSet keeps a concurrent double tap from adding it twice
+        updated_doc = await db.relationship_goals.find_one_and_update(
+            {**goal_filter, "progress.id": progress_id},
+            {
+                "$addToSet": {"progress.$[entry].reactions": reaction},
+                "$set": {"updated_at": now}
+            },
+            array_filters=entry_filter,
+            return_document=ReturnDocument.AFTER
         )
     
-    goal = RelationshipGoalInDB.from_mongo(goal_doc)
-    
-    # Find the specific progress entry
-    target_progress = None
-    for p in goal.progress:
-        if hasattr(p, 'id') and p.id == progress_id:
-            target_progress = p
-            break
-            
-    if not target_progress:
-        raise HTTPException(
+    if not updated_doc:
+        await _raise_goal_not_found_or(goal_id, couple.id, db, HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Progress update not found"
-        )
-        
-    # Check if user already reacted with this emoji
-    if not hasattr(target_progress, 'reactions'):
-        target_progress.reactions = []
-        
-    existing_reaction = next((r for r in target_progress.reactions if r.get('user_id') == current_user.id and r.get('emoji') == reaction_data.emoji), None)
+        ))
     
-    if existing_reaction:
-        # Toggle off (remove)
-        target_progress.reactions = [r for r in target_progress.reactions if not (r.get('user_id') == current_user.id and r.get('emoji') == reaction_data.emoji)]
-    else:
-        # Add reaction
-        target_progress.reactions.append({
-            "user_id": current_user.id,
-            "emoji": reaction_data.emoji
-        })
-        
-    # Convert progress list to dicts for mongo update
-    progress_list = []
-    for p in goal.progress:
-        p_dict = p.model_dump() if hasattr(p, 'model_dump') else p
-        if isinstance(p_dict.get('date'), date):
-            p_dict['date'] = datetime.combine(p_dict['date'], datetime.min.time())
-        progress_list.append(p_dict)
-        
-    # Update goal
-    await db.relationship_goals.update_one(
-        {"_id": ObjectId(goal_id)},
-        {
-            "$set": {
-                "progress": progress_list,
-                "updated_at": datetime.utcnow()
-            }
-        }
-    )
-    
-    # Fetch updated goal
-    updated_doc = await db.relationship_goals.find_one({"_id": ObjectId(goal_id)})
-    updated_goal = RelationshipGoalInDB.from_mongo(updated_doc)
-    
-    return GoalResponse(
-        id=updated_goal.id,
-        couple_id=updated_goal.couple_id,
-        title=updated_goal.title,
-        description=updated_goal.description,
-        status=updated_goal.status.value,
-        target_date=updated_goal.target_date.isoformat() if updated_goal.target_date else None,
-        progress=[{
-            "id": p.id if hasattr(p, 'id') else None,
-            "user_id": p.user_id if hasattr(p, 'user_id') else None,
-            "date": p.date.isoformat(), 
-            "notes": p.notes, 
-            "progress_value": p.progress_value,
-            "reactions": p.reactions if hasattr(p, 'reactions') else []
-        } for p in updated_goal.progress],
-        created_by_user_id=updated_goal.created_by_user_id,
-        progress_updates=updated_goal.progress_updates,
-        created_at=updated_goal.created_at,
-        updated_at=updated_goal.updated_at,
-        completed_at=updated_goal.completed_at
-    )
+    return ORJSONResponse(goal_response(updated_doc))
@@ -0,0 +1,52 @@
+"""Background job status endpoints."""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.api.dependencies import AuthContext, get_auth_context, has_couple_access
+from app.api.schemas import JobResponse
+from app.core.sanitization import PyObjectId
+from app.db.database import get_database
+from app.models.job import JobInDB
+from app.services.job_queue import job_queue_service
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+def job_to_response(job: JobInDB) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        type=job.type.value,
+        status=job.status.value,
+        attempts=job.attempts,
+        result=job.result,
+        error=job.last_error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job_status(
+    job_id: PyObjectId,
+    ctx: AuthContext = Depends(get_auth_context),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Poll the status (and result, once finished) of a background job."""
+    job = await job_queue_service.get_job(job_id, db)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    is_owner = job.user_id == ctx.user_id
+    if not is_owner and not (job.couple_id and await has_couple_access(ctx, job.couple_id, db)):
+        # Don't reveal other couples' job ids
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job_to_response(job)
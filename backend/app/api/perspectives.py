@@ -1,19 +1,26 @@
 """Perspectives endpoints."""
 
-from typing import List
+from typing import List, Optional
 
 from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import (
+    AuthContext,
+    get_auth_context,
+    has_couple_access,
+    sparse_fields,
+)
 from app.api.schemas import PerspectiveCreate, PerspectiveResponse
-from app.core.sanitization import sanitize_text, validate_object_id
+from app.core.responses import ORJSONResponse, public_document
+from app.core.sanitization import PyObjectId, sanitize_text
 from app.db.database import get_database
+from app.db.repositories import perspective_repository
 from app.models.argument import ArgumentInDB, ArgumentStatus
-from app.models.couple import CoupleStatus
 from app.models.perspective import PerspectiveInDB
-from app.models.user import UserInDB
+from app.services.couple_summary_service import couple_summary_service
+from app.services.safety_service import safety_service
 
 router = APIRouter(prefix="/api/perspectives", tags=["Perspectives"])
 
@@ -21,15 +28,15 @@ router = APIRouter(prefix="/api/perspectives", tags=["Perspectives"])
 @router.post("/create", response_model=PerspectiveResponse, status_code=status.HTTP_201_CREATED)
 async def create_perspective(
     perspective_data: PerspectiveCreate,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Create a perspective for an argument."""
     
-    # Validate and sanitize inputs
+    argument_oid = perspective_data.argument_id
+    
+    # Sanitize inputs
     try:
-        validated_argument_id = validate_object_id(perspective_data.argument_id)
-        argument_oid = ObjectId(validated_argument_id)
         sanitized_content = sanitize_text(perspective_data.content, max_length=5000)
     except ValueError as e:
         raise HTTPException(
@@ -49,16 +56,7 @@ async def create_perspective(
     argument = ArgumentInDB.from_mongo(arg_doc)
     
     # Verify user is in the couple that owns this argument
-    couple_doc = await db.couples.find_one({
-        "_id": ObjectId(argument.couple_id),
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
+    if not await has_couple_access(ctx, argument.couple_id, db, active_only=True):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this argument"
@@ -67,7 +65,7 @@ async def create_perspective(
     # Check if user already submitted a perspective for this argument
     existing_perspective = await db.perspectives.find_one({
         "argument_id": argument_oid,
-        "user_id": ObjectId(current_user.id)
+        "user_id": ObjectId(ctx.user_id)
     })
     
     if existing_perspective:
@@ -76,11 +74,12 @@ async def create_perspective(
             detail="You have already submitted a perspective for this argument"
         )
     
-    # Create perspective
+    # Create perspective; the safety scan runs once here, not on every analysis
     perspective = PerspectiveInDB(
-        argument_id=validated_argument_id,
-        user_id=current_user.id,
-        content=sanitized_content
+        argument_id=str(argument_oid),
+        user_id=ctx.user_id,
+        content=sanitized_content,
+        safety=safety_service.scan_perspective(sanitized_content)
     )
     
     result = await db.perspectives.insert_one(perspective.to_mongo())
@@ -97,36 +96,33 @@ async def create_perspective(
             {"_id": argument_oid},
             {"$set": {"status": ArgumentStatus.ACTIVE.value}}
         )
+        await couple_summary_service.argument_status_changed(
+            argument.couple_id, argument.id, ArgumentStatus.ACTIVE, db
+        )
+    
+    safety_check = safety_service.combine_verdicts(perspective.safety)
     
     return PerspectiveResponse(
         id=perspective.id,
         argument_id=perspective.argument_id,
         user_id=perspective.user_id,
         content=perspective.content,
-        created_at=perspective.created_at
+        created_at=perspective.created_at,
+        safety_check=safety_check if safety_check["has_concerns"] else None
     )
 
 
 @router.get("/argument/{argument_id}", response_model=List[PerspectiveResponse])
 async def get_perspectives_for_argument(
-    argument_id: str,
-    current_user: UserInDB = Depends(get_current_user),
+    argument_id: PyObjectId,
+    fields: Optional[List[str]] = Depends(sparse_fields(perspective_repository, "response")),
+    ctx: AuthContext = Depends(get_auth_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Get all perspectives for an argument."""
     
-    # Validate ObjectId
-    try:
-        validated_argument_id = validate_object_id(argument_id)
-        argument_oid = ObjectId(validated_argument_id)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    
     # Verify argument exists and user has access
-    arg_doc = await db.arguments.find_one({"_id": argument_oid})
+    arg_doc = await db.arguments.find_one({"_id": argument_id})
     
     if not arg_doc:
         raise HTTPException(
@@ -137,33 +133,19 @@ async def get_perspectives_for_argument(
     argument = ArgumentInDB.from_mongo(arg_doc)
     
     # Verify user is in the couple
-    couple_doc = await db.couples.find_one({
-        "_id": ObjectId(argument.couple_id),
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ]
-    })
-    
-    if not couple_doc:
+    if not await has_couple_access(ctx, argument.couple_id, db):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied to this argument"
         )
     
     # Get perspectives
-    cursor = db.perspectives.find({"argument_id": argument_oid})
-    perspectives = []
-    
-    async for persp_doc in cursor:
-        persp = PerspectiveInDB.from_mongo(persp_doc)
-        perspectives.append(PerspectiveResponse(
-            id=persp.id,
-            argument_id=persp.argument_id,
-            user_id=persp.user_id,
-            content=persp.content,
-            created_at=persp.created_at
-        ))
-    
-    return perspectives
+    cursor = perspective_repository.find(db, {"argument_id": argument_id}, "response", fields)
+    perspectives = [public_document(persp_doc, fields) async for persp_doc in cursor]
+    if fields is None:
+        # safety_check is only reported on create
+        for perspective in perspectives:
+            perspective["safety_check"] = None
+    
+    return ORJSONResponse(perspectives)
 
@@ -2,10 +2,12 @@
 
 import re
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
+from app.core.sanitization import PyObjectId
+
 
 # Authentication Schemas
 class UserRegister(BaseModel):
@@ -191,7 +193,7 @@ class ArgumentResponse(BaseModel):
 # Perspective Schemas
 class PerspectiveCreate(BaseModel):
     """Create perspective request."""
-    argument_id: str
+    argument_id: PyObjectId
     content: str = Field(..., min_length=10, max_length=5000)
 
 
@@ -202,6 +204,7 @@ class PerspectiveResponse(BaseModel):
     user_id: str
     content: str
     created_at: datetime
+    safety_check: Optional[Dict[str, Any]] = None  # Only on create, when concerns were found
 
 
 # Relationship Check-in Schemas
@@ -314,3 +317,22 @@ class AICheckInsResponse(BaseModel):
     """Response for AI-generated check-in questions."""
     suggestions: List[AICheckInSuggestion] = Field(default_factory=list)
 
+
+# Background Job Schemas
+class JobAccepted(BaseModel):
+    """Returned with 202 when work has been queued."""
+    job_id: str
+    status: str
+    status_url: str
+
+class JobResponse(BaseModel):
+    """Status of a background job."""
+    id: str
+    type: str
+    status: str
+    attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
@@ -4,11 +4,10 @@ import logging
 from datetime import datetime
 
 import stripe
-from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from app.api.dependencies import get_current_user
+from app.api.dependencies import AuthContext, get_couple_context
 from app.api.schemas import (
     CreateCheckoutSessionRequest,
     SubscriptionResponse,
@@ -16,11 +15,9 @@ from app.api.schemas import (
 )
 from app.config import settings
 from app.db.database import get_database
-from app.models.couple import CoupleInDB, CoupleStatus
 from app.models.usage import UsageType
-from app.models.user import UserInDB
+from app.services.couple_summary_service import couple_summary_service
 from app.services.subscription_service import subscription_service
-from app.services.usage_service import usage_service
 
 logger = logging.getLogger(__name__)
 
@@ -33,27 +30,12 @@ if settings.STRIPE_SECRET_KEY:
 
 @router.get("/me", response_model=SubscriptionResponse)
 async def get_my_subscription(
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Get current user's subscription."""
     
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
-    
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     
     subscription = await subscription_service.get_or_create_subscription(couple.id, db)
     
@@ -73,49 +55,30 @@ async def get_my_subscription(
 
 @router.get("/usage", response_model=UsageResponse)
 async def get_usage(
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Get current usage statistics."""
     
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
+    couple = ctx.couple
     
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
-    
-    couple = CoupleInDB.from_mongo(couple_doc)
-    
-    subscription = await subscription_service.get_or_create_subscription(couple.id, db)
-    usage_count = await usage_service.get_usage_count(
-        couple.id, UsageType.ARGUMENT_RESOLUTION, subscription, db
-    )
-    limit = subscription_service.get_argument_limit(subscription)
-    
-    period_start, period_end = usage_service.get_period_dates(subscription)
+    summary = await couple_summary_service.get(couple.id, db)
+    usage_count = couple_summary_service.usage_count(summary, UsageType.ARGUMENT_RESOLUTION)
+    limit = subscription_service.get_argument_limit(summary.subscription)
     
     return UsageResponse(
         usage_count=usage_count,
         limit=limit,
         is_unlimited=limit == -1,
-        period_start=period_start.isoformat(),
-        period_end=period_end.isoformat()
+        period_start=summary.usage.period_start.date().isoformat(),
+        period_end=summary.usage.period_end.date().isoformat()
     )
 
 
 @router.post("/create-checkout-session")
 async def create_checkout_session(
     checkout_data: CreateCheckoutSessionRequest,
-    current_user: UserInDB = Depends(get_current_user),
+    ctx: AuthContext = Depends(get_couple_context),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Create Stripe checkout session for subscription upgrade."""
@@ -126,22 +89,7 @@ async def create_checkout_session(
             detail="Payment processing not configured"
         )
     
-    # Get user's couple
-    couple_doc = await db.couples.find_one({
-        "$or": [
-            {"user1_id": ObjectId(current_user.id)},
-            {"user2_id": ObjectId(current_user.id)}
-        ],
-        "status": CoupleStatus.ACTIVE.value
-    })
-    
-    if not couple_doc:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active couple profile found"
-        )
-    
-    couple = CoupleInDB.from_mongo(couple_doc)
+    couple = ctx.couple
     subscription = await subscription_service.get_or_create_subscription(couple.id, db)
     
     # Define prices (in AUD cents)
@@ -169,8 +117,8 @@ async def create_checkout_session(
         customer_id = subscription.stripe_customer_id
         if not customer_id:
             customer = stripe.Customer.create(
-                email=current_user.email,
-                metadata={"couple_id": couple.id, "user_id": current_user.id}
+                email=ctx.user.email,
+                metadata={"couple_id": couple.id, "user_id": ctx.user_id}
             )
             customer_id = customer.id
             
@@ -208,7 +156,7 @@ async def create_checkout_session(
             payment_method_collection="always",  # Always collect payment method
             metadata={
                 "couple_id": couple.id,
-                "user_id": current_user.id,
+                "user_id": ctx.user_id,
                 "tier": checkout_data.tier
             }
         )
@@ -8,8 +8,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.api.dependencies import get_current_user
+from app.core.principal_cache import principal_cache
 from app.db.database import get_database
 from app.models.user import UserInDB
+from app.services.couple_service import find_couple_for_user
+from app.services.couple_summary_service import couple_summary_service
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
 
@@ -46,21 +49,16 @@ async def export_user_data(
         }
         
         # Find couple profile
-        couple_doc = await db.couples.find_one({
-            "$or": [
-                {"user1_id": ObjectId(current_user.id)},
-                {"user2_id": ObjectId(current_user.id)}
-            ]
-        })
+        couple = await find_couple_for_user(current_user.id, db, active_only=False)
         
-        if couple_doc:
-            couple_id = str(couple_doc["_id"])
+        if couple:
+            couple_id = couple.id
             export_data["couples"].append({
                 "id": couple_id,
-                "user1_id": str(couple_doc.get("user1_id", "")),
-                "user2_id": str(couple_doc.get("user2_id", "")),
-                "status": couple_doc.get("status", ""),
-                "created_at": couple_doc.get("created_at").isoformat() if couple_doc.get("created_at") else None,
+                "user1_id": couple.user1_id,
+                "user2_id": couple.user2_id,
+                "status": couple.status.value,
+                "created_at": couple.created_at.isoformat() if couple.created_at else None,
             })
             
             # Get arguments for this couple
@@ -171,18 +169,18 @@ async def delete_account(
     
     try:
         # Find couple profile
-        couple_doc = await db.couples.find_one({
-            "$or": [
-                {"user1_id": ObjectId(current_user.id)},
-                {"user2_id": ObjectId(current_user.id)}
-            ]
-        })
+        couple = await find_couple_for_user(current_user.id, db, active_only=False)
         
-        if couple_doc:
-            couple_id = str(couple_doc["_id"])
+        if couple:
+            # Stored references are ObjectIds
+            couple_id = ObjectId(couple.id)
+            user_id = ObjectId(current_user.id)
             
             # Delete user's perspectives
-            await db.perspectives.delete_many({"user_id": current_user.id})
+            await db.perspectives.delete_many({"user_id": user_id})
+
+            # Delete background jobs the user queued (and their results)
+            await db.jobs.delete_many({"user_id": user_id})
             
             # Delete arguments created by this user (if any)
             # Note: We might want to keep arguments if couple wants to keep them
@@ -194,15 +192,18 @@ async def delete_account(
             
             # Delete check-ins completed by this user
             await db.relationship_checkins.update_many(
-                {"couple_id": couple_id, "completed_by_user_id": current_user.id},
+                {"couple_id": couple_id, "completed_by_user_id": user_id},
                 {"$set": {"completed_by_user_id": None}}  # Anonymize
             )
             
             # Delete goals created by this user
             await db.relationship_goals.delete_many({
                 "couple_id": couple_id,
-                "created_by_user_id": current_user.id
+                "created_by_user_id": user_id
             })
+            
+            # Deleted goals must leave the partner's summary (and the active goal cap)
+            await couple_summary_service.rebuild(couple.id, db)
         
         # Anonymize user account (don't fully delete for audit trail)
         # Keep for 7 years for financial/legal compliance
@@ -219,6 +220,8 @@ async def delete_account(
                 }
             }
         )
+        # Deactivated accounts must stop authenticating right away
+        principal_cache.invalidate_user(current_user.id)
         
         return {
             "success": True,
@@ -2,7 +2,7 @@
 
 import json
 import secrets
-from typing import List, Union
+from typing import Dict, List, Union
 
 from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -26,12 +26,28 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Rate limiting: shared sliding windows in Redis (empty URI = REDIS_URL,
+    # "memory://" = per-process). Forwarded client IPs are only trusted when
+    # the direct peer is one of TRUSTED_PROXIES (IPs or CIDRs).
+    RATE_LIMIT_STORAGE_URI: str = ""
+    RATE_LIMIT_REDIS_TIMEOUT_SECONDS: float = 0.25
+    TRUSTED_PROXIES: Union[List[str], str] = []
+
     # Security
     SECRET_KEY: str = Field(..., min_length=32)
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
 
+    # Password hashing (bcrypt cost and dedicated worker pool)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+
+    # Per-worker cache of authenticated principals (0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
     # CORS — includes both localhost ports and production Vercel URL
     ALLOWED_ORIGINS: Union[List[str], str] = [
         "http://localhost:3000",
@@ -42,9 +58,49 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-mini"
-
-    # Google Gemini (beta testing)
+    # Point at a local stand-in (python -m loadtest.fake_openai) for load tests
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+
+    # Shared outbound HTTP client (AI providers)
+    OUTBOUND_HTTP2: bool = True
+    OUTBOUND_MAX_CONNECTIONS: int = 20
+    OUTBOUND_MAX_KEEPALIVE: int = 10
+    OUTBOUND_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    OUTBOUND_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_WARMUP_ON_STARTUP: bool = False
+
+    # Background jobs (Mongo-backed queue). The embedded worker runs inside the
+    # API process; disable it when running `python -m app.worker` separately.
+    JOB_WORKER_EMBEDDED: bool = True
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: int = 120
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 10.0
+    JOB_RETRY_MAX_SECONDS: float = 900.0
+    JOB_SUCCEEDED_TTL_HOURS: int = 72
+    JOB_DEAD_TTL_HOURS: int = 168  # long enough to inspect dead-lettered jobs
+
+    # Goals: progress entries kept embedded in a goal document (oldest are
+    # trimmed on push; 0 keeps all). progress_updates still counts every update.
+    GOAL_PROGRESS_MAX_ENTRIES: int = 0
+
+    # Google Gemini (beta testing). With a key set it becomes the last
+    # failover provider, reached through its OpenAI-compatible endpoint.
     GEMINI_API_KEY: str = ""
+    GEMINI_MODEL: str = "gemini-2.0-flash"
+    GEMINI_BASE_URL: str = "https://generativelanguage.googleapis.com/v1beta/openai"
+
+    # LLM routing: retries, failover, circuit breaking and hedging
+    OPENAI_FALLBACK_MODEL: str = ""  # secondary OpenAI model tried before Gemini
+    LLM_MAX_ATTEMPTS: int = 2  # per provider
+    LLM_RETRY_BASE_SECONDS: float = 0.5
+    LLM_RETRY_MAX_SECONDS: float = 8.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_MIN_SAMPLES: int = 20  # latency samples needed before hedging at p95
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 1.0
 
     # Stripe
     STRIPE_SECRET_KEY: str = ""
@@ -61,10 +117,15 @@ class Settings(BaseSettings):
     # Sentry
     SENTRY_DSN: str = ""
 
-    @field_validator('ALLOWED_ORIGINS', mode='before')
+    # Logging: "json" or "text"; sample rates are per logger-name prefix,
+    # e.g. {"app.services.refresh_token_service": 0.1} (INFO/DEBUG only)
+    LOG_FORMAT: str = "json"
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+
+    @field_validator('ALLOWED_ORIGINS', 'TRUSTED_PROXIES', mode='before')
     @classmethod
     def parse_allowed_origins(cls, v):
-        """Parse ALLOWED_ORIGINS from JSON string or comma-separated string."""
+        """Parse list settings from JSON string or comma-separated string."""
         if isinstance(v, str):
             try:
                 parsed = json.loads(v)
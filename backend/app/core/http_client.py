@@ -0,0 +1,73 @@
+"""Shared outbound HTTP client.
+
+One long-lived httpx.AsyncClient per worker, opened and closed by the app
+lifespan. Reusing it keeps TCP+TLS connections (and, when the ``h2``
+package is installed, a multiplexed HTTP/2 connection) alive between AI
+calls instead of paying a fresh handshake on every request.
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class SharedHTTPClient:
+    """Owns the process-wide httpx.AsyncClient."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _build(self) -> httpx.AsyncClient:
+        http2 = settings.OUTBOUND_HTTP2 and HTTP2_AVAILABLE
+        if settings.OUTBOUND_HTTP2 and not HTTP2_AVAILABLE:
+            logger.warning("h2 not installed, outbound HTTP client using HTTP/1.1")
+        return httpx.AsyncClient(
+            http2=http2,
+            transport=self._transport,
+            limits=httpx.Limits(
+                max_connections=settings.OUTBOUND_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OUTBOUND_MAX_KEEPALIVE,
+                keepalive_expiry=settings.OUTBOUND_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(60.0, connect=settings.OUTBOUND_CONNECT_TIMEOUT_SECONDS),
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client; created on first use outside the lifespan (scripts, tests)."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build()
+        return self._client
+
+    async def start(self) -> None:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build()
+
+    async def warm_up(self, url: str, headers: Optional[dict] = None) -> None:
+        """Open a connection ahead of the first real request. Failures are ignored."""
+        try:
+            await self.client.get(url, headers=headers, timeout=10.0)
+            logger.info(f"Warmed up outbound connection to {httpx.URL(url).host}")
+        except httpx.HTTPError as e:
+            logger.warning(f"Outbound connection warm-up failed: {e}")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_client = SharedHTTPClient()
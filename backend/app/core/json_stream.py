@@ -0,0 +1,77 @@
+"""Incremental parsing of a streamed JSON object."""
+
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalJSONObjectParser:
+    """
+    Emits the top-level members of a JSON object as soon as each one is complete.
+
+    Text is fed in arbitrary chunks (e.g. model output deltas). The scanner
+    tracks string/escape state and nesting depth; when a comma or the closing
+    brace is seen at the top level, the member text since the previous
+    separator is decoded and returned. Anything before the opening brace is
+    ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = -1
+        self.finished = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk and return the (key, value) members it completed."""
+        if self.finished:
+            return []
+        self._buffer += chunk
+        members: List[Tuple[str, Any]] = []
+
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = i + 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    members.extend(self._decode_member(buffer[self._member_start:i]))
+                    self.finished = True
+                    self._pos = i + 1
+                    return members
+            elif char == "," and self._depth == 1:
+                members.extend(self._decode_member(buffer[self._member_start:i]))
+                self._member_start = i + 1
+
+        self._pos = len(buffer)
+        return members
+
+    @staticmethod
+    def _decode_member(text: str) -> List[Tuple[str, Any]]:
+        if not text.strip():
+            return []
+        try:
+            return list(json.loads("{" + text + "}").items())
+        except json.JSONDecodeError:
+            return []
@@ -0,0 +1,109 @@
+"""Single-pass, precompiled multi-keyword matcher.
+
+All keywords (whole-word, case-insensitive) and extra regex patterns are
+compiled into one alternation wrapped in a lookahead, so one ``finditer``
+walk over the text tries every term at every position in C instead of
+running one search per keyword. Alternatives are ordered longest first;
+shorter terms that start where a longer one matched (``"suicide"`` inside
+``"suicide hotline"``) are precomputed and reported too, so the result is
+the same as searching for each term on its own.
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class KeywordMatch(NamedTuple):
+    """One hit: the label of the matched term and its span in the text."""
+
+    label: str
+    term: str
+    start: int
+    end: int
+
+
+class KeywordScanner:
+    """Finds labelled keywords and patterns in text with one compiled regex."""
+
+    def __init__(
+        self,
+        keywords: Dict[str, List[str]],
+        patterns: Optional[Dict[str, List[str]]] = None
+    ):
+        """
+        Args:
+            keywords: label -> literal terms, matched on word boundaries
+            patterns: label -> regular expressions, matched anywhere
+        """
+        # Fingerprint of the configuration; changes whenever a term or pattern does
+        self.version: str = hashlib.sha256(
+            json.dumps([keywords, patterns or {}], sort_keys=True).encode()
+        ).hexdigest()[:12]
+        self.labels: List[str] = list(dict.fromkeys([*keywords, *(patterns or {})]))
+        self._term_labels: Dict[str, List[str]] = {}
+        for label, terms in keywords.items():
+            for term in terms:
+                labels = self._term_labels.setdefault(term.casefold(), [])
+                if label not in labels:
+                    labels.append(label)
+
+        terms = sorted(self._term_labels, key=len, reverse=True)
+        # Shorter terms that also match at the start of a longer one
+        self._prefix_terms: Dict[str, List[str]] = {
+            term: [
+                other for other in terms
+                if other != term and re.match(rf"{re.escape(other)}\b", term)
+            ]
+            for term in terms
+        }
+
+        self._pattern_labels: List[Tuple[str, re.Pattern]] = [
+            (label, re.compile(pattern, re.IGNORECASE))
+            for label, label_patterns in (patterns or {}).items()
+            for pattern in label_patterns
+        ]
+
+        alternatives = []
+        if terms:
+            alternatives.append(r"\b(?P<kw>" + "|".join(map(re.escape, terms)) + r")\b")
+        for index, (_, pattern) in enumerate(self._pattern_labels):
+            alternatives.append(f"(?P<p{index}>{pattern.pattern})")
+        self._regex = re.compile(
+            "(?=" + "|".join(alternatives) + ")" if alternatives else "(?!)",
+            re.IGNORECASE,
+        )
+
+    def scan(self, text: str) -> List[KeywordMatch]:
+        """All keyword and pattern hits in ``text``, ordered by position."""
+        matches: List[KeywordMatch] = []
+        for m in self._regex.finditer(text):
+            group = m.lastgroup
+            start, end = m.span(group)
+            if group == "kw":
+                term = m.group("kw").casefold()
+                for label in self._term_labels[term]:
+                    matches.append(KeywordMatch(label, term, start, end))
+                for other in self._prefix_terms[term]:
+                    for label in self._term_labels[other]:
+                        matches.append(KeywordMatch(label, other, start, start + len(other)))
+                # A pattern starting at the same position is shadowed by the keyword
+                for label, pattern in self._pattern_labels:
+                    hit = pattern.match(text, start)
+                    if hit:
+                        matches.append(KeywordMatch(label, hit.group(), start, hit.end()))
+            else:
+                label, _ = self._pattern_labels[int(group[1:])]
+                matches.append(KeywordMatch(label, m.group(group), start, end))
+        return matches
+
+    def scan_many(self, texts: Iterable[str]) -> List[List[KeywordMatch]]:
+        """``scan`` for each text, reusing the compiled matcher."""
+        scan = self.scan
+        return [scan(text) for text in texts]
+
+    def labels_in(self, text: str) -> List[str]:
+        """Distinct labels found in ``text``, in declaration order."""
+        found = {match.label for match in self.scan(text)}
+        return [label for label in self.labels if label in found]
@@ -1,8 +1,210 @@
-"""Rate limiter instance for use across the application."""
+"""Rate limiter instance for use across the application.
 
+Limits are enforced with a sliding (moving) window kept in Redis, so every
+worker process shares one quota per client. In front of Redis each worker
+keeps a small token bucket per (limit, client): a client that has already
+used up its quota on this worker is rejected locally without a Redis round
+trip. Redis stays the authority for every request that is let through.
+
+Clients are identified by the ``sub`` of a valid bearer token and fall back
+to their IP address. X-Forwarded-For is only honoured when the direct peer
+is listed in TRUSTED_PROXIES.
+"""
+
+import ipaddress
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from limits import RateLimitItem
+from limits.strategies import RateLimiter
 from slowapi import Limiter
-from slowapi.util import get_remote_address
+from starlette.requests import Request
 
-# Create a single limiter instance that can be imported by routes
-limiter = Limiter(key_func=get_remote_address)
+from app.config import settings
+from app.core.security import verify_token
+
+
+def _parse_networks(entries):
+    networks = []
+    for entry in entries:
+        try:
+            networks.append(ipaddress.ip_network(entry.strip(), strict=False))
+        except ValueError:
+            continue
+    return networks
+
+
+_trusted_proxies = _parse_networks(settings.TRUSTED_PROXIES)
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_proxies)
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Client IP address, resolved through trusted proxies only.
+
+    X-Forwarded-For is walked right to left, skipping hops that are trusted
+    proxies; the first untrusted address is the client. Without a trusted
+    peer the header is ignored, since any client can set it.
+    """
+    peer = request.client.host if request.client else "127.0.0.1"
+    if not _is_trusted(peer):
+        return peer
+
+    forwarded = request.headers.get("x-forwarded-for", "")
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+def rate_limit_key(request: Request) -> str:
+    """Key requests by authenticated user id, falling back to client IP."""
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = verify_token(token)
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{get_client_ip(request)}"
+
+
+class LocalTokenBucketRateLimiter(RateLimiter):
+    """
+    Wraps a shared-storage strategy with a per-process token bucket.
+
+    Each bucket holds ``amount`` tokens and refills at ``amount`` per window.
+    An empty bucket means this process alone has already let the client
+    spend its quota, so the shared window would reject it too and the
+    storage call is skipped. When the shared window rejects a hit the bucket
+    is drained, so a throttled client costs at most one storage call per
+    refill interval on each worker.
+    """
 
+    def __init__(self, backend: RateLimiter, max_buckets: int = 10000):
+        super().__init__(backend.storage)
+        self.backend = backend
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_rejections = 0
+        self.backend_calls = 0
+
+    def _take(self, item: RateLimitItem, key: str, cost: int) -> bool:
+        now = time.monotonic()
+        capacity = float(item.amount)
+        refill_rate = capacity / item.get_expiry()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [capacity, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                tokens, updated_at = bucket
+                bucket[0] = min(capacity, tokens + (now - updated_at) * refill_rate)
+                bucket[1] = now
+            if bucket[0] < cost:
+                self.local_rejections += 1
+                return False
+            bucket[0] -= cost
+            return True
+
+    def _drain(self, key: str) -> None:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = 0.0
+
+    def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        key = item.key_for(*identifiers)
+        if not self._take(item, key, cost):
+            return False
+        self.backend_calls += 1
+        if self.backend.hit(item, *identifiers, cost=cost):
+            return True
+        self._drain(key)
+        return False
+
+    def test(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        return self.backend.test(item, *identifiers, cost=cost)
+
+    def get_window_stats(self, item: RateLimitItem, *identifiers: str):
+        return self.backend.get_window_stats(item, *identifiers)
+
+    def clear(self, item: RateLimitItem, *identifiers: str) -> None:
+        with self._lock:
+            self._buckets.pop(item.key_for(*identifiers), None)
+        self.backend.clear(item, *identifiers)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = len(self._buckets)
+        return {
+            "buckets": buckets,
+            "local_rejections": self.local_rejections,
+            "backend_calls": self.backend_calls,
+        }
+
+
+class DistributedLimiter(Limiter):
+    """slowapi Limiter whose shared-storage strategy is fronted by local buckets.
+
+    If the shared storage becomes unreachable slowapi switches to its
+    in-memory fallback (per-process limits) until the storage recovers.
+    """
+
+    def __init__(self, *args, max_local_buckets: int = 10000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local_limiter = LocalTokenBucketRateLimiter(
+            self._limiter, max_buckets=max_local_buckets
+        )
+
+    @property
+    def limiter(self) -> RateLimiter:
+        if self._storage_dead and self._fallback_limiter:
+            return self._fallback_limiter
+        return self._local_limiter
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "storage": type(self._storage).__name__,
+            "storage_dead": self._storage_dead,
+            **self._local_limiter.stats(),
+        }
+
+
+def build_limiter(
+    storage_uri: str,
+    storage_options: Optional[Dict[str, Any]] = None,
+) -> DistributedLimiter:
+    """Create a limiter backed by the given limits storage URI."""
+    options = dict(storage_options or {})
+    if storage_uri.startswith(("redis://", "rediss://")):
+        # Limit checks run on the event loop; never wait long on Redis
+        timeout = settings.RATE_LIMIT_REDIS_TIMEOUT_SECONDS
+        options.setdefault("socket_connect_timeout", timeout)
+        options.setdefault("socket_timeout", timeout)
+    return DistributedLimiter(
+        key_func=rate_limit_key,
+        strategy="moving-window",
+        storage_uri=storage_uri,
+        storage_options=options,
+        in_memory_fallback_enabled=True,
+        key_prefix="heka",
+    )
+
+
+# Create a single limiter instance that can be imported by routes
+limiter = build_limiter(settings.RATE_LIMIT_STORAGE_URI or settings.REDIS_URL)
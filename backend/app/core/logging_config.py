@@ -1,19 +1,166 @@
-"""Logging configuration."""
+"""Logging configuration.
 
+Records are handed to a QueueHandler and written to stdout by a
+QueueListener thread, so request handlers never block on stream I/O.
+Sampling and request-id tagging happen on the QueueHandler, i.e. in the
+calling thread before a record is ever enqueued.
+"""
+
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
 import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
 
 from app.config import settings
 
+# Correlation id for the request currently being handled ("-" outside requests)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request id to every record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of INFO/DEBUG records for selected loggers.
+
+    Rates are matched on the longest dotted prefix of the logger name, so
+    ``{"app.services": 0.1}`` also covers ``app.services.ai_service``.
+    WARNING and above are never sampled out.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, Optional[float]] = {}
+
+    def _rate_for(self, name: str) -> Optional[float]:
+        if name not in self._resolved:
+            rate = None
+            probe = name
+            while probe:
+                if probe in self.rates:
+                    rate = self.rates[probe]
+                    break
+                probe = probe.rpartition(".")[0]
+            self._resolved[name] = rate
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate_for(record.name)
+        return rate is None or random.random() < rate
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _PreparingQueueHandler(QueueHandler):
+    """QueueHandler that keeps the traceback separate from the message.
+
+    The stock prepare() folds the traceback into msg; keeping it in
+    exc_text lets the JSON formatter emit it as its own field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RequestIdMiddleware:
+    """ASGI middleware that sets request_id_var and echoes it as X-Request-ID."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER.encode(), request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+def _build_stream_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
+        ))
+    return handler
+
+
 # Configure logging
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_queue_handler = _PreparingQueueHandler(_log_queue)
+_queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+_queue_handler.addFilter(RequestIdFilter())
+
 logging.basicConfig(
     level=logging.DEBUG if settings.DEBUG else logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
+    handlers=[_queue_handler],
+    force=True,
 )
 
+_listener = QueueListener(_log_queue, _build_stream_handler(), respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
 logger = logging.getLogger("heka")
 
 # Set specific log levels
@@ -23,4 +170,3 @@ logging.getLogger("pymongo").setLevel(logging.WARNING)  # Reduce MongoDB connect
 logging.getLogger("pymongo.topology").setLevel(logging.WARNING)
 logging.getLogger("pymongo.connection").setLevel(logging.WARNING)
 logging.getLogger("pymongo.serverSelection").setLevel(logging.WARNING)
-
@@ -0,0 +1,71 @@
+"""Keyset (cursor) pagination, newest first.
+
+``skip(offset)`` makes the server walk and discard ``offset`` index entries
+on every page, so deep pages get linearly slower. A keyset page instead
+starts right after the last document of the previous page: the query adds
+``(field, _id) < (last field value, last _id)`` and sorts on
+``(field, _id)`` descending, which the ``(couple_id, field, _id)`` indexes
+serve directly.
+
+Cursors are opaque to clients: the last document's sort value and id,
+base64url encoded.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import DESCENDING
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Keyset:
+    """Cursor pagination over (field, _id), both descending."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.sort = [(field, DESCENDING), ("_id", DESCENDING)]
+
+    def encode(self, document: Dict[str, Any]) -> str:
+        """Cursor pointing just past a document."""
+        raw = f"{document[self.field].isoformat()}|{document['_id']}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def after(self, cursor: Optional[str]) -> Dict[str, Any]:
+        """
+        Query filter for the page that follows ``cursor`` ({} for the first page).
+
+        Raises:
+            ValueError: If the cursor was not produced by encode()
+        """
+        if not cursor:
+            return {}
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            value, oid = raw.rsplit("|", 1)
+            value, oid = datetime.fromisoformat(value), ObjectId(oid)
+        except (ValueError, InvalidId, UnicodeDecodeError):
+            raise ValueError("Invalid cursor")
+        return {"$or": [
+            {self.field: {"$lt": value}},
+            {self.field: value, "_id": {"$lt": oid}},
+        ]}
+
+    def next_cursor(self, documents: List[Dict[str, Any]], limit: int) -> Optional[str]:
+        """Cursor for the next page, or None when this page was the last."""
+        if len(documents) < limit or not documents:
+            return None
+        return self.encode(documents[-1])
+
+    def fields(self, fields: Optional[List[str]]) -> Optional[List[str]]:
+        """A sparse fieldset extended with the sort field the next cursor needs."""
+        if fields is None or self.field in fields:
+            return fields
+        return [*fields, self.field]
+
+
+created_at_keyset = Keyset("created_at")
+week_start_keyset = Keyset("week_start_date")
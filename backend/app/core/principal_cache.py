@@ -0,0 +1,132 @@
+"""In-process cache for authenticated principals.
+
+Maps a hash of the bearer token to the decoded JWT claims and the UserInDB
+snapshot loaded for it, so repeat requests with the same token skip both the
+JWT decode and the users lookup. Entries live for a short TTL (never past the
+token's own expiry) and are evicted LRU once the cache is full.
+
+The cache is per worker process. Code that changes a user in a way that must
+take effect immediately (deactivation, password reset, deletion) calls
+``invalidate_user``; other workers pick the change up when their TTL lapses.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.config import settings
+from app.models.user import UserInDB
+
+
+def _token_key(token: str) -> str:
+    """Hash the raw token so it is never held as a dict key."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """Bounded TTL/LRU cache of (claims, user) keyed by token hash."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any], UserInDB]]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, token: str) -> Optional[Tuple[Dict[str, Any], UserInDB]]:
+        """Return cached (claims, user) for a token, or None on miss/expiry."""
+        if not self.enabled:
+            return None
+        key = _token_key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims, user = entry
+            if expires_at <= now:
+                self._remove(key, user.id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Hand out a copy so callers can't mutate the shared snapshot
+        return claims, user.model_copy()
+
+    def put(self, token: str, claims: Dict[str, Any], user: UserInDB) -> None:
+        """Cache a freshly validated principal."""
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        token_exp = claims.get("exp")
+        if isinstance(token_exp, (int, float)):
+            expires_at = min(expires_at, float(token_exp))
+
+        key = _token_key(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, self._entries[key][2].id)
+            self._entries[key] = (expires_at, claims, user.model_copy())
+            self._keys_by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                old_key, (_, _, old_user) = self._entries.popitem(last=False)
+                self._discard_user_key(old_user.id, old_key)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every cached token for a user. Returns the number removed."""
+        with self._lock:
+            keys = self._keys_by_user.pop(str(user_id), set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: str, user_id: Optional[str]) -> None:
+        self._entries.pop(key, None)
+        if user_id:
+            self._discard_user_key(user_id, key)
+
+    def _discard_user_key(self, user_id: str, key: str) -> None:
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
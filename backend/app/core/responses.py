@@ -0,0 +1,52 @@
+"""orjson-rendered JSON responses.
+
+``ORJSONResponse`` is the application's default response class. Handlers
+that already hold response-shaped data (Mongo documents fetched with a
+projection, plain dicts) can return it wrapped in an ``ORJSONResponse`` to
+skip FastAPI's ``response_model`` validation and serialization pass; the
+declared ``response_model`` still documents the shape in OpenAPI.
+
+datetime, date, enum and UUID values are encoded natively by orjson (the
+same ISO-8601 strings Pydantic produces for naive datetimes); ObjectIds
+and Pydantic models are handled by ``_default``.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content the way API responses are rendered."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, encoding ObjectIds as strings."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def public_document(document: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Expose a Mongo document's ``_id`` as ``id`` (in place).
+
+    With a sparse fieldset, a new dict holding just those fields is returned
+    instead (documents may carry extra keys, e.g. a pagination sort key).
+    """
+    if fields is not None:
+        return {field: document.get("_id" if field == "id" else field) for field in fields}
+    document["id"] = document.pop("_id")
+    return document
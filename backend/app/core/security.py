@@ -1,51 +1,157 @@
 """Security utilities for authentication."""
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 import bcrypt
 from jose import JWTError, jwt
 
 from app.config import settings
 
+T = TypeVar("T")
+
 # Bcrypt rounds for password hashing
-BCRYPT_ROUNDS = 12
+BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
-    password_bytes = plain_password.encode('utf-8')
+class PasswordHashingBusyError(Exception):
+    """Raised when the password hashing pool has no room for more work."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing capacity exhausted")
+        self.retry_after = retry_after
+
+
+def _truncate(password: str) -> bytes:
+    password_bytes = password.encode('utf-8')
     # Truncate to 72 bytes if longer (bcrypt limitation)
     if len(password_bytes) > 72:
         password_bytes = password_bytes[:72]
+    return password_bytes
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash."""
     try:
-        return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
+        return bcrypt.checkpw(_truncate(plain_password), hashed_password.encode('utf-8'))
     except Exception:
         return False
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
     """Hash a password. Handles bcrypt's 72-byte limit."""
-    password_bytes = password.encode('utf-8')
-    # Truncate to 72 bytes if longer (bcrypt limitation)
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    hashed = bcrypt.hashpw(_truncate(password), salt)
     return hashed.decode('utf-8')
 
 
+def get_hash_rounds(hashed_password: str) -> Optional[int]:
+    """Return the cost factor encoded in a bcrypt hash ($2b$<cost>$...)."""
+    parts = hashed_password.split("$")
+    if len(parts) < 4:
+        return None
+    try:
+        return int(parts[2])
+    except ValueError:
+        return None
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when a stored hash was made with a different cost than configured."""
+    rounds = get_hash_rounds(hashed_password)
+    return rounds is not None and rounds != BCRYPT_ROUNDS
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL while hashing, so moving it off the event loop
+    keeps other requests flowing during a login burst. Work beyond
+    ``max_pending`` (queued + running) is rejected with
+    PasswordHashingBusyError instead of piling up behind the pool.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHashingBusyError()
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await password_hasher.hash(password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
-    
+
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    
+
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
@@ -59,4 +165,3 @@ def verify_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
 
-
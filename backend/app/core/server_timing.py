@@ -0,0 +1,29 @@
+"""Per-section durations for the ``Server-Timing`` response header."""
+
+import time
+from typing import Awaitable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class ServerTiming:
+    """
+    Collects named durations (in milliseconds) for one response.
+
+    Browsers' devtools and most APM tools show the header as a breakdown
+    of where the request spent its time.
+    """
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+
+    async def measure(self, name: str, awaitable: Awaitable[T]) -> T:
+        """Await and record how long it took (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.durations[name] = (time.perf_counter() - start) * 1000
+
+    def header(self) -> str:
+        return ", ".join(f"{name};dur={ms:.1f}" for name, ms in self.durations.items())
@@ -0,0 +1,55 @@
+"""Rebuild and verify the per-couple summaries (``couple_summaries``).
+
+    python -m app.couple_summaries rebuild [--force]
+    python -m app.couple_summaries check [--fix] [--limit N]
+
+``rebuild`` recomputes every summary that is missing or stored under
+another SUMMARY_VERSION (all of them with --force); run it after bumping
+the version so couples do not pay for the rebuild on their next read.
+``check`` recomputes stored summaries from the source collections and
+lists those that drifted, exiting non-zero if any did so it can run as a
+scheduled job; --fix stores the recomputed summaries.
+"""
+
+import argparse
+import asyncio
+import sys
+
+import app.core.logging_config  # noqa: F401  (configures logging)
+from app.db.database import close_mongo_connection, connect_to_mongo, get_database
+from app.services.couple_summary_service import couple_summary_service
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.couple_summaries", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild", help="Rebuild missing and outdated summaries")
+    rebuild.add_argument("--force", action="store_true", help="Rebuild every couple's summary")
+
+    check = commands.add_parser("check", help="Report summaries that drifted from the source collections")
+    check.add_argument("--fix", action="store_true", help="Store the recomputed summaries")
+    check.add_argument("--limit", type=int, default=0, help="Check at most this many summaries")
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> int:
+    await connect_to_mongo()
+    try:
+        db = get_database()
+        if args.command == "rebuild":
+            rebuilt = await couple_summary_service.rebuild_all(db, force=args.force)
+            print(f"Rebuilt {rebuilt} summaries")
+            return 0
+
+        drifted = await couple_summary_service.check(db, fix=args.fix, limit=args.limit)
+        for entry in drifted:
+            print(f"{entry['couple_id']}: {', '.join(entry['sections'])}")
+        print(f"{len(drifted)} drifted summaries{' fixed' if args.fix and drifted else ''}")
+        return 1 if drifted and not args.fix else 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(_parse_args())))
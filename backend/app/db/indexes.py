@@ -16,10 +16,12 @@ async def create_indexes(db: AsyncIOMotorDatabase):
     await db.couples.create_index("user2_id")
     await db.couples.create_index([("user1_id", ASCENDING), ("user2_id", ASCENDING)], unique=True)
     await db.couples.create_index("status")
+    await db.couples.create_index([("member_ids", ASCENDING), ("status", ASCENDING)])
     
     # Arguments collection indexes
     await db.arguments.create_index("couple_id")
-    await db.arguments.create_index([("couple_id", ASCENDING), ("created_at", DESCENDING)])
+    # (couple_id, created_at, _id) serves newest-first keyset pages (app.core.pagination)
+    await db.arguments.create_index([("couple_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)])
     await db.arguments.create_index("status")
     await db.arguments.create_index("category")
     
@@ -27,6 +29,8 @@ async def create_indexes(db: AsyncIOMotorDatabase):
     await db.perspectives.create_index("argument_id")
     await db.perspectives.create_index("user_id")
     await db.perspectives.create_index([("argument_id", ASCENDING), ("user_id", ASCENDING)], unique=True)
+    # Stale safety verdicts (app.rescore_perspectives)
+    await db.perspectives.create_index("safety.version")
     
     # AI Insights collection indexes
     await db.ai_insights.create_index("argument_id", unique=True)
@@ -42,13 +46,16 @@ async def create_indexes(db: AsyncIOMotorDatabase):
     
     # Relationship Check-ins collection indexes
     await db.relationship_checkins.create_index("couple_id")
-    await db.relationship_checkins.create_index([("couple_id", ASCENDING), ("week_start_date", DESCENDING)])
+    await db.relationship_checkins.create_index(
+        [("couple_id", ASCENDING), ("week_start_date", DESCENDING), ("_id", DESCENDING)]
+    )
     await db.relationship_checkins.create_index("status")
     await db.relationship_checkins.create_index("week_start_date")
     
     # Relationship Goals collection indexes
     await db.relationship_goals.create_index("couple_id")
     await db.relationship_goals.create_index([("couple_id", ASCENDING), ("status", ASCENDING)])
+    await db.relationship_goals.create_index([("couple_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)])
     await db.relationship_goals.create_index("status")
     await db.relationship_goals.create_index("created_at")
     
@@ -64,9 +71,25 @@ async def create_indexes(db: AsyncIOMotorDatabase):
     await db.usages.create_index("period_start")
     await db.usages.create_index("period_end")
 
+    # Couple summaries (read model, one per couple; app.services.couple_summary_service)
+    await db.couple_summaries.create_index("couple_id", unique=True)
+
     # AI Suggestion Cache collection indexes
     await db.ai_suggestion_cache.create_index([("couple_id", ASCENDING), ("suggestion_type", ASCENDING)], unique=True)
     await db.ai_suggestion_cache.create_index("expires_at")
     
+    # Background jobs collection indexes
+    await db.jobs.create_index([("status", ASCENDING), ("run_at", ASCENDING)])
+    await db.jobs.create_index([("status", ASCENDING), ("lease_until", ASCENDING)])
+    await db.jobs.create_index([("type", ASCENDING), ("status", ASCENDING), ("payload.argument_id", ASCENDING)])
+    await db.jobs.create_index("expires_at", expireAfterSeconds=0)
+
+    # LLM usage daily rollup indexes
+    await db.llm_usage_daily.create_index(
+        [("day", ASCENDING), ("couple_id", ASCENDING), ("feature", ASCENDING), ("model", ASCENDING)],
+        unique=True
+    )
+    await db.llm_usage_daily.create_index([("couple_id", ASCENDING), ("day", ASCENDING)])
+
     print("Database indexes created successfully")
 
@@ -0,0 +1,89 @@
+"""Per-collection reads with projections declared per use case.
+
+Each repository names the views its callers need ("response", "summary", ...)
+and the stored fields each view reads, so list endpoints and the couple
+summaries stop pulling whole documents (goal progress arrays in particular).
+Code that decodes or rewrites whole documents keeps using the collection
+directly.
+
+Clients can narrow a view further with a sparse fieldset (the ``fields=``
+query parameter, see ``app.api.dependencies.sparse_fields``); requested
+fields must belong to the view and ``id`` is always returned.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCursor, AsyncIOMotorDatabase
+
+
+class Repository:
+    """Reads for one collection, by named view."""
+
+    def __init__(self, collection: str, views: Mapping[str, Iterable[str]]):
+        """
+        Args:
+            collection: Collection name
+            views: View name -> stored fields it reads
+        """
+        self.collection = collection
+        self.views: Dict[str, Dict[str, int]] = {
+            name: {field: 1 for field in fields} for name, fields in views.items()
+        }
+
+    def check_fields(self, view: str, fields: Iterable[str]) -> None:
+        """Raise ValueError unless every requested field is exposed by the view."""
+        projection = self.views[view]
+        unknown = [field for field in fields if field != "id" and field not in projection]
+        if unknown:
+            raise ValueError(
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Available: {', '.join(['id', *projection])}"
+            )
+
+    def projection(self, view: str, fields: Optional[List[str]] = None) -> Dict[str, int]:
+        """Projection for a view, narrowed to a sparse fieldset when one is given."""
+        if not fields:
+            return self.views[view]
+        self.check_fields(view, fields)
+        # _id is always returned; an empty projection would mean "everything"
+        return {field: 1 for field in fields if field != "id"} or {"_id": 1}
+
+    def find(
+        self,
+        db: AsyncIOMotorDatabase,
+        query: Dict[str, Any],
+        view: str,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIOMotorCursor:
+        return db[self.collection].find(query, self.projection(view, fields))
+
+    async def find_one(
+        self,
+        db: AsyncIOMotorDatabase,
+        query: Dict[str, Any],
+        view: str,
+        fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        return await db[self.collection].find_one(query, self.projection(view, fields))
+
+
+argument_repository = Repository("arguments", {
+    "response": ["couple_id", "title", "category", "priority", "status", "created_at", "updated_at"],
+    "summary": ["title", "priority", "status", "category", "created_at"],
+})
+
+goal_repository = Repository("relationship_goals", {
+    "response": [
+        "couple_id", "title", "description", "status", "target_date", "progress",
+        "created_by_user_id", "progress_updates", "created_at", "updated_at", "completed_at",
+    ],
+    "summary": ["title", "status", "target_date", "created_at"],
+})
+
+perspective_repository = Repository("perspectives", {
+    "response": ["argument_id", "user_id", "content", "created_at"],
+})
+
+checkin_repository = Repository("relationship_checkins", {
+    "summary": ["week_start_date", "status", "completed_at"],
+})
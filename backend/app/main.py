@@ -1,9 +1,13 @@
 """Main FastAPI application."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
@@ -15,32 +19,72 @@ from app.api import (
     couples,
     dashboard,
     goals,
+    jobs,
     notifications,
     perspectives,
     subscriptions,
     users,
 )
 from app.config import settings
+from app.core.http_client import http_client
 from app.core.limiter import limiter
-from app.core.logging_config import logger
+from app.core.logging_config import RequestIdMiddleware, logger
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.principal_cache import principal_cache
+from app.core.responses import ORJSONResponse
+from app.core.security import PasswordHashingBusyError, password_hasher
 from app.core.sentry_config import init_sentry
 from app.db.database import close_mongo_connection, connect_to_mongo, get_database
+from app.services.ai_service import ai_service
+from app.services.couple_service import backfill_member_ids
+from app.services.llm_router import LLMUnavailableError
+from app.worker import JobWorker
 
 # Initialize Sentry before app creation
 init_sentry()
 
 
+async def _backfill_member_ids(db) -> None:
+    """Run the member_ids backfill as a startup task, logging any failure."""
+    try:
+        await backfill_member_ids(db)
+    except Exception:
+        logger.exception("member_ids backfill failed; couple lookups keep using the legacy query")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan events: startup and shutdown."""
     # Startup
     logger.info("Starting Heka API...")
     await connect_to_mongo()
+    # Online migration: lookups fall back to the legacy query until it finishes
+    backfill_task = asyncio.create_task(_backfill_member_ids(get_database()))
+    await http_client.start()
+    warmup_task = (
+        asyncio.create_task(ai_service.warm_up())
+        if settings.OPENAI_WARMUP_ON_STARTUP else None
+    )
+    job_worker = JobWorker(get_database()) if settings.JOB_WORKER_EMBEDDED else None
+    job_worker_task = asyncio.create_task(job_worker.run()) if job_worker else None
+    app.state.job_worker = job_worker
     logger.info("Heka API started successfully")
     yield
     # Shutdown
     logger.info("Shutting down Heka API...")
+    backfill_task.cancel()
+    if job_worker:
+        # Let in-flight jobs finish briefly; anything cut off is re-run after its lease expires
+        job_worker.stop()
+        try:
+            await asyncio.wait_for(job_worker_task, timeout=10)
+        except asyncio.TimeoutError:
+            logger.warning("Job worker did not stop in time; unfinished jobs will be retried")
+    if warmup_task:
+        warmup_task.cancel()
+    await http_client.aclose()
     await close_mongo_connection()
+    password_hasher.shutdown()
     logger.info("Heka API shut down")
 
 
@@ -49,6 +93,7 @@ app = FastAPI(
     version=settings.VERSION,
     debug=settings.DEBUG,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",  # Explicitly enable Swagger UI
     redoc_url="/redoc",  # Explicitly enable ReDoc
     openapi_url="/openapi.json",  # Explicitly enable OpenAPI schema
@@ -59,6 +104,39 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+
+@app.exception_handler(PasswordHashingBusyError)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusyError):
+    """Shed load when the bcrypt pool is saturated instead of queueing forever."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(request: Request, exc: RequestValidationError):
+    """Malformed ids (PyObjectId) are a 400 like other bad input; everything else stays 422."""
+    errors = exc.errors()
+    if errors and all(error["type"] == "object_id" for error in errors):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": errors[0]["msg"]},
+        )
+    return await request_validation_exception_handler(request, exc)
+
+
+@app.exception_handler(LLMUnavailableError)
+async def llm_unavailable_handler(request: Request, exc: LLMUnavailableError):
+    """Every AI provider failed or is circuit-open; tell clients when to come back."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -66,8 +144,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", NEXT_CURSOR_HEADER],
 )
 
+# Request-id correlation for logs (outermost, so every log line is tagged)
+app.add_middleware(RequestIdMiddleware)
+
 
 @app.get("/")
 async def root():
@@ -94,7 +176,14 @@ async def health_check():
         "checks": {
             "database": "unknown",
             "api": "ok"
-        }
+        },
+        "caches": {
+            "principal": principal_cache.stats()
+        },
+        "password_hashing": password_hasher.stats(),
+        "rate_limiter": limiter.stats(),
+        "llm_router": ai_service.router.stats(),
+        "job_worker": app.state.job_worker.stats() if getattr(app.state, "job_worker", None) else None
     }
     
     from datetime import datetime
@@ -130,4 +219,5 @@ app.include_router(goals.router)
 app.include_router(subscriptions.router)
 app.include_router(notifications.router)
 app.include_router(dashboard.router)
+app.include_router(jobs.router)
 
@@ -3,9 +3,10 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.codec import MongoCodec
+
 
 class AIInsight(BaseModel):
     """AI-generated insights for an argument."""
@@ -28,6 +29,7 @@ class AIInsight(BaseModel):
     ai_model: Optional[str] = Field(None, alias="model_used")  # "gpt-4", "gemini-2.5-flash", etc.
     cost: Optional[float] = None  # Cost of API call
     tokens_used: Optional[Dict[str, int]] = None  # {"input": X, "output": Y}
+    prompt_version: Optional[str] = None  # prompt registry id, e.g. "mediation@v1"
     
     # Timestamps
     generated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -42,21 +44,11 @@ class AIInsightInDB(AIInsight):
     @classmethod
     def from_mongo(cls, data: dict) -> "AIInsightInDB":
         """Convert MongoDB document to AIInsightInDB."""
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "argument_id" in data and isinstance(data["argument_id"], ObjectId):
-            data["argument_id"] = str(data["argument_id"])
-        # Handle model_used field alias
-        if "model_used" in data and "ai_model" not in data:
-            data["ai_model"] = data["model_used"]
-        return cls(**data)
-    
+        return _codec.decode(data)
+
     def to_mongo(self) -> dict:
         """Convert AIInsightInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "argument_id" in data and isinstance(data["argument_id"], str):
-            data["argument_id"] = ObjectId(data["argument_id"])
-        return data
+        return _codec.encode(self)
+
+
+_codec = MongoCodec(AIInsightInDB, object_ids=("argument_id",))
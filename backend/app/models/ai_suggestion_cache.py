@@ -3,9 +3,10 @@
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.codec import MongoCodec
+
 
 class AISuggestionCache(BaseModel):
     """AI-generated suggestions cache for goals/check-ins."""
@@ -36,22 +37,12 @@ class AISuggestionCacheInDB(AISuggestionCache):
     @classmethod
     def from_mongo(cls, data: dict) -> "AISuggestionCacheInDB":
         """Convert MongoDB document to AISuggestionCacheInDB."""
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "couple_id" in data and isinstance(data["couple_id"], ObjectId):
-            data["couple_id"] = str(data["couple_id"])
-        return cls(**data)
-    
+        return _codec.decode(data)
+
     def to_mongo(self) -> dict:
         """Convert AISuggestionCacheInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "couple_id" in data and isinstance(data["couple_id"], str):
-            data["couple_id"] = ObjectId(data["couple_id"])
-        return data
-    
+        return _codec.encode(self)
+
     @classmethod
     def create_new(
         cls,
@@ -75,3 +66,5 @@ class AISuggestionCacheInDB(AISuggestionCache):
             expires_at=now + timedelta(days=7)
         )
 
+
+_codec = MongoCodec(AISuggestionCacheInDB, object_ids=("couple_id",))
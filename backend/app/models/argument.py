@@ -4,9 +4,10 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.codec import MongoCodec
+
 
 class ArgumentCategory(str, Enum):
     """Argument categories."""
@@ -62,19 +63,11 @@ class ArgumentInDB(Argument):
     @classmethod
     def from_mongo(cls, data: dict) -> "ArgumentInDB":
         """Convert MongoDB document to ArgumentInDB."""
-        data = dict(data)  # copy — never mutate the caller's dict
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "couple_id" in data and isinstance(data["couple_id"], ObjectId):
-            data["couple_id"] = str(data["couple_id"])
-        return cls(**data)
-    
+        return _codec.decode(data)
+
     def to_mongo(self) -> dict:
         """Convert ArgumentInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "couple_id" in data and isinstance(data["couple_id"], str):
-            data["couple_id"] = ObjectId(data["couple_id"])
-        return data
+        return _codec.encode(self)
+
+
+_codec = MongoCodec(ArgumentInDB, object_ids=("couple_id",))
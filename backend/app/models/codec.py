@@ -0,0 +1,181 @@
+"""Validation-free conversion between models and the documents we store.
+
+Documents read back from MongoDB were written by ``to_mongo`` and are
+trusted, so re-running full Pydantic validation on every read only burns
+CPU. ``MongoCodec`` precomputes, once per model, which fields need a
+conversion (ObjectId <-> str, datetime <-> date, enum values, nested
+models) and builds instances with ``model_construct``. The source
+document is never mutated.
+
+Anything that does not come from our own writes (request bodies, external
+APIs) must keep going through normal validation.
+"""
+
+import typing
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+Converter = Callable[[Any], Any]
+
+_setattr = object.__setattr__
+
+
+def _unwrap(annotation: Any) -> Tuple[Any, bool]:
+    """Strip Optional[...]; return (inner type, is_list)."""
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            annotation = args[0]
+    if typing.get_origin(annotation) in (list, List):
+        args = typing.get_args(annotation)
+        return (args[0] if args else Any), True
+    return annotation, False
+
+
+def _each(convert: Converter) -> Converter:
+    return lambda values: [convert(value) for value in values] if values else values
+
+
+def _id_to_str(value: Any) -> Any:
+    return str(value) if isinstance(value, ObjectId) else value
+
+
+def _str_to_id(value: Any) -> Any:
+    return ObjectId(value) if isinstance(value, str) and value else value
+
+
+def _to_date(value: Any) -> Any:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _to_datetime(value: Any) -> Any:
+    # datetime is a date subclass and is stored as is
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, datetime.min.time())
+    return value
+
+
+def _enum_decoder(enum: Type[Enum]) -> Converter:
+    members = {member.value: member for member in enum}
+
+    def decode(value: Any) -> Any:
+        if isinstance(value, enum):
+            return value
+        member = members.get(value)
+        return member if member is not None else enum(value)  # unknown value: ValueError
+
+    return decode
+
+
+class MongoCodec:
+    """Per-model plan for decoding trusted documents and encoding instances."""
+
+    def __init__(self, model: Type[ModelT], object_ids: Iterable[str] = ()):
+        """
+        Args:
+            model: Pydantic model the documents hold
+            object_ids: Fields stored as ObjectId (or lists of them) and
+                exposed as strings on the model
+        """
+        self.model = model
+        object_ids = set(object_ids)
+        unknown = object_ids - set(model.model_fields)
+        if unknown:
+            raise ValueError(f"{model.__name__} has no fields {sorted(unknown)}")
+
+        # document key -> field name, for every key a document may use
+        self._names: Dict[str, str] = {}
+        # field name -> converter, only for fields that need one
+        self._decoders: Dict[str, Converter] = {}
+        # field name -> (document key, converter or None)
+        self._encoders: Dict[str, Tuple[str, Optional[Converter]]] = {}
+        # optional fields, filled from their defaults when a document lacks them
+        self._field_count = len(model.model_fields)
+        self._optional = [(name, field) for name, field in model.model_fields.items() if not field.is_required()]
+        # field exposed as the document's _id (omitted from the document when unset)
+        self._id_field: Optional[str] = None
+        # post-init hooks, root models and extras are left to model_construct
+        self._fast = not (
+            model.__pydantic_post_init__
+            or model.__pydantic_root_model__
+            or model.model_config.get("extra") == "allow"
+        )
+
+        for name, field in model.model_fields.items():
+            inner, is_list = _unwrap(field.annotation)
+            decode: Optional[Converter] = None
+            encode: Optional[Converter] = None
+            if name in object_ids:
+                decode, encode = _id_to_str, _str_to_id
+            elif isinstance(inner, type) and issubclass(inner, Enum):
+                decode = _enum_decoder(inner)
+            elif inner is date:
+                decode, encode = _to_date, _to_datetime
+            elif isinstance(inner, type) and issubclass(inner, BaseModel):
+                nested = MongoCodec(inner)
+                decode, encode = nested.decode_value, nested.encode
+            if is_list:
+                decode = decode and _each(decode)
+                encode = encode and _each(encode)
+
+            stored_as = name
+            if field.alias == "_id":
+                stored_as = "_id"
+                decode, encode = _id_to_str, _str_to_id
+                self._id_field = name
+            self._names[stored_as] = name
+            if field.alias:
+                self._names.setdefault(field.alias, name)
+            if decode is not None:
+                self._decoders[name] = decode
+            self._encoders[name] = (stored_as, encode)
+
+    def convert(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Field values for a stored document: converted, not validated."""
+        names = self._names
+        # unknown keys are ignored, as validation would
+        values = {names[key]: value for key, value in document.items() if key in names}
+        for name, decode in self._decoders.items():
+            value = values.get(name)
+            if value is not None:
+                values[name] = decode(value)
+        return values
+
+    def decode(self, document: Dict[str, Any]) -> ModelT:
+        """Build a model instance from a stored document without validation."""
+        values = self.convert(document)
+        if not self._fast:
+            return self.model.model_construct(**values)
+
+        # model_construct() without its per-field alias lookups
+        fields_set = set(values)
+        if len(values) < self._field_count:
+            for name, field in self._optional:
+                if name not in values:
+                    values[name] = field.get_default(call_default_factory=True)
+        instance = self.model.__new__(self.model)
+        _setattr(instance, "__dict__", values)
+        _setattr(instance, "__pydantic_fields_set__", fields_set)
+        _setattr(instance, "__pydantic_extra__", None)
+        _setattr(instance, "__pydantic_private__", None)
+        return instance
+
+    def decode_value(self, value: Any) -> Any:
+        """decode() for nested documents; model instances pass through."""
+        return self.decode(value) if isinstance(value, dict) else value
+
+    def encode(self, instance: BaseModel) -> Dict[str, Any]:
+        """Build the stored document for an instance (``_id`` only when the id is set)."""
+        document = {}
+        for name, (key, convert) in self._encoders.items():
+            value = getattr(instance, name, None)
+            if name == self._id_field and not value:
+                continue
+            document[key] = convert(value) if convert is not None and value is not None else value
+        return document
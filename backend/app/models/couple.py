@@ -2,10 +2,11 @@
 
 from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
-from bson import ObjectId
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from app.models.codec import MongoCodec
 
 
 class CoupleStatus(str, Enum):
@@ -24,6 +25,9 @@ class Couple(BaseModel):
     user1_id: str
     user2_id: str
     
+    # Both user ids, mirrored for the multikey (member_ids, status) index
+    member_ids: List[str] = Field(default_factory=list)
+    
     # Relationship details
     relationship_start_date: Optional[date] = None
     status: CoupleStatus = CoupleStatus.ACTIVE
@@ -32,6 +36,13 @@ class Couple(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
+    @model_validator(mode="after")
+    def fill_member_ids(self) -> "Couple":
+        """Derive member_ids from the two user ids when not stored yet."""
+        if not self.member_ids:
+            self.member_ids = [self.user1_id, self.user2_id]
+        return self
+    
     class Config:
         populate_by_name = True
         json_schema_extra = {
@@ -49,24 +60,17 @@ class CoupleInDB(Couple):
     @classmethod
     def from_mongo(cls, data: dict) -> "CoupleInDB":
         """Convert MongoDB document to CoupleInDB."""
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        # Convert ObjectId to string
-        if "user1_id" in data and isinstance(data["user1_id"], ObjectId):
-            data["user1_id"] = str(data["user1_id"])
-        if "user2_id" in data and isinstance(data["user2_id"], ObjectId):
-            data["user2_id"] = str(data["user2_id"])
-        return cls(**data)
+        couple = _codec.decode(data)
+        # Validators don't run on decode; legacy documents lack member_ids
+        if not couple.member_ids:
+            couple.member_ids = [couple.user1_id, couple.user2_id]
+        return couple
     
     def to_mongo(self) -> dict:
         """Convert CoupleInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        # Convert string IDs to ObjectId for MongoDB
-        if "user1_id" in data and isinstance(data["user1_id"], str):
-            data["user1_id"] = ObjectId(data["user1_id"])
-        if "user2_id" in data and isinstance(data["user2_id"], str):
-            data["user2_id"] = ObjectId(data["user2_id"])
+        data = _codec.encode(self)
+        data["member_ids"] = [data["user1_id"], data["user2_id"]]
         return data
+
+
+_codec = MongoCodec(CoupleInDB, object_ids=("user1_id", "user2_id", "member_ids"))
@@ -0,0 +1,99 @@
+"""Per-couple summary document (read model) for MongoDB."""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.codec import MongoCodec
+from app.models.subscription import SubscriptionStatus, SubscriptionTier
+
+# Bump whenever the document shape or the way a section is derived changes;
+# summaries stored under another version are rebuilt on their next read
+# (or eagerly with ``python -m app.couple_summaries rebuild``).
+SUMMARY_VERSION = 1
+
+
+class SummaryArgument(BaseModel):
+    """One of the couple's most recent arguments."""
+    id: str
+    title: str = ""
+    priority: str = ""
+    status: str = ""
+    category: str = ""
+    created_at: Optional[datetime] = None
+
+
+class SummaryGoal(BaseModel):
+    """An active goal (at most 10 per couple, so all of them are kept)."""
+    id: str
+    title: str = ""
+    status: str = ""
+    target_date: Optional[datetime] = None  # as stored on the goal
+    created_at: Optional[datetime] = None
+
+
+class SummaryCheckIn(BaseModel):
+    """The couple's latest weekly check-in."""
+    id: str
+    week_start_date: datetime
+    status: str
+    completed_at: Optional[datetime] = None
+
+
+class SummarySubscription(BaseModel):
+    """The subscription fields limits and billing periods are derived from."""
+    tier: SubscriptionTier = SubscriptionTier.FREE
+    status: SubscriptionStatus = SubscriptionStatus.TRIAL
+    trial_end: Optional[datetime] = None
+    current_period_start: Optional[datetime] = None
+    current_period_end: Optional[datetime] = None
+
+
+class SummaryUsage(BaseModel):
+    """Usage in the current billing period, by usage type."""
+    period_start: datetime
+    period_end: datetime
+    counts: Dict[str, int] = Field(default_factory=dict)
+
+
+class CoupleSummary(BaseModel):
+    """
+    Facts the dashboard, usage endpoint and argument creation read together.
+
+    Derived entirely from the source collections: write paths keep it up to
+    date through ``couple_summary_service`` and it can always be rebuilt.
+    """
+
+    id: Optional[str] = Field(None, alias="_id")
+    couple_id: str  # ObjectId reference to Couple
+    version: int = SUMMARY_VERSION
+
+    subscription: Optional[SummarySubscription] = None
+    usage: Optional[SummaryUsage] = None
+    recent_arguments: List[SummaryArgument] = Field(default_factory=list)  # newest first
+    active_goals: List[SummaryGoal] = Field(default_factory=list)  # newest first
+    latest_checkin: Optional[SummaryCheckIn] = None
+
+    # Timestamps
+    rebuilt_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        populate_by_name = True
+
+
+class CoupleSummaryInDB(CoupleSummary):
+    """Couple summary document as stored in MongoDB."""
+
+    @classmethod
+    def from_mongo(cls, data: dict) -> "CoupleSummaryInDB":
+        """Convert MongoDB document to CoupleSummaryInDB."""
+        return _codec.decode(data)
+
+    def to_mongo(self) -> dict:
+        """Convert CoupleSummaryInDB to MongoDB document."""
+        return _codec.encode(self)
+
+
+_codec = MongoCodec(CoupleSummaryInDB, object_ids=("couple_id",))
@@ -3,9 +3,10 @@
 from datetime import datetime
 from typing import Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.codec import MongoCodec
+
 
 class DevicePlatform(str):
     IOS = "ios"
@@ -30,20 +31,12 @@ class DeviceToken(BaseModel):
 
     @classmethod
     def from_mongo(cls, data: dict) -> "DeviceToken":
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "user_id" in data and isinstance(data["user_id"], ObjectId):
-            data["user_id"] = str(data["user_id"])
-        return cls(**data)
+        return _codec.decode(data)
 
     def to_mongo(self) -> dict:
-        data = self.model_dump(exclude={"id"}, by_alias=True)
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "user_id" in data and isinstance(data["user_id"], str):
-            data["user_id"] = ObjectId(data["user_id"])
+        data = _codec.encode(self)
         data["updated_at"] = datetime.utcnow()
         return data
 
 
+_codec = MongoCodec(DeviceToken, object_ids=("user_id",))
@@ -4,9 +4,10 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, EmailStr, Field
 
+from app.models.codec import MongoCodec
+
 
 class InvitationStatus(str, Enum):
     """Invitation status."""
@@ -45,23 +46,11 @@ class InvitationInDB(Invitation):
     @classmethod
     def from_mongo(cls, data: dict) -> "InvitationInDB":
         """Convert MongoDB document to InvitationInDB."""
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "inviter_id" in data and isinstance(data["inviter_id"], ObjectId):
-            data["inviter_id"] = str(data["inviter_id"])
-        if "couple_id" in data and isinstance(data["couple_id"], ObjectId):
-            data["couple_id"] = str(data["couple_id"])
-        return cls(**data)
-    
+        return _codec.decode(data)
+
     def to_mongo(self) -> dict:
         """Convert InvitationInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "inviter_id" in data and isinstance(data["inviter_id"], str):
-            data["inviter_id"] = ObjectId(data["inviter_id"])
-        if "couple_id" in data and isinstance(data["couple_id"], str) and data["couple_id"]:
-            data["couple_id"] = ObjectId(data["couple_id"])
-        return data
+        return _codec.encode(self)
+
 
+_codec = MongoCodec(InvitationInDB, object_ids=("inviter_id", "couple_id"))
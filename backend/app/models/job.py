@@ -0,0 +1,72 @@
+"""Background job model for MongoDB."""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.codec import MongoCodec
+
+
+class JobType(str, Enum):
+    """Kinds of background work."""
+    MEDIATE_ARGUMENT = "mediate_argument"
+    HARMONY_REPORT = "harmony_report"
+
+
+class JobStatus(str, Enum):
+    """Job lifecycle status."""
+    QUEUED = "queued"        # waiting for run_at (new or retry scheduled)
+    RUNNING = "running"      # leased by a worker until lease_until
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"            # retries exhausted or permanent failure (dead letter)
+
+
+class Job(BaseModel):
+    """Unit of background work claimed by workers under a lease."""
+
+    id: Optional[str] = Field(None, alias="_id")
+    type: JobType
+    payload: Dict[str, Any] = Field(default_factory=dict)
+
+    # Ownership (for the job-status endpoint)
+    user_id: Optional[str] = None  # ObjectId reference to User
+    couple_id: Optional[str] = None  # ObjectId reference to Couple
+
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    max_attempts: int = 5
+    run_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Lease held by the worker currently running the job
+    worker_id: Optional[str] = None
+    lease_until: Optional[datetime] = None
+
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None  # TTL for succeeded jobs
+
+    class Config:
+        populate_by_name = True
+
+
+class JobInDB(Job):
+    """Job document as stored in MongoDB."""
+
+    @classmethod
+    def from_mongo(cls, data: dict) -> "JobInDB":
+        """Convert MongoDB document to JobInDB."""
+        return _codec.decode(data)
+
+    def to_mongo(self) -> dict:
+        """Convert JobInDB to MongoDB document."""
+        return _codec.encode(self)
+
+
+_codec = MongoCodec(JobInDB, object_ids=("user_id", "couple_id"))
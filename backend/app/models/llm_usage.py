@@ -0,0 +1,29 @@
+"""LLM token usage model."""
+
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class TokenUsage(BaseModel):
+    """Token counts reported in an OpenAI-compatible ``usage`` block."""
+
+    prompt_tokens: int = 0
+    cached_prompt_tokens: int = 0  # subset of prompt_tokens served from the prompt cache
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @classmethod
+    def from_openai(cls, usage: Optional[Dict[str, Any]]) -> "TokenUsage":
+        """Build from a chat completion ``usage`` dict (missing/None -> zeros)."""
+        if not usage:
+            return cls()
+        details = usage.get("prompt_tokens_details") or {}
+        return cls(
+            prompt_tokens=usage.get("prompt_tokens") or 0,
+            cached_prompt_tokens=details.get("cached_tokens") or 0,
+            completion_tokens=usage.get("completion_tokens") or 0,
+        )
@@ -1,11 +1,21 @@
 """Perspective model for MongoDB."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.codec import MongoCodec
+
+
+class SafetyVerdict(BaseModel):
+    """Result of the safety scan, computed once when the perspective is submitted."""
+
+    version: str  # KeywordScanner.version the verdict was computed with
+    concern_types: List[str] = Field(default_factory=list)
+    matches: List[Dict[str, Any]] = Field(default_factory=list)  # {"type", "term", "start", "end"}
+    scanned_at: datetime = Field(default_factory=datetime.utcnow)
+
 
 class Perspective(BaseModel):
     """User's perspective on an argument."""
@@ -16,6 +26,7 @@ class Perspective(BaseModel):
     
     content: str
     sentiment_score: Optional[float] = None  # For future AI analysis
+    safety: Optional[SafetyVerdict] = None
     
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -31,22 +42,11 @@ class PerspectiveInDB(Perspective):
     @classmethod
     def from_mongo(cls, data: dict) -> "PerspectiveInDB":
         """Convert MongoDB document to PerspectiveInDB."""
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "argument_id" in data and isinstance(data["argument_id"], ObjectId):
-            data["argument_id"] = str(data["argument_id"])
-        if "user_id" in data and isinstance(data["user_id"], ObjectId):
-            data["user_id"] = str(data["user_id"])
-        return cls(**data)
-    
+        return _codec.decode(data)
+
     def to_mongo(self) -> dict:
         """Convert PerspectiveInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "argument_id" in data and isinstance(data["argument_id"], str):
-            data["argument_id"] = ObjectId(data["argument_id"])
-        if "user_id" in data and isinstance(data["user_id"], str):
-            data["user_id"] = ObjectId(data["user_id"])
-        return data
+        return _codec.encode(self)
+
+
+_codec = MongoCodec(PerspectiveInDB, object_ids=("argument_id", "user_id"))
@@ -3,9 +3,10 @@
 from datetime import datetime, timedelta
 from typing import Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.codec import MongoCodec
+
 
 class RefreshToken(BaseModel):
     """Refresh token data stored in MongoDB."""
@@ -28,31 +29,13 @@ class RefreshToken(BaseModel):
     def from_mongo(cls, data: dict) -> "RefreshToken":
         if not data:
             raise ValueError("No refresh token data to deserialize")
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "user_id" in data and isinstance(data["user_id"], ObjectId):
-            data["user_id"] = str(data["user_id"])
-        if (
-            "replaced_by_token_id" in data
-            and isinstance(data["replaced_by_token_id"], ObjectId)
-        ):
-            data["replaced_by_token_id"] = str(data["replaced_by_token_id"])
-        return cls(**data)
+        return _codec.decode(data)
 
     def to_mongo(self) -> dict:
-        data = self.model_dump(exclude={"id"}, by_alias=True)
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "user_id" in data and isinstance(data["user_id"], str):
-            data["user_id"] = ObjectId(data["user_id"])
-        if (
-            "replaced_by_token_id" in data
-            and data["replaced_by_token_id"]
-            and isinstance(data["replaced_by_token_id"], str)
-        ):
-            data["replaced_by_token_id"] = ObjectId(data["replaced_by_token_id"])
-        return data
+        return _codec.encode(self)
+
+
+_codec = MongoCodec(RefreshToken, object_ids=("user_id", "replaced_by_token_id"))
 
 
 def compute_expiry(days: int) -> datetime:
@@ -4,9 +4,10 @@ from datetime import date, datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.codec import MongoCodec
+
 
 class CheckInStatus(str, Enum):
     """Check-in completion status."""
@@ -50,34 +51,18 @@ class RelationshipCheckInInDB(RelationshipCheckIn):
     @classmethod
     def from_mongo(cls, data: dict) -> "RelationshipCheckInInDB":
         """Convert MongoDB document to RelationshipCheckInInDB."""
-        data = dict(data)
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "couple_id" in data and isinstance(data["couple_id"], ObjectId):
-            data["couple_id"] = str(data["couple_id"])
-        if "completed_by" in data and isinstance(data["completed_by"], list):
-            data["completed_by"] = [str(uid) for uid in data["completed_by"]]
+        checkin = _codec.decode(data)
         # Handle legacy completed_by_user_id
-        if "completed_by_user_id" in data:
-            if data["completed_by_user_id"] and str(data["completed_by_user_id"]) not in data.get("completed_by", []):
-                data.setdefault("completed_by", []).append(str(data["completed_by_user_id"]))
-            del data["completed_by_user_id"]
-            
-        if "week_start_date" in data and isinstance(data["week_start_date"], datetime):
-            data["week_start_date"] = data["week_start_date"].date()
-        return cls(**data)
+        legacy_user_id = data.get("completed_by_user_id")
+        if legacy_user_id and str(legacy_user_id) not in checkin.completed_by:
+            checkin.completed_by = [*checkin.completed_by, str(legacy_user_id)]
+        return checkin
     
     def to_mongo(self) -> dict:
         """Convert RelationshipCheckInInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "couple_id" in data and isinstance(data["couple_id"], str):
-            data["couple_id"] = ObjectId(data["couple_id"])
-        if "completed_by" in data and isinstance(data["completed_by"], list):
-            data["completed_by"] = [ObjectId(uid) for uid in data["completed_by"] if uid]
-        if "week_start_date" in data and isinstance(data["week_start_date"], date):
-            data["week_start_date"] = datetime.combine(data["week_start_date"], datetime.min.time())
+        data = _codec.encode(self)
+        data["completed_by"] = [uid for uid in data["completed_by"] if uid]
         return data
 
+
+_codec = MongoCodec(RelationshipCheckInInDB, object_ids=("couple_id", "completed_by"))
@@ -5,9 +5,10 @@ from datetime import date, datetime
 from enum import Enum
 from typing import List, Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.codec import MongoCodec
+
 
 class GoalStatus(str, Enum):
     """Goal status."""
@@ -26,6 +27,10 @@ class GoalProgress(BaseModel):
     progress_value: Optional[float] = None  # 0.0 to 1.0 (0% to 100%)
     reactions: List[dict] = Field(default_factory=list)  # [{"user_id": "...", "emoji": "❤️"}]
 
+    def to_mongo(self) -> dict:
+        """Convert GoalProgress to its embedded MongoDB document."""
+        return _progress_codec.encode(self)
+
 
 class RelationshipGoal(BaseModel):
     """Relationship goal document."""
@@ -61,44 +66,12 @@ class RelationshipGoalInDB(RelationshipGoal):
     @classmethod
     def from_mongo(cls, data: dict) -> "RelationshipGoalInDB":
         """Convert MongoDB document to RelationshipGoalInDB."""
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "couple_id" in data and isinstance(data["couple_id"], ObjectId):
-            data["couple_id"] = str(data["couple_id"])
-        if "created_by_user_id" in data and isinstance(data["created_by_user_id"], ObjectId):
-            data["created_by_user_id"] = str(data["created_by_user_id"])
-        if "target_date" in data and isinstance(data["target_date"], datetime):
-            data["target_date"] = data["target_date"].date()
-        # Convert progress entries
-        if "progress" in data and data["progress"]:
-            progress_list = []
-            for p in data["progress"]:
-                if isinstance(p.get("date"), datetime):
-                    p["date"] = p["date"].date()
-                progress_list.append(GoalProgress(**p))
-            data["progress"] = progress_list
-        return cls(**data)
-    
+        return _codec.decode(data)
+
     def to_mongo(self) -> dict:
         """Convert RelationshipGoalInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "couple_id" in data and isinstance(data["couple_id"], str):
-            data["couple_id"] = ObjectId(data["couple_id"])
-        if "created_by_user_id" in data and isinstance(data["created_by_user_id"], str):
-            data["created_by_user_id"] = ObjectId(data["created_by_user_id"])
-        if "target_date" in data and isinstance(data["target_date"], date) and data["target_date"]:
-            data["target_date"] = datetime.combine(data["target_date"], datetime.min.time())
-        # Convert progress dates
-        if "progress" in data:
-            progress_list = []
-            for p in data["progress"]:
-                p_dict = p if isinstance(p, dict) else p.model_dump()
-                if isinstance(p_dict.get("date"), date):
-                    p_dict["date"] = datetime.combine(p_dict["date"], datetime.min.time())
-                progress_list.append(p_dict)
-            data["progress"] = progress_list
-        return data
+        return _codec.encode(self)
+
 
+_progress_codec = MongoCodec(GoalProgress)
+_codec = MongoCodec(RelationshipGoalInDB, object_ids=("couple_id", "created_by_user_id"))
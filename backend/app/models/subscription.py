@@ -4,9 +4,10 @@ from datetime import datetime
 from enum import Enum
 from typing import ClassVar, Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.codec import MongoCodec
+
 
 class SubscriptionTier(str, Enum):
     """Subscription tier levels."""
@@ -63,21 +64,11 @@ class SubscriptionInDB(Subscription):
     @classmethod
     def from_mongo(cls, data: dict) -> "SubscriptionInDB":
         """Convert MongoDB document to SubscriptionInDB."""
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "couple_id" in data and isinstance(data["couple_id"], ObjectId):
-            data["couple_id"] = str(data["couple_id"])
-        return cls(**data)
-    
+        return _codec.decode(data)
+
     def to_mongo(self) -> dict:
         """Convert SubscriptionInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "couple_id" in data and isinstance(data["couple_id"], str):
-            data["couple_id"] = ObjectId(data["couple_id"])
-        return data
+        return _codec.encode(self)
 
 
 class UsageLimit(BaseModel):
@@ -88,3 +79,5 @@ class UsageLimit(BaseModel):
     BASIC_MONTHLY_ARGS: ClassVar[int] = -1  # Unlimited
     PREMIUM_MONTHLY_ARGS: ClassVar[int] = -1  # Unlimited
 
+
+_codec = MongoCodec(SubscriptionInDB, object_ids=("couple_id",))
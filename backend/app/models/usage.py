@@ -4,9 +4,10 @@ from datetime import date, datetime
 from enum import Enum
 from typing import Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from app.models.codec import MongoCodec
+
 
 class UsageType(str, Enum):
     """Types of usage."""
@@ -42,31 +43,11 @@ class UsageInDB(Usage):
     @classmethod
     def from_mongo(cls, data: dict) -> "UsageInDB":
         """Convert MongoDB document to UsageInDB."""
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        if "couple_id" in data and isinstance(data["couple_id"], ObjectId):
-            data["couple_id"] = str(data["couple_id"])
-        if "argument_id" in data and isinstance(data["argument_id"], ObjectId):
-            data["argument_id"] = str(data["argument_id"])
-        if "period_start" in data and isinstance(data["period_start"], datetime):
-            data["period_start"] = data["period_start"].date()
-        if "period_end" in data and isinstance(data["period_end"], datetime):
-            data["period_end"] = data["period_end"].date()
-        return cls(**data)
-    
+        return _codec.decode(data)
+
     def to_mongo(self) -> dict:
         """Convert UsageInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        if "couple_id" in data and isinstance(data["couple_id"], str):
-            data["couple_id"] = ObjectId(data["couple_id"])
-        if "argument_id" in data and isinstance(data["argument_id"], str) and data["argument_id"]:
-            data["argument_id"] = ObjectId(data["argument_id"])
-        if "period_start" in data and isinstance(data["period_start"], date):
-            data["period_start"] = datetime.combine(data["period_start"], datetime.min.time())
-        if "period_end" in data and isinstance(data["period_end"], date):
-            data["period_end"] = datetime.combine(data["period_end"], datetime.min.time())
-        return data
+        return _codec.encode(self)
+
 
+_codec = MongoCodec(UsageInDB, object_ids=("couple_id", "argument_id"))
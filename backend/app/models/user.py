@@ -4,9 +4,10 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Optional
 
-from bson import ObjectId
 from pydantic import BaseModel, EmailStr, Field
 
+from app.models.codec import MongoCodec
+
 
 class UserRole(str, Enum):
     """User roles."""
@@ -61,14 +62,11 @@ class UserInDB(User):
     @classmethod
     def from_mongo(cls, data: dict) -> "UserInDB":
         """Convert MongoDB document to UserInDB."""
-        if "_id" in data:
-            data["id"] = str(data["_id"])
-            del data["_id"]
-        return cls(**data)
-    
+        return _codec.decode(data)
+
     def to_mongo(self) -> dict:
         """Convert UserInDB to MongoDB document."""
-        data = self.model_dump(exclude={"id"})
-        if hasattr(self, "id") and self.id:
-            data["_id"] = ObjectId(self.id)
-        return data
+        return _codec.encode(self)
+
+
+_codec = MongoCodec(UserInDB)
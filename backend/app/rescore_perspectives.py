@@ -0,0 +1,35 @@
+"""Re-scan stored perspective safety verdicts after the keyword list changes.
+
+    python -m app.rescore_perspectives [--batch-size N]
+
+Perspectives whose verdict is missing or was computed with another keyword
+list are rescanned and updated. Until this runs, stale verdicts are
+rescanned when read, so it can run any time after a deploy; run it once,
+not from every API worker.
+"""
+
+import argparse
+import asyncio
+
+import app.core.logging_config  # noqa: F401  (configures logging)
+from app.db.database import close_mongo_connection, connect_to_mongo, get_database
+from app.services.safety_service import safety_service
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.rescore_perspectives", description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500, help="Perspectives fetched per query")
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    await connect_to_mongo()
+    try:
+        updated = await safety_service.rescore_perspectives(get_database(), batch_size=args.batch_size)
+        print(f"Re-scored {updated} perspectives (scanner {safety_service.version})")
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(_parse_args()))
@@ -3,31 +3,126 @@
 import json
 import logging
 import re
-from typing import Dict, List, Optional
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-import httpx
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.config import settings
+from app.core.json_stream import IncrementalJSONObjectParser
+from app.core.keyword_scanner import KeywordScanner
 from app.models.ai_insight import AIInsightInDB
+from app.models.llm_usage import TokenUsage
+from app.services.llm_router import LLMRouter, LLMUnavailableError, build_llm_router
+from app.services.llm_usage_service import llm_usage_service
+from app.services.prompt_registry import (
+    ListSection,
+    PromptTemplate,
+    TextSection,
+    compact_json,
+    prompt_registry,
+)
 from app.services.safety_service import safety_service
 
 logger = logging.getLogger(__name__)
 
-MODELS_SUPPORTING_JSON = [
-    "gpt-4-turbo", "gpt-4-turbo-preview", "gpt-4-0125-preview",
-    "gpt-4o", "gpt-4o-mini", "gpt-3.5-turbo"
-]
-
+# Advice the mediator should never give; flagged for review, not blocked
+HARMFUL_RESPONSE_SCANNER = KeywordScanner({
+    "harmful": ['leave them', 'divorce', 'break up', 'worthless', 'stupid', 'idiot']
+})
 
 class AIMediationService:
     """Service for AI-powered argument mediation."""
 
-    def __init__(self):
-        self.api_key = settings.OPENAI_API_KEY
+    def __init__(self, router: Optional[LLMRouter] = None):
         self.model = settings.OPENAI_MODEL
-        self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.router = router or build_llm_router()
+
+    async def _post_chat(
+        self,
+        payload: Dict,
+        timeout: float,
+        feature: str,
+        db: AsyncIOMotorDatabase,
+        couple_id: Optional[str] = None
+    ) -> Tuple[str, TokenUsage, float, str]:
+        """
+        Run a chat completion through the provider router and account for it.
+
+        ``timeout`` applies to each provider attempt.
+
+        Returns:
+            (message content, token usage, cost in USD, model that answered)
+
+        Raises:
+            LLMUnavailableError: no provider could answer
+        """
+        started = time.perf_counter()
+        try:
+            content, usage, provider = await self.router.complete(payload, timeout)
+        except LLMUnavailableError:
+            await llm_usage_service.record(
+                db, feature, self.model, TokenUsage(),
+                (time.perf_counter() - started) * 1000, couple_id=couple_id, success=False
+            )
+            raise
+
+        cost = await llm_usage_service.record(
+            db, feature, provider.model, usage,
+            (time.perf_counter() - started) * 1000, couple_id=couple_id
+        )
+        return content, usage, cost, provider.model
+
+    async def warm_up(self) -> None:
+        """Establish provider connections before the first user request."""
+        await self.router.warm_up()
+
+    def build_mediation_request(
+        self,
+        perspective_1: str,
+        perspective_2: str,
+        category: str,
+        safety_check: Optional[Dict] = None
+    ) -> Tuple[Dict, Dict]:
+        """
+        Run the safety pre-check and build the chat payload for a mediation.
+
+        ``safety_check`` is the result of combining the perspectives' stored
+        verdicts; the perspectives are only scanned here when it is missing.
+
+        Returns:
+            (payload, safety_check)
+
+        Raises:
+            ValueError: "SAFETY_BLOCK: ..." when mediation must not proceed
+        """
+        # Check for safety concerns BEFORE processing
+        if safety_check is None:
+            safety_check = safety_service.detect_safety_concerns(
+                perspective_1, perspective_2
+            )
+        
+        # If critical safety concerns detected, block mediation
+        if safety_service.should_block_mediation(safety_check):
+            raise ValueError(
+                f"SAFETY_BLOCK: {safety_check.get('message', 'Safety concerns detected')}"
+            )
+        
+        # Safety context goes in the user message so the system prefix stays cacheable
+        safety_note = ""
+        if safety_check.get("has_concerns"):
+            safety_note = f"\n\nSAFETY NOTE: Possible {', '.join(safety_check.get('concern_types', []))} mentioned. Prioritize safety and recommend professional help when appropriate."
+
+        payload = prompt_registry.get("mediation").build_payload(self.model, {
+            "category": category,
+            "safety_note": safety_note,
+            # Equal priority: long perspectives are trimmed evenly, never below ~250 tokens each
+            "perspective_1": TextSection(perspective_1, min_tokens=250),
+            "perspective_2": TextSection(perspective_2, min_tokens=250),
+        })
+
+        return payload, safety_check
 
     async def mediate_argument(
         self,
@@ -35,7 +130,9 @@ class AIMediationService:
         perspective_1: str,
         perspective_2: str,
         category: str,
-        db: AsyncIOMotorDatabase
+        db: AsyncIOMotorDatabase,
+        couple_id: Optional[str] = None,
+        safety_check: Optional[Dict] = None
     ) -> Dict:
         """
         Generate AI mediation insights for an argument.
@@ -46,202 +143,171 @@ class AIMediationService:
             perspective_2: Second partner's perspective
             category: Argument category
             db: Database instance
+            couple_id: Couple the usage is attributed to
+            safety_check: Combined stored safety verdicts (scanned here if None)
             
         Returns:
             Dictionary with AI insights
+
+        Raises:
+            ValueError: "SAFETY_BLOCK: ..." when mediation must not proceed
+            LLMUnavailableError: no provider could answer
         """
-        
+
         try:
-            # Check for safety concerns BEFORE processing
-            safety_check = safety_service.detect_safety_concerns(
-                perspective_1, perspective_2
+            payload, safety_check = self.build_mediation_request(
+                perspective_1, perspective_2, category, safety_check=safety_check
             )
-            
-            # If critical safety concerns detected, block mediation
-            if safety_service.should_block_mediation(safety_check):
-                raise ValueError(
-                    f"SAFETY_BLOCK: {safety_check.get('message', 'Safety concerns detected')}"
-                )
-            
-            # Enhanced system prompt with relationship frameworks
-            system_prompt = """You are Heka, a specialized AI relationship mediator trained in evidence-based conflict resolution techniques.
-
-CORE COMPETENCIES:
-You are trained in:
-- **Gottman Method principles**: Understanding the Four Horsemen (criticism, contempt, defensiveness, stonewalling), identifying repair attempts, emotional attunement
-- **Nonviolent Communication (NVC) framework**: Distinguishing observations from evaluations, feelings from thoughts, identifying underlying needs, framing requests vs. demands
-- **Emotion-Focused Therapy (EFT)**: Identifying attachment fears, recognizing underlying emotions beneath anger, cycle de-escalation
-- **Solution-focused brief therapy**: Focusing on strengths, exceptions, and future solutions rather than problems
-
-ANALYSIS FRAMEWORK:
-1. **Identify Communication Patterns**: Distinguish healthy vs. destructive patterns (Four Horsemen detection)
-2. **Detect Emotional Subtext**: Look beneath surface disagreements to underlying emotions, needs, and fears
-3. **Find Shared Values**: Identify not just surface agreements, but deeper shared values and goals
-4. **Suggest Specific Behavioral Changes**: Provide concrete, actionable suggestions, not generic advice
-5. **Prioritize Emotional Safety**: Ensure both partners feel heard, validated, and safe
-
-SAFETY PROTOCOLS:
-- If you detect abuse indicators, coercive control, violence threats, or self-harm mentions, IMMEDIATELY recommend professional help with specific resources
-- Do NOT attempt to mediate situations involving safety concerns
-- When safety concerns are present, prioritize safety over mediation
-
-RESPONSE STYLE:
-- Empathetic but direct
-- Use "I notice..." statements for observations (NVC)
-- Frame issues as "us vs. the problem" not "you vs. them"
-- Provide 3-5 concrete, actionable suggestions (not generic advice)
-- Include specific conversation scripts when helpful
-- Acknowledge emotions while focusing on solutions
-
-PROHIBITED:
-- Never diagnose mental health conditions
-- Never provide medical or therapeutic treatment
-- Never take sides or judge either partner
-- Never suggest leaving the relationship unless safety is at risk
-- Never minimize serious concerns
-
-Respond in JSON format with:
-{
-  "summary": "Brief 2-3 sentence overview in empathetic tone",
-  "common_ground": ["point 1", "point 2", "point 3"],
-  "disagreements": ["disagreement 1", "disagreement 2"],
-  "root_causes": ["underlying cause 1", "underlying cause 2"],
-  "suggestions": [
-    {
-      "title": "Specific suggestion title",
-      "description": "Detailed explanation with rationale",
-      "actionable_steps": ["step 1", "step 2", "step 3"]
-    }
-  ],
-  "communication_tips": ["tip 1", "tip 2", "tip 3"]
-}"""
-            
-            # Build user prompt with safety context if needed
-            safety_context = ""
-            if safety_check.get("has_concerns"):
-                safety_context = f"\n\nSAFETY NOTE: Possible {', '.join(safety_check.get('concern_types', []))} mentioned. Prioritize safety and recommend professional help when appropriate."
-            
-            # User prompt with relationship framework guidance
-            user_prompt = f"""Argument Context:
-Category: {category}
-{safety_context}
-
-Partner 1 Perspective:
-{perspective_1}
-
-Partner 2 Perspective:
-{perspective_2}
-
-ANALYSIS REQUEST:
-Using Gottman Method, NVC, and EFT frameworks, provide:
-
-1. **Summary**: Brief empathetic overview identifying the core issue
-2. **Common Ground**: Shared values, goals, or agreements (not just surface-level)
-3. **Disagreements**: Key points where they differ (use NVC: observations, not evaluations)
-4. **Root Causes**: Underlying needs, fears, or attachment issues (EFT perspective)
-5. **Suggestions**: 3-5 specific, actionable solutions with:
-   - Title (clear and specific)
-   - Description (explain why this helps)
-   - Actionable steps (concrete things to do)
-6. **Communication Tips**: Specific phrases or approaches using NVC principles
-
-Focus on:
-- Identifying the Four Horsemen if present (criticism, contempt, defensiveness, stonewalling)
-- Finding underlying needs beneath positions
-- Suggesting repair attempts
-- Framing as "us vs. the problem"
-
-Respond in JSON format only."""
-            # Call OpenAI directly via httpx (no SDK — avoids Pydantic compat issues)
-            use_json_mode = any(m in self.model.lower() for m in MODELS_SUPPORTING_JSON)
-
-            payload: Dict = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 2000,
-            }
-            if use_json_mode:
-                payload["response_format"] = {"type": "json_object"}
-
-            async with httpx.AsyncClient(timeout=90.0) as client:
-                resp = await client.post(
-                    self.api_url,
-                    json=payload,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    }
-                )
-                resp.raise_for_status()
-                response_content = resp.json()["choices"][0]["message"]["content"]
-
-            # Try to parse as JSON
-            try:
-                ai_response = json.loads(response_content)
-            except json.JSONDecodeError:
-                # If not JSON, try to extract JSON from the response
-                logger.warning("Response not in JSON format, attempting to extract JSON...")
-                json_match = re.search(r'\{.*\}', response_content, re.DOTALL)
-                if json_match:
-                    ai_response = json.loads(json_match.group())
-                else:
-                    ai_response = self._parse_text_response(response_content)
-            
-            # Validate response quality
-            if not self._validate_ai_response(ai_response):
-                logger.warning(f"AI response quality check failed for argument {argument_id}")
-                # Don't fail completely, but log the issue
-            
-            # Cost tracking not available without SDK — set to 0
-            input_tokens = 0
-            output_tokens = 0
-            cost = 0.0
-            
-            # Create AI insight document
-            insight = AIInsightInDB(
-                argument_id=argument_id,
-                summary=ai_response.get("summary"),
-                common_ground=ai_response.get("common_ground", []),
-                disagreements=ai_response.get("disagreements", []),
-                root_causes=ai_response.get("root_causes", []),
-                suggestions=ai_response.get("suggestions", []),
-                communication_tips=ai_response.get("communication_tips", []),
-                full_response=ai_response,
-                ai_model=self.model,
-                cost=cost,
-                tokens_used={
-                    "input": input_tokens,
-                    "output": output_tokens
-                }
+            response_content, usage, cost, model = await self._post_chat(
+                payload, timeout=90.0, feature="mediation", db=db, couple_id=couple_id
             )
-            
-            # Save to database
-            result = await db.ai_insights.insert_one(insight.to_mongo())
-            insight.id = str(result.inserted_id)
-            
-            logger.info(f"AI mediation completed for argument {argument_id}. Cost: ${cost:.4f}")
-            
-            return {
-                "id": insight.id,
-                "summary": insight.summary,
-                "common_ground": insight.common_ground,
-                "disagreements": insight.disagreements,
-                "root_causes": insight.root_causes,
-                "suggestions": insight.suggestions,
-                "communication_tips": insight.communication_tips,
-                "cost": cost,
-                "model_used": self.model,
-                "safety_check": safety_check if safety_check.get("has_concerns") else None
-            }
-            
+            ai_response = self._parse_mediation_content(response_content)
+            return await self._save_insight(
+                argument_id, ai_response, safety_check, db, model, usage=usage, cost=cost
+            )
+
+        except (LLMUnavailableError, ValueError):
+            # Callers map these to 503 (with Retry-After) and safety/400 responses
+            raise
         except Exception as e:
             logger.error(f"Error in AI mediation: {e}")
             raise Exception(f"AI mediation failed: {str(e)}")
-    
+
+    async def stream_mediation(
+        self,
+        argument_id: str,
+        payload: Dict,
+        safety_check: Dict,
+        db: AsyncIOMotorDatabase,
+        couple_id: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Stream a mediation from the model, yielding events as fields complete.
+
+        Yields ("field", {"name", "value"}) for each top-level field of the
+        JSON response as soon as its value is complete, then ("done", result)
+        once the insight has been saved. ``result`` matches the body returned
+        by mediate_argument.
+        """
+        # include_usage adds a final chunk carrying the usage block
+        stream_payload = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+        parser = IncrementalJSONObjectParser()
+        content_parts: List[str] = []
+        emitted = set()
+        usage = TokenUsage()
+        model = self.model
+
+        started = time.perf_counter()
+        try:
+            async for provider, chunk in self.router.stream(stream_payload, timeout=90.0):
+                model = provider.model
+                if chunk.get("usage"):
+                    usage = TokenUsage.from_openai(chunk["usage"])
+                choices = chunk.get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if not delta:
+                    continue
+                content_parts.append(delta)
+                for name, value in parser.feed(delta):
+                    emitted.add(name)
+                    yield "field", {"name": name, "value": value}
+        except Exception:
+            await llm_usage_service.record(
+                db, "mediation_stream", model, usage,
+                (time.perf_counter() - started) * 1000, couple_id=couple_id, success=False
+            )
+            raise
+
+        cost = await llm_usage_service.record(
+            db, "mediation_stream", model, usage,
+            (time.perf_counter() - started) * 1000, couple_id=couple_id
+        )
+
+        ai_response = self._parse_mediation_content("".join(content_parts))
+        # Fields the incremental parser could not see (non-JSON output)
+        for name, value in ai_response.items():
+            if name not in emitted:
+                yield "field", {"name": name, "value": value}
+
+        result = await self._save_insight(
+            argument_id, ai_response, safety_check, db, model, usage=usage, cost=cost
+        )
+        yield "done", result
+
+    def _parse_mediation_content(self, response_content: str) -> Dict:
+        """Parse the model's mediation output, tolerating non-JSON replies."""
+        try:
+            return json.loads(response_content)
+        except json.JSONDecodeError:
+            # If not JSON, try to extract JSON from the response
+            logger.warning("Response not in JSON format, attempting to extract JSON...")
+            json_match = re.search(r'\{.*\}', response_content, re.DOTALL)
+            if json_match:
+                return json.loads(json_match.group())
+            return self._parse_text_response(response_content)
+
+    async def _save_insight(
+        self,
+        argument_id: str,
+        ai_response: Dict,
+        safety_check: Dict,
+        db: AsyncIOMotorDatabase,
+        model: str,
+        usage: Optional[TokenUsage] = None,
+        cost: float = 0.0
+    ) -> Dict:
+        """Persist a mediation result (``model`` is the one that answered) and build the API body."""
+        # Validate response quality
+        if not self._validate_ai_response(ai_response):
+            logger.warning(f"AI response quality check failed for argument {argument_id}")
+            # Don't fail completely, but log the issue
+
+        usage = usage or TokenUsage()
+
+        # Create AI insight document
+        insight = AIInsightInDB(
+            argument_id=argument_id,
+            summary=ai_response.get("summary"),
+            common_ground=ai_response.get("common_ground", []),
+            disagreements=ai_response.get("disagreements", []),
+            root_causes=ai_response.get("root_causes", []),
+            suggestions=ai_response.get("suggestions", []),
+            communication_tips=ai_response.get("communication_tips", []),
+            full_response=ai_response,
+            ai_model=model,
+            cost=cost,
+            tokens_used={
+                "input": usage.prompt_tokens,
+                "cached_input": usage.cached_prompt_tokens,
+                "output": usage.completion_tokens
+            },
+            prompt_version=prompt_registry.get("mediation").id
+        )
+
+        # Save to database
+        result = await db.ai_insights.insert_one(insight.to_mongo())
+        insight.id = str(result.inserted_id)
+
+        logger.info(f"AI mediation completed for argument {argument_id}. Cost: ${cost:.4f}")
+
+        return self.insight_response(insight, safety_check)
+
+    @staticmethod
+    def insight_response(insight: AIInsightInDB, safety_check: Dict) -> Dict:
+        """The mediation body for a stored insight (inline, streamed and job results alike)."""
+        return {
+            "id": insight.id,
+            "summary": insight.summary,
+            "common_ground": insight.common_ground,
+            "disagreements": insight.disagreements,
+            "root_causes": insight.root_causes,
+            "suggestions": insight.suggestions,
+            "communication_tips": insight.communication_tips,
+            "cost": insight.cost,
+            "model_used": insight.ai_model,
+            "safety_check": safety_check if safety_check.get("has_concerns") else None
+        }
+
     def _parse_text_response(self, text: str) -> dict:
         """Parse a text response and structure it into JSON format."""
         # Fallback parser for non-JSON responses
@@ -277,35 +343,13 @@ Respond in JSON format only."""
             return False
         
         # Check for potentially harmful content
-        harmful_keywords = ['leave them', 'divorce', 'break up', 'worthless', 'stupid', 'idiot']
-        response_text = str(response).lower()
-        if any(keyword in response_text for keyword in harmful_keywords):
-            logger.warning("Potentially harmful content detected in AI response")
+        harmful = HARMFUL_RESPONSE_SCANNER.scan(json.dumps(response, ensure_ascii=False))
+        if harmful:
+            logger.warning(f"Potentially harmful content detected in AI response: {sorted({m.term for m in harmful})}")
             # Don't block, but flag for review
         
         return True
     
-    def _calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
-        """Calculate API cost based on token usage."""
-        # Updated pricing (as of 2024)
-        if "gpt-4o-mini" in self.model.lower():
-            # GPT-4o-mini: $0.15 per 1M input tokens, $0.60 per 1M output tokens
-            input_cost = (input_tokens / 1_000_000) * 0.15
-            output_cost = (output_tokens / 1_000_000) * 0.60
-        elif "gpt-4o" in self.model.lower():
-            # GPT-4o: $2.50 per 1M input tokens, $10.00 per 1M output tokens
-            input_cost = (input_tokens / 1_000_000) * 2.50
-            output_cost = (output_tokens / 1_000_000) * 10.00
-        elif "gpt-3.5" in self.model.lower():
-            # GPT-3.5-turbo: $0.50 per 1M input tokens, $1.50 per 1M output tokens
-            input_cost = (input_tokens / 1_000_000) * 0.50
-            output_cost = (output_tokens / 1_000_000) * 1.50
-        else:
-            # GPT-4 (base): $30 per 1M input tokens, $60 per 1M output tokens
-            input_cost = (input_tokens / 1_000_000) * 30.00
-            output_cost = (output_tokens / 1_000_000) * 60.00
-        return input_cost + output_cost
-
     async def generate_goal_suggestions(self, arguments: List[Dict], db: AsyncIOMotorDatabase) -> (List[Dict], List[str]):
         """
         Generate relationship goal suggestions based on recent arguments.
@@ -314,32 +358,10 @@ Respond in JSON format only."""
         if not insights:
             return [], []
 
-        system_prompt = """You are Heka, an expert AI relationship coach trained in the Gottman Method and Emotion-Focused Therapy.
-Based on the provided argument summaries and root causes, generate 3-5 highly actionable, positive relationship goals.
-
-RESPONSE STYLE:
-- Focus on building positive, observable behaviors (not just "stop doing X", but "start doing Y").
-- Goals MUST be SMART (Specific, Measurable, Achievable, Relevant, Time-bound).
-- Frame goals collaboratively ("We will...", "Let's practice...").
-- Do not repeat the argument; focus entirely on the solution and future habits.
-
-Respond in JSON format with:
-{
-  "goals": [
-    {
-      "title": "Specific goal title (e.g., 'Practice Active Listening')",
-      "description": "Detailed explanation of the goal and why it's important for the couple's specific issues.",
-      "category": "Communication"
-    }
-  ]
-}"""
-        user_prompt = f"""Based on these argument insights, suggest 3-5 relationship goals:
-
-{json.dumps(insights, indent=2)}
-
-Generate goals in the specified JSON format."""
-
-        response_json = await self._call_openai(system_prompt, user_prompt)
+        response_json = await self._call_openai(
+            prompt_registry.get("goal_suggestions"), {"insights": self._insight_lines(insights)},
+            feature="goal_suggestions", db=db, couple_id=self._couple_of(arguments)
+        )
         
         linked_ids = [str(arg["_id"]) for arg in arguments]
         return response_json.get("goals", []), linked_ids
@@ -352,35 +374,24 @@ Generate goals in the specified JSON format."""
         if not insights:
             return [], []
 
-        system_prompt = """You are Heka, an expert AI relationship coach trained in the Gottman Method.
-Based on the provided argument summaries and root causes, generate 3-5 open-ended check-in questions for a weekly reflection.
-
-RESPONSE STYLE:
-- Questions MUST be incredibly gentle, non-accusatory, and forward-looking.
-- Include at least one question focused entirely on a positive moment or gratitude.
-- Encourage deep reflection on underlying needs (attachment, safety) rather than logistics.
-- Frame questions to open up dialogue and assume positive intent.
-
-Respond in JSON format with:
-{
-  "questions": [
-    {
-      "question": "A specific, open-ended question (e.g., 'When did you feel most connected this week, and what were we doing?')",
-      "category": "Emotional Connection"
-    }
-  ]
-}"""
-        user_prompt = f"""Based on these argument insights, suggest 3-5 weekly check-in questions:
-
-{json.dumps(insights, indent=2)}
-
-Generate questions in the specified JSON format."""
-
-        response_json = await self._call_openai(system_prompt, user_prompt)
+        response_json = await self._call_openai(
+            prompt_registry.get("checkin_questions"), {"insights": self._insight_lines(insights)},
+            feature="checkin_questions", db=db, couple_id=self._couple_of(arguments)
+        )
         
         linked_ids = [str(arg["_id"]) for arg in arguments]
         return response_json.get("questions", []), linked_ids
 
+    @staticmethod
+    def _insight_lines(insights: List[Dict]) -> ListSection:
+        """One compact JSON object per insight, most relevant first; the tail is dropped to fit."""
+        return ListSection([compact_json(insight) for insight in insights], min_items=1)
+
+    @staticmethod
+    def _couple_of(arguments: List[Dict]) -> Optional[str]:
+        couple_id = arguments[0].get("couple_id") if arguments else None
+        return str(couple_id) if couple_id else None
+
     async def _get_insights_for_arguments(self, arguments: List[Dict], db: AsyncIOMotorDatabase) -> List[Dict]:
         """Helper to fetch AI insights for a list of arguments."""
         if not arguments:
@@ -437,102 +448,67 @@ Generate questions in the specified JSON format."""
         
         return result
 
-    async def _call_openai(self, system_prompt: str, user_prompt: str) -> Dict:
-        """Make a direct httpx call to OpenAI — bypasses SDK Pydantic serialization issues."""
+    async def _call_openai(
+        self,
+        prompt: PromptTemplate,
+        sections: Dict,
+        feature: str,
+        db: AsyncIOMotorDatabase,
+        couple_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Run a JSON-mode prompt and parse the reply.
+
+        Raises:
+            LLMUnavailableError: no provider could answer (callers must not
+                mistake an outage for an empty answer)
+        """
+        payload = prompt.build_payload(self.model, sections)
+
+        response_content, _, _, _ = await self._post_chat(
+            payload, timeout=60.0, feature=feature, db=db, couple_id=couple_id
+        )
+
         try:
-            use_json_mode = any(m in self.model.lower() for m in MODELS_SUPPORTING_JSON)
-
-            payload: Dict = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 1500,
-            }
-            if use_json_mode:
-                payload["response_format"] = {"type": "json_object"}
-
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(
-                    self.api_url,
-                    json=payload,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    }
-                )
-                resp.raise_for_status()
-                response_content = resp.json()["choices"][0]["message"]["content"]
-
-            try:
-                return json.loads(response_content)
-            except json.JSONDecodeError:
-                match = re.search(r'\{.*\}', response_content, re.DOTALL)
-                if match:
+            return json.loads(response_content)
+        except json.JSONDecodeError:
+            match = re.search(r'\{.*\}', response_content, re.DOTALL)
+            if match:
+                try:
                     return json.loads(match.group())
-                return {}
-        except Exception as e:
-            logger.error(f"Error calling OpenAI: {e}", exc_info=True)
+                except json.JSONDecodeError:
+                    pass
+            logger.error(f"Unparseable {feature} response from model")
             return {}
 
-    async def generate_harmony_report(self, checkin_id: str, db, user1_responses: dict, user2_responses: dict) -> Optional[str]:
+    async def generate_harmony_report(
+        self,
+        checkin_id: str,
+        db,
+        user1_responses: dict,
+        user2_responses: dict,
+        couple_id: Optional[str] = None
+    ) -> Optional[str]:
         """
         Generate a weekly harmony report based on both partners' check-in responses.
         This runs in the background.
         """
         try:
-            # We don't enforce JSON mode here because we want a formatted markdown string
-            system_prompt = """You are Heka, an expert relationship coach.
-            You are analyzing a couple's weekly check-in responses.
-            Your job is to read both sets of answers and provide a 'Harmony Report'.
-            
-            Format your response in beautiful, encouraging Markdown. Include:
-            1. A brief overview of where they align or differ this week.
-            2. Highlighting one specific positive thing you noticed from their answers.
-            3. One concrete, easy 'micro-exercise' for them to try this week based on their answers.
-            
-            Keep the tone warm, insightful, and entirely objective (do not take sides).
-            Maximum length: 2 short paragraphs."""
+            payload = prompt_registry.get("harmony_report").build_payload(self.model, {
+                "user1_responses": TextSection(compact_json(user1_responses), min_tokens=200),
+                "user2_responses": TextSection(compact_json(user2_responses), min_tokens=200),
+            })
 
-            user_prompt = f"""
-            Partner A answered:
-            {json.dumps(user1_responses, indent=2)}
-            
-            Partner B answered:
-            {json.dumps(user2_responses, indent=2)}
-            """
-
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 800
-            }
-
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(
-                    self.api_url,
-                    json=payload,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    }
-                )
-                resp.raise_for_status()
-                report_text = resp.json()["choices"][0]["message"]["content"]
-                
-                # Update the database
-                from bson import ObjectId
-                await db.relationship_checkins.update_one(
-                    {"_id": ObjectId(checkin_id)},
-                    {"$set": {"ai_harmony_report": report_text.strip()}}
-                )
-                return report_text.strip()
+            report_text, _, _, _ = await self._post_chat(
+                payload, timeout=60.0, feature="harmony_report", db=db, couple_id=couple_id
+            )
+
+            # Update the database
+            await db.relationship_checkins.update_one(
+                {"_id": ObjectId(checkin_id)},
+                {"$set": {"ai_harmony_report": report_text.strip()}}
+            )
+            return report_text.strip()
                 
         except Exception as e:
             logger.error(f"Failed to generate harmony report: {e}", exc_info=True)
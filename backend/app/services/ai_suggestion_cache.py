@@ -1,65 +1,234 @@
-"""Service for managing AI suggestion cache in MongoDB."""
+"""Service for managing AI suggestion cache in MongoDB.
 
+Reads are stale-while-revalidate: an expired entry is still served and a
+single background refresh replaces it. Generation for a given
+(couple_id, suggestion_type) is coalesced twice over:
+
+- within a worker, concurrent callers await the same in-flight task;
+- across workers, a refresh lease (``refresh_started_at``) on the cache
+  document lets only one process call the model; the others wait for its
+  result instead of generating their own.
+"""
+
+import asyncio
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 from app.models.ai_suggestion_cache import AISuggestionCacheInDB
 
 logger = logging.getLogger(__name__)
 
+# Returns (suggestions, linked_argument_ids), or None when there is nothing to suggest
+SuggestionGenerator = Callable[[], Awaitable[Optional[Tuple[List[Dict[str, Any]], List[str]]]]]
+
+# A refresh not finished within this window is presumed dead and can be taken over
+REFRESH_LEASE_SECONDS = 120
+
 
 class AISuggestionCacheService:
     """Service for caching AI-generated suggestions."""
-    
+
+    def __init__(self, peer_poll_interval: float = 0.5, peer_wait_timeout: float = 90.0):
+        self.peer_poll_interval = peer_poll_interval
+        self.peer_wait_timeout = peer_wait_timeout
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
     @staticmethod
+    async def _load(
+        couple_id: str,
+        suggestion_type: str,
+        db: AsyncIOMotorDatabase
+    ) -> Optional[AISuggestionCacheInDB]:
+        """Load a cache entry, fresh or stale. Refresh placeholders count as missing."""
+        cache_doc = await db.ai_suggestion_cache.find_one({
+            "couple_id": ObjectId(couple_id),
+            "suggestion_type": suggestion_type
+        })
+        if not cache_doc or "expires_at" not in cache_doc:
+            return None
+        return AISuggestionCacheInDB.from_mongo(cache_doc)
+
     async def get_cached_suggestions(
+        self,
         couple_id: str,
         suggestion_type: str,
         db: AsyncIOMotorDatabase
     ) -> Optional[AISuggestionCacheInDB]:
         """
         Get cached suggestions if they exist and are not expired.
-        
+
         Args:
             couple_id: Couple ID
             suggestion_type: 'goals' or 'checkins'
             db: Database instance
-            
+
         Returns:
             AISuggestionCacheInDB if valid cache exists, None otherwise
         """
         try:
-            couple_oid = ObjectId(couple_id)
-            
-            # Find cache entry
-            cache_doc = await db.ai_suggestion_cache.find_one({
-                "couple_id": couple_oid,
-                "suggestion_type": suggestion_type
-            })
-            
-            if not cache_doc:
-                return None
-            
-            cache = AISuggestionCacheInDB.from_mongo(cache_doc)
-            
-            # Check if expired
-            if cache.expires_at < datetime.utcnow():
-                logger.info(f"Cache expired for couple {couple_id}, type {suggestion_type}")
-                # Delete expired cache
-                await db.ai_suggestion_cache.delete_one({"_id": ObjectId(cache.id)})
+            cache = await self._load(couple_id, suggestion_type, db)
+            if cache is None or cache.expires_at < datetime.utcnow():
                 return None
-            
-            logger.info(f"Cache hit for couple {couple_id}, type {suggestion_type}")
+            logger.debug(f"Cache hit for couple {couple_id}, type {suggestion_type}")
             return cache
-            
+
         except Exception as e:
             logger.error(f"Error getting cached suggestions: {e}")
             return None
-    
+
+    async def get_or_generate(
+        self,
+        couple_id: str,
+        suggestion_type: str,
+        generate: SuggestionGenerator,
+        db: AsyncIOMotorDatabase,
+        ai_model: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return suggestions, generating them only when nothing is cached.
+
+        Args:
+            couple_id: Couple ID
+            suggestion_type: 'goals' or 'checkins'
+            generate: Coroutine factory that calls the model
+            db: Database instance
+            ai_model: AI model recorded on the cache entry
+
+        Returns:
+            Cached (possibly stale) or freshly generated suggestions
+        """
+        cache = None
+        try:
+            cache = await self._load(couple_id, suggestion_type, db)
+        except Exception as e:
+            logger.error(f"Error getting cached suggestions: {e}")
+
+        key = (couple_id, suggestion_type)
+        if cache is not None:
+            if cache.expires_at < datetime.utcnow() and key not in self._inflight:
+                logger.debug(f"Serving stale suggestions for couple {couple_id}, type {suggestion_type}")
+                task = self._start(key, self._refresh(
+                    couple_id, suggestion_type, generate, db, ai_model, wait_for_peer=False
+                ))
+                task.add_done_callback(self._log_refresh_failure)
+            return cache.suggestions
+
+        task = self._inflight.get(key) or self._start(key, self._refresh(
+            couple_id, suggestion_type, generate, db, ai_model, wait_for_peer=True
+        ))
+        # Shielded so one caller disconnecting doesn't cancel the shared generation
+        return await asyncio.shield(task)
+
+    def _start(self, key: Tuple[str, str], coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background suggestion refresh failed: {task.exception()}")
+
+    async def _refresh(
+        self,
+        couple_id: str,
+        suggestion_type: str,
+        generate: SuggestionGenerator,
+        db: AsyncIOMotorDatabase,
+        ai_model: Optional[str],
+        wait_for_peer: bool
+    ) -> List[Dict[str, Any]]:
+        """Generate and store suggestions unless another worker already is."""
+        if not await self._claim_refresh(couple_id, suggestion_type, db):
+            if not wait_for_peer:
+                return []
+            cache = await self._wait_for_peer(couple_id, suggestion_type, db)
+            if cache is not None:
+                return cache.suggestions
+            # The other worker gave up or timed out; generate here instead
+
+        try:
+            generated = await generate()
+        except Exception:
+            await db.ai_suggestion_cache.update_one(
+                {"couple_id": ObjectId(couple_id), "suggestion_type": suggestion_type},
+                {"$unset": {"refresh_started_at": ""}}
+            )
+            raise
+
+        if generated is None:
+            # Nothing to base suggestions on any more; drop the entry (or placeholder)
+            await db.ai_suggestion_cache.delete_one({
+                "couple_id": ObjectId(couple_id),
+                "suggestion_type": suggestion_type
+            })
+            return []
+
+        suggestions, linked_argument_ids = generated
+        await self.save_suggestions(
+            couple_id, suggestion_type, suggestions, linked_argument_ids, db, ai_model=ai_model
+        )
+        return suggestions
+
+    @staticmethod
+    async def _claim_refresh(
+        couple_id: str,
+        suggestion_type: str,
+        db: AsyncIOMotorDatabase
+    ) -> bool:
+        """
+        Take the refresh lease for a cache key.
+
+        Matches the entry when no refresh is running (or the last one is
+        presumed dead); if nothing matches, the upsert inserts a placeholder,
+        which the unique (couple_id, suggestion_type) index rejects when an
+        entry with a live lease already exists.
+        """
+        now = datetime.utcnow()
+        try:
+            await db.ai_suggestion_cache.find_one_and_update(
+                {
+                    "couple_id": ObjectId(couple_id),
+                    "suggestion_type": suggestion_type,
+                    "$or": [
+                        {"refresh_started_at": None},
+                        {"refresh_started_at": {"$lt": now - timedelta(seconds=REFRESH_LEASE_SECONDS)}},
+                    ],
+                },
+                {"$set": {"refresh_started_at": now}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def _wait_for_peer(
+        self,
+        couple_id: str,
+        suggestion_type: str,
+        db: AsyncIOMotorDatabase
+    ) -> Optional[AISuggestionCacheInDB]:
+        """Poll until the worker holding the lease has stored its result."""
+        deadline = asyncio.get_running_loop().time() + self.peer_wait_timeout
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(self.peer_poll_interval)
+            cache_doc = await db.ai_suggestion_cache.find_one({
+                "couple_id": ObjectId(couple_id),
+                "suggestion_type": suggestion_type
+            })
+            if cache_doc is None:
+                return None
+            if "expires_at" in cache_doc and not cache_doc.get("refresh_started_at"):
+                return AISuggestionCacheInDB.from_mongo(cache_doc)
+        return None
+
     @staticmethod
     async def save_suggestions(
         couple_id: str,
@@ -72,7 +241,7 @@ class AISuggestionCacheService:
     ) -> AISuggestionCacheInDB:
         """
         Save suggestions to cache with 7-day expiration.
-        
+
         Args:
             couple_id: Couple ID
             suggestion_type: 'goals' or 'checkins'
@@ -81,7 +250,7 @@ class AISuggestionCacheService:
             db: Database instance
             ai_model: AI model used
             cost: Cost of generation
-            
+
         Returns:
             Saved AISuggestionCacheInDB instance
         """
@@ -95,24 +264,24 @@ class AISuggestionCacheService:
                 ai_model=ai_model,
                 cost=cost
             )
-            
-            # Delete old cache if exists
-            await db.ai_suggestion_cache.delete_many({
-                "couple_id": ObjectId(couple_id),
-                "suggestion_type": suggestion_type
-            })
-            
-            # Insert new cache
-            result = await db.ai_suggestion_cache.insert_one(cache.to_mongo())
-            cache.id = str(result.inserted_id)
-            
+
+            # Replace the entry in place (releasing any refresh lease)
+            saved = await db.ai_suggestion_cache.find_one_and_update(
+                {"couple_id": ObjectId(couple_id), "suggestion_type": suggestion_type},
+                {"$set": cache.to_mongo(), "$unset": {"refresh_started_at": ""}},
+                upsert=True,
+                projection={"_id": 1},
+                return_document=ReturnDocument.AFTER
+            )
+            cache.id = str(saved["_id"])
+
             logger.info(f"Cached {len(suggestions)} suggestions for couple {couple_id}, type {suggestion_type}")
             return cache
-            
+
         except Exception as e:
             logger.error(f"Error saving suggestions to cache: {e}")
             raise
-    
+
     @staticmethod
     async def invalidate_cache(
         couple_id: str,
@@ -121,7 +290,10 @@ class AISuggestionCacheService:
     ) -> None:
         """
         Invalidate cache for a couple.
-        
+
+        Entries are marked expired rather than deleted, so the next read still
+        serves them while a background refresh regenerates.
+
         Args:
             couple_id: Couple ID
             suggestion_type: 'goals', 'checkins', or None (invalidate all)
@@ -130,15 +302,17 @@ class AISuggestionCacheService:
         if db is None:
             from app.db.database import get_database
             db = get_database()
-        
+
         try:
-            query = {"couple_id": ObjectId(couple_id)}
+            query = {"couple_id": ObjectId(couple_id), "expires_at": {"$exists": True}}
             if suggestion_type:
                 query["suggestion_type"] = suggestion_type
-            
-            result = await db.ai_suggestion_cache.delete_many(query)
-            logger.info(f"Invalidated cache for couple {couple_id}, type {suggestion_type or 'all'}, deleted {result.deleted_count} entries")
-            
+
+            result = await db.ai_suggestion_cache.update_many(
+                query, {"$set": {"expires_at": datetime.utcnow()}}
+            )
+            logger.info(f"Invalidated cache for couple {couple_id}, type {suggestion_type or 'all'}, marked {result.modified_count} entries stale")
+
         except Exception as e:
             logger.error(f"Error invalidating cache: {e}")
 
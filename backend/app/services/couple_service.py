@@ -0,0 +1,100 @@
+"""Shared couple lookups keyed on the member_ids multikey index."""
+
+import logging
+from typing import Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.models.couple import CoupleInDB, CoupleStatus
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 500
+
+# Flipped once every couple document carries member_ids. Until then a miss on
+# the member_ids query falls back to the legacy user1_id/user2_id $or.
+_member_ids_backfilled = False
+
+
+def is_backfill_complete() -> bool:
+    return _member_ids_backfilled
+
+
+async def find_couple_for_user(
+    user_id: str,
+    db: AsyncIOMotorDatabase,
+    *,
+    couple_id: Optional[str] = None,
+    active_only: bool = True
+) -> Optional[CoupleInDB]:
+    """
+    Find the couple a user belongs to.
+
+    Args:
+        user_id: Member user ID
+        db: Database instance
+        couple_id: Restrict to this couple (access checks)
+        active_only: Only match couples with status "active"
+
+    Returns:
+        CoupleInDB if the user is a member, None otherwise
+    """
+    query = {"member_ids": ObjectId(user_id)}
+    if couple_id:
+        query["_id"] = ObjectId(couple_id)
+    if active_only:
+        query["status"] = CoupleStatus.ACTIVE.value
+
+    couple_doc = await db.couples.find_one(query)
+
+    if couple_doc is None and not _member_ids_backfilled:
+        legacy_query = {k: v for k, v in query.items() if k != "member_ids"}
+        legacy_query["$or"] = [
+            {"user1_id": ObjectId(user_id)},
+            {"user2_id": ObjectId(user_id)}
+        ]
+        couple_doc = await db.couples.find_one(legacy_query)
+
+    if not couple_doc:
+        return None
+    return CoupleInDB.from_mongo(couple_doc)
+
+
+async def backfill_member_ids(
+    db: AsyncIOMotorDatabase,
+    batch_size: int = BACKFILL_BATCH_SIZE
+) -> int:
+    """
+    Add member_ids to couple documents written before the field existed.
+
+    Safe to run while serving traffic and on every worker: each update is
+    conditional on member_ids still being absent, so concurrent runs don't
+    clash. Returns the number of documents updated by this run.
+    """
+    global _member_ids_backfilled
+
+    updated = 0
+    while True:
+        docs = await db.couples.find(
+            {"member_ids": {"$exists": False}},
+            {"user1_id": 1, "user2_id": 1}
+        ).limit(batch_size).to_list(length=batch_size)
+
+        if not docs:
+            break
+
+        for doc in docs:
+            result = await db.couples.update_one(
+                {"_id": doc["_id"], "member_ids": {"$exists": False}},
+                {"$set": {"member_ids": [doc["user1_id"], doc["user2_id"]]}}
+            )
+            updated += result.modified_count
+
+        if len(docs) < batch_size:
+            break
+
+    _member_ids_backfilled = True
+    if updated:
+        logger.info(f"Backfilled member_ids on {updated} couple documents")
+    return updated
@@ -0,0 +1,478 @@
+"""Incrementally maintained per-couple summaries (``couple_summaries``).
+
+The dashboard, ``/api/subscriptions/usage`` and argument/goal creation all
+need the same facts: the subscription and this period's usage, the recent
+arguments, the active goals and the latest check-in. Rather than
+recomputing them on every request, each couple has one summary document
+that those reads fetch through the unique ``couple_id`` index, however
+much history the couple has.
+
+Write paths apply their change to the stored summary with a single update
+(``$push``/``$pull``/``$inc``/positional ``$set``). Where there is no delta
+to apply (an argument deleted from the recent list, a new billing period)
+the affected section is recomputed with one indexed query instead. Hooks
+only touch summaries that exist: a summary is built from the source
+collections on its first read, and rebuilt when it was stored under an
+older ``SUMMARY_VERSION``.
+
+The source collections stay the source of truth. ``check`` recomputes
+stored summaries and reports the sections that drifted (a write landing
+while its summary was being built, say); ``python -m app.couple_summaries``
+runs it, and the versioned rebuild, from the command line.
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from app.db.repositories import (
+    argument_repository,
+    checkin_repository,
+    goal_repository,
+)
+from app.models.argument import ArgumentInDB, ArgumentStatus
+from app.models.couple_summary import (
+    SUMMARY_VERSION,
+    CoupleSummaryInDB,
+    SummarySubscription,
+)
+from app.models.relationship_goal import GoalStatus, RelationshipGoalInDB
+from app.models.subscription import SubscriptionInDB
+from app.models.usage import UsageType
+from app.services.subscription_service import subscription_service
+from app.services.usage_service import usage_service
+
+logger = logging.getLogger(__name__)
+
+MAX_RECENT_ARGUMENTS = 5
+
+# Summary fields derived from the source collections (compared by check())
+SECTIONS = ("subscription", "usage", "recent_arguments", "active_goals", "latest_checkin")
+
+
+def _midnight(value: date) -> datetime:
+    return datetime.combine(value, datetime.min.time())
+
+
+def _argument_entry(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(doc["_id"]),
+        "title": doc.get("title", ""),
+        "priority": doc.get("priority", ""),
+        "status": doc.get("status", ""),
+        "category": doc.get("category", ""),
+        "created_at": doc.get("created_at"),
+    }
+
+
+def _goal_entry(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(doc["_id"]),
+        "title": doc.get("title", ""),
+        "status": doc.get("status", ""),
+        "target_date": doc.get("target_date"),
+        "created_at": doc.get("created_at"),
+    }
+
+
+def _checkin_entry(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(doc["_id"]),
+        "week_start_date": doc["week_start_date"],
+        "status": doc.get("status", ""),
+        "completed_at": doc.get("completed_at"),
+    }
+
+
+def _subscription_entry(subscription: SubscriptionInDB) -> Dict[str, Any]:
+    return {
+        "tier": subscription.tier.value,
+        "status": subscription.status.value,
+        "trial_end": subscription.trial_end,
+        "current_period_start": subscription.current_period_start,
+        "current_period_end": subscription.current_period_end,
+    }
+
+
+class CoupleSummaryService:
+    """Builds, reads and incrementally updates couple summaries."""
+
+    # Sections, recomputed from the source collections
+
+    @staticmethod
+    async def _recent_arguments(couple_id: str, db: AsyncIOMotorDatabase) -> List[Dict[str, Any]]:
+        cursor = (
+            argument_repository.find(db, {"couple_id": ObjectId(couple_id)}, "summary")
+            .sort("created_at", -1)
+            .limit(MAX_RECENT_ARGUMENTS)
+        )
+        return [_argument_entry(doc) async for doc in cursor]
+
+    @staticmethod
+    async def _active_goals(couple_id: str, db: AsyncIOMotorDatabase) -> List[Dict[str, Any]]:
+        # Bounded by the 10 active goals a couple may have
+        cursor = goal_repository.find(
+            db,
+            {"couple_id": ObjectId(couple_id), "status": GoalStatus.ACTIVE.value},
+            "summary",
+        ).sort("created_at", -1)
+        return [_goal_entry(doc) async for doc in cursor]
+
+    @staticmethod
+    async def _latest_checkin(couple_id: str, db: AsyncIOMotorDatabase) -> Optional[Dict[str, Any]]:
+        cursor = (
+            checkin_repository.find(db, {"couple_id": ObjectId(couple_id)}, "summary")
+            .sort("week_start_date", -1)
+            .limit(1)
+        )
+        async for doc in cursor:
+            return _checkin_entry(doc)
+        return None
+
+    @staticmethod
+    async def _usage(
+        couple_id: str,
+        subscription: Union[SubscriptionInDB, SummarySubscription],
+        db: AsyncIOMotorDatabase
+    ) -> Dict[str, Any]:
+        """Usage counts for the subscription's current period (as usage_service sums them)."""
+        period_start, period_end = usage_service.get_period_dates(subscription)
+        pipeline = [
+            {
+                "$match": {
+                    "couple_id": ObjectId(couple_id),
+                    "period_start": {"$gte": _midnight(period_start)},
+                    "period_end": {"$lte": _midnight(period_end)}
+                }
+            },
+            {"$group": {"_id": "$usage_type", "total": {"$sum": "$count"}}}
+        ]
+        counts = {doc["_id"]: doc["total"] async for doc in db.usages.aggregate(pipeline)}
+        return {
+            "period_start": _midnight(period_start),
+            "period_end": _midnight(period_end),
+            "counts": counts,
+        }
+
+    @staticmethod
+    async def _subscription_and_usage(
+        couple_id: str,
+        db: AsyncIOMotorDatabase,
+        create_subscription: bool
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        # The usage window comes from the subscription, so these two stay sequential
+        if create_subscription:
+            subscription = await subscription_service.get_or_create_subscription(couple_id, db)
+        else:
+            subscription = await subscription_service.get_subscription(couple_id, db)
+        if subscription is None:
+            return None, None
+        usage = await CoupleSummaryService._usage(couple_id, subscription, db)
+        return _subscription_entry(subscription), usage
+
+    # Building and reading
+
+    @staticmethod
+    async def build(
+        couple_id: str,
+        db: AsyncIOMotorDatabase,
+        create_subscription: bool = True
+    ) -> CoupleSummaryInDB:
+        """
+        Compute a couple's summary from the source collections (not stored).
+
+        Args:
+            couple_id: Couple ID
+            db: Database connection
+            create_subscription: Start the free trial when the couple has no
+                subscription yet, as the API reads always have
+        """
+        (subscription, usage), recent_arguments, active_goals, latest_checkin = await asyncio.gather(
+            CoupleSummaryService._subscription_and_usage(couple_id, db, create_subscription),
+            CoupleSummaryService._recent_arguments(couple_id, db),
+            CoupleSummaryService._active_goals(couple_id, db),
+            CoupleSummaryService._latest_checkin(couple_id, db),
+        )
+        now = datetime.utcnow()
+        return CoupleSummaryInDB.from_mongo({
+            "couple_id": ObjectId(couple_id),
+            "version": SUMMARY_VERSION,
+            "subscription": subscription,
+            "usage": usage,
+            "recent_arguments": recent_arguments,
+            "active_goals": active_goals,
+            "latest_checkin": latest_checkin,
+            "rebuilt_at": now,
+            "updated_at": now,
+        })
+
+    @staticmethod
+    async def _store(summary: CoupleSummaryInDB, db: AsyncIOMotorDatabase) -> None:
+        query = {"couple_id": ObjectId(summary.couple_id)}
+        document = summary.to_mongo()
+        try:
+            await db.couple_summaries.replace_one(query, document, upsert=True)
+        except DuplicateKeyError:
+            # A concurrent first read inserted it; replace that one
+            await db.couple_summaries.replace_one(query, document)
+
+    @staticmethod
+    async def rebuild(
+        couple_id: str,
+        db: AsyncIOMotorDatabase,
+        create_subscription: bool = True
+    ) -> CoupleSummaryInDB:
+        """Recompute and store a couple's summary."""
+        summary = await CoupleSummaryService.build(couple_id, db, create_subscription)
+        await CoupleSummaryService._store(summary, db)
+        return summary
+
+    @staticmethod
+    async def get(couple_id: str, db: AsyncIOMotorDatabase) -> CoupleSummaryInDB:
+        """
+        Read a couple's summary, building it when missing or stale.
+
+        A summary is stale when it was stored under another SUMMARY_VERSION
+        or without a subscription (rebuilt offline before the couple had
+        one). When the billing period moved on without a subscription write
+        (periods default to dates relative to today) the usage section is
+        recomputed.
+        """
+        doc = await db.couple_summaries.find_one({"couple_id": ObjectId(couple_id)})
+        if not doc or doc.get("version") != SUMMARY_VERSION or not doc.get("subscription"):
+            return await CoupleSummaryService.rebuild(couple_id, db)
+
+        summary = CoupleSummaryInDB.from_mongo(doc)
+        period = tuple(map(_midnight, usage_service.get_period_dates(summary.subscription)))
+        if summary.usage is None or (summary.usage.period_start, summary.usage.period_end) != period:
+            usage = await CoupleSummaryService._usage(couple_id, summary.subscription, db)
+            await CoupleSummaryService._set_sections(couple_id, {"usage": usage}, db)
+            summary = CoupleSummaryInDB.from_mongo({**doc, "usage": usage})
+        return summary
+
+    @staticmethod
+    def usage_count(summary: CoupleSummaryInDB, usage_type: UsageType) -> int:
+        """Usage in the summary's current period."""
+        if summary.usage is None:
+            return 0
+        return summary.usage.counts.get(usage_type.value, 0)
+
+    @staticmethod
+    def check_usage_limit(summary: CoupleSummaryInDB, usage_type: UsageType) -> tuple[bool, int, int]:
+        """
+        usage_service.check_usage_limit(), answered from the summary.
+        Returns: (is_allowed, current_count, limit)
+        """
+        if summary.subscription is None:
+            return False, 0, 0
+
+        limit = subscription_service.get_argument_limit(summary.subscription)
+
+        # Unlimited means -1
+        if limit == -1:
+            return True, 0, -1
+
+        current_count = CoupleSummaryService.usage_count(summary, usage_type)
+        return current_count < limit, current_count, limit
+
+    # Incremental updates, called by the write paths
+
+    @staticmethod
+    async def _update(
+        couple_id: str,
+        update: Dict[str, Any],
+        db: AsyncIOMotorDatabase,
+        match: Optional[Dict[str, Any]] = None
+    ):
+        update.setdefault("$set", {})["updated_at"] = datetime.utcnow()
+        return await db.couple_summaries.update_one(
+            {"couple_id": ObjectId(couple_id), **(match or {})},
+            update
+        )
+
+    @staticmethod
+    async def _set_sections(couple_id: str, sections: Dict[str, Any], db: AsyncIOMotorDatabase) -> None:
+        await CoupleSummaryService._update(couple_id, {"$set": dict(sections)}, db)
+
+    @staticmethod
+    async def argument_created(argument: ArgumentInDB, db: AsyncIOMotorDatabase) -> None:
+        """Add a new argument to the recent list, keeping the newest MAX_RECENT_ARGUMENTS."""
+        await CoupleSummaryService._update(argument.couple_id, {
+            "$push": {
+                "recent_arguments": {
+                    "$each": [_argument_entry(argument.to_mongo())],
+                    "$sort": {"created_at": -1},
+                    "$slice": MAX_RECENT_ARGUMENTS
+                }
+            }
+        }, db)
+
+    @staticmethod
+    async def argument_status_changed(
+        couple_id: str,
+        argument_id: str,
+        status: ArgumentStatus,
+        db: AsyncIOMotorDatabase
+    ) -> None:
+        """Update an argument's status if it is one of the recent ones."""
+        await CoupleSummaryService._update(
+            couple_id,
+            {"$set": {"recent_arguments.$.status": status.value}},
+            db,
+            match={"recent_arguments.id": str(argument_id)}
+        )
+
+    @staticmethod
+    async def argument_deleted(couple_id: str, argument_id: str, db: AsyncIOMotorDatabase) -> None:
+        """Refill the recent list when one of its arguments was deleted."""
+        listed = await db.couple_summaries.find_one(
+            {"couple_id": ObjectId(couple_id), "recent_arguments.id": str(argument_id)},
+            {"_id": 1}
+        )
+        if listed:
+            recent_arguments = await CoupleSummaryService._recent_arguments(couple_id, db)
+            await CoupleSummaryService._set_sections(couple_id, {"recent_arguments": recent_arguments}, db)
+
+    @staticmethod
+    async def goal_created(goal: RelationshipGoalInDB, db: AsyncIOMotorDatabase) -> None:
+        """Add a new active goal."""
+        await CoupleSummaryService._update(goal.couple_id, {
+            "$push": {
+                "active_goals": {"$each": [_goal_entry(goal.to_mongo())], "$sort": {"created_at": -1}}
+            }
+        }, db)
+
+    @staticmethod
+    async def goal_closed(couple_id: str, goal_id: str, db: AsyncIOMotorDatabase) -> None:
+        """Drop a goal that is no longer active."""
+        await CoupleSummaryService._update(
+            couple_id, {"$pull": {"active_goals": {"id": str(goal_id)}}}, db
+        )
+
+    @staticmethod
+    async def checkin_changed(checkin: Dict[str, Any], db: AsyncIOMotorDatabase) -> None:
+        """Record a created or updated check-in document unless a later week is already recorded."""
+        entry = _checkin_entry(checkin)
+        await CoupleSummaryService._update(
+            str(checkin["couple_id"]),
+            {"$set": {"latest_checkin": entry}},
+            db,
+            match={"$or": [
+                {"latest_checkin": None},
+                {"latest_checkin.week_start_date": {"$lte": entry["week_start_date"]}},
+            ]}
+        )
+
+    @staticmethod
+    async def usage_tracked(
+        couple_id: str,
+        usage_type: UsageType,
+        period_start: date,
+        period_end: date,
+        db: AsyncIOMotorDatabase
+    ) -> None:
+        """Count one use in the summary's period, recomputing usage if the period differs."""
+        result = await CoupleSummaryService._update(
+            couple_id,
+            {"$inc": {f"usage.counts.{usage_type.value}": 1}},
+            db,
+            match={
+                "usage.period_start": _midnight(period_start),
+                "usage.period_end": _midnight(period_end),
+            }
+        )
+        if result.matched_count:
+            return
+
+        doc = await db.couple_summaries.find_one(
+            {"couple_id": ObjectId(couple_id)}, {"subscription": 1}
+        )
+        if doc and doc.get("subscription"):
+            subscription = SummarySubscription.model_validate(doc["subscription"])
+            usage = await CoupleSummaryService._usage(couple_id, subscription, db)
+            await CoupleSummaryService._set_sections(couple_id, {"usage": usage}, db)
+
+    @staticmethod
+    async def subscription_changed(subscription: SubscriptionInDB, db: AsyncIOMotorDatabase) -> None:
+        """Store a created or updated subscription, with usage for its (possibly new) period."""
+        couple_id = subscription.couple_id
+        if not await db.couple_summaries.find_one({"couple_id": ObjectId(couple_id)}, {"_id": 1}):
+            return
+        usage = await CoupleSummaryService._usage(couple_id, subscription, db)
+        await CoupleSummaryService._set_sections(
+            couple_id, {"subscription": _subscription_entry(subscription), "usage": usage}, db
+        )
+
+    # Maintenance
+
+    @staticmethod
+    async def rebuild_all(db: AsyncIOMotorDatabase, force: bool = False) -> int:
+        """
+        Rebuild the summaries of couples whose summary is missing or stored
+        under another SUMMARY_VERSION (every couple with ``force``).
+
+        Subscriptions are not created here; couples without one get theirs
+        (and a rebuilt summary) on their next read.
+
+        Returns:
+            Number of summaries rebuilt
+        """
+        current = set()
+        if not force:
+            async for doc in db.couple_summaries.find({"version": SUMMARY_VERSION}, {"couple_id": 1}):
+                current.add(doc["couple_id"])
+
+        rebuilt = 0
+        async for couple in db.couples.find({}, {"_id": 1}):
+            if couple["_id"] in current:
+                continue
+            await CoupleSummaryService.rebuild(str(couple["_id"]), db, create_subscription=False)
+            rebuilt += 1
+        logger.info(f"Rebuilt {rebuilt} couple summaries (version {SUMMARY_VERSION})")
+        return rebuilt
+
+    @staticmethod
+    async def check(
+        db: AsyncIOMotorDatabase,
+        fix: bool = False,
+        limit: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Compare stored summaries with summaries recomputed from the source
+        collections.
+
+        Args:
+            db: Database connection
+            fix: Store the recomputed summary for every summary that drifted
+            limit: Check at most this many summaries (0 for all)
+
+        Returns:
+            One {"couple_id", "sections"} entry per drifted summary, listing
+            the sections that differ
+        """
+        drifted = []
+        cursor = db.couple_summaries.find({"version": SUMMARY_VERSION}).limit(limit)
+        async for doc in cursor:
+            stored = CoupleSummaryInDB.from_mongo(doc)
+            expected = await CoupleSummaryService.build(stored.couple_id, db, create_subscription=False)
+            stored_sections = stored.model_dump(include=set(SECTIONS))
+            expected_sections = expected.model_dump(include=set(SECTIONS))
+            sections = [
+                section for section in SECTIONS
+                if stored_sections[section] != expected_sections[section]
+            ]
+            if not sections:
+                continue
+            logger.warning(f"Couple summary {stored.couple_id} drifted: {', '.join(sections)}")
+            drifted.append({"couple_id": stored.couple_id, "sections": sections})
+            if fix:
+                await CoupleSummaryService._store(expected, db)
+        return drifted
+
+
+couple_summary_service = CoupleSummaryService()
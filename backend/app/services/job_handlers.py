@@ -0,0 +1,118 @@
+"""Handlers that execute background jobs, keyed by job type."""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.models.ai_insight import AIInsightInDB
+from app.models.argument import ArgumentStatus
+from app.models.couple import CoupleInDB
+from app.models.job import JobInDB, JobType
+from app.models.perspective import PerspectiveInDB
+from app.services.ai_service import ai_service
+from app.services.couple_summary_service import couple_summary_service
+from app.services.job_queue import PermanentJobError
+from app.services.safety_service import safety_service
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[JobInDB, AsyncIOMotorDatabase], Awaitable[Optional[Dict[str, Any]]]]
+
+
+async def _load_perspectives(
+    argument_oid: ObjectId,
+    couple_id: Optional[str],
+    db: AsyncIOMotorDatabase
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Read both partners' perspectives and combine their stored safety verdicts.
+
+    The job payload carries only references, so the perspective text never
+    sits in the jobs collection.
+
+    Returns:
+        (perspective_1, perspective_2, safety_check)
+    """
+    couple_doc = await db.couples.find_one({"_id": ObjectId(couple_id)}) if couple_id else None
+    if not couple_doc:
+        raise PermanentJobError("Couple not found")
+    couple = CoupleInDB.from_mongo(couple_doc)
+
+    by_user = {}
+    async for doc in db.perspectives.find({"argument_id": argument_oid}):
+        perspective = PerspectiveInDB.from_mongo(doc)
+        by_user[perspective.user_id] = perspective
+
+    perspective_1 = by_user.get(couple.user1_id)
+    perspective_2 = by_user.get(couple.user2_id)
+    if not perspective_1 or not perspective_2:
+        # e.g. a partner deleted their account while the job was queued
+        raise PermanentJobError("Both partners must submit perspectives")
+
+    safety_check = safety_service.combine_verdicts(
+        safety_service.verdict_for(perspective_1),
+        safety_service.verdict_for(perspective_2)
+    )
+    return perspective_1.content, perspective_2.content, safety_check
+
+
+async def run_mediation(job: JobInDB, db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+    """Generate and store AI insights for an argument (idempotent across retries)."""
+    payload = job.payload
+    argument_oid = ObjectId(payload["argument_id"])
+
+    perspective_1, perspective_2, safety_check = await _load_perspectives(
+        argument_oid, job.couple_id, db
+    )
+    existing = await db.ai_insights.find_one({"argument_id": argument_oid})
+    if existing:
+        # An earlier attempt saved the insight before its lease was lost
+        result = ai_service.insight_response(AIInsightInDB.from_mongo(existing), safety_check)
+    else:
+        try:
+            result = await ai_service.mediate_argument(
+                argument_id=payload["argument_id"],
+                perspective_1=perspective_1,
+                perspective_2=perspective_2,
+                category=payload["category"],
+                db=db,
+                couple_id=job.couple_id,
+                safety_check=safety_check
+            )
+        except ValueError as e:
+            # Safety blocks from build_mediation_request; a retry would block again
+            raise PermanentJobError(str(e))
+
+    await db.arguments.update_one(
+        {"_id": argument_oid},
+        {"$set": {"status": ArgumentStatus.ANALYZED.value}}
+    )
+    if job.couple_id:
+        await couple_summary_service.argument_status_changed(
+            job.couple_id, payload["argument_id"], ArgumentStatus.ANALYZED, db
+        )
+    return result
+
+
+async def run_harmony_report(job: JobInDB, db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+    """Generate the weekly harmony report for a completed check-in."""
+    payload = job.payload
+    report = await ai_service.generate_harmony_report(
+        checkin_id=payload["checkin_id"],
+        db=db,
+        user1_responses=payload.get("user1_responses", {}),
+        user2_responses=payload.get("user2_responses", {}),
+        couple_id=job.couple_id
+    )
+    if report is None:
+        # generate_harmony_report logs and swallows errors; surface them for retry
+        raise RuntimeError("Harmony report generation failed")
+    return {"checkin_id": payload["checkin_id"]}
+
+
+JOB_HANDLERS: Dict[JobType, JobHandler] = {
+    JobType.MEDIATE_ARGUMENT: run_mediation,
+    JobType.HARMONY_REPORT: run_harmony_report,
+}
@@ -0,0 +1,207 @@
+"""Mongo-backed background job queue.
+
+Jobs live in the ``jobs`` collection. Workers claim one job at a time with a
+single find_one_and_update that flips it to "running" and sets a lease, so
+two workers can never run the same job concurrently. A worker that dies
+leaves its lease to expire, after which the job is claimable again. Failed
+jobs are rescheduled with exponential backoff; once attempts are exhausted
+(or the failure is permanent) the job is dead-lettered with status "dead".
+Finished jobs, succeeded or dead, are removed by a TTL index on expires_at.
+"""
+
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from app.config import settings
+from app.models.job import JobInDB, JobStatus, JobType
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot succeed; the job is dead-lettered."""
+
+
+class JobQueueService:
+    """Enqueue, claim and settle background jobs."""
+
+    def __init__(
+        self,
+        lease_seconds: int,
+        max_attempts: int,
+        retry_base_seconds: float,
+        retry_max_seconds: float,
+        succeeded_ttl_hours: int,
+        dead_ttl_hours: int
+    ):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.succeeded_ttl_hours = succeeded_ttl_hours
+        self.dead_ttl_hours = dead_ttl_hours
+
+    async def enqueue(
+        self,
+        job_type: JobType,
+        payload: Dict[str, Any],
+        db: AsyncIOMotorDatabase,
+        user_id: Optional[str] = None,
+        couple_id: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> JobInDB:
+        """Create a queued job that is runnable immediately."""
+        job = JobInDB(
+            type=job_type,
+            payload=payload,
+            user_id=user_id,
+            couple_id=couple_id,
+            max_attempts=max_attempts or self.max_attempts,
+        )
+        result = await db.jobs.insert_one(job.to_mongo())
+        job.id = str(result.inserted_id)
+        logger.info(f"Enqueued {job_type.value} job {job.id}")
+        return job
+
+    async def find_active(
+        self,
+        job_type: JobType,
+        payload_filter: Dict[str, Any],
+        db: AsyncIOMotorDatabase
+    ) -> Optional[JobInDB]:
+        """Return a queued or running job of this type matching the payload fields."""
+        query = {
+            "type": job_type.value,
+            "status": {"$in": [JobStatus.QUEUED.value, JobStatus.RUNNING.value]},
+        }
+        query.update({f"payload.{key}": value for key, value in payload_filter.items()})
+        job_doc = await db.jobs.find_one(query)
+        return JobInDB.from_mongo(job_doc) if job_doc else None
+
+    async def get_job(self, job_id: ObjectId, db: AsyncIOMotorDatabase) -> Optional[JobInDB]:
+        job_doc = await db.jobs.find_one({"_id": job_id})
+        return JobInDB.from_mongo(job_doc) if job_doc else None
+
+    async def claim(
+        self,
+        worker_id: str,
+        db: AsyncIOMotorDatabase,
+        job_types: Optional[Iterable[JobType]] = None
+    ) -> Optional[JobInDB]:
+        """
+        Atomically lease the next runnable job.
+
+        Runnable means queued with run_at in the past, or running with an
+        expired lease (its worker died). Claiming increments attempts.
+        """
+        now = datetime.utcnow()
+        query: Dict[str, Any] = {
+            "$or": [
+                {"status": JobStatus.QUEUED.value, "run_at": {"$lte": now}},
+                {"status": JobStatus.RUNNING.value, "lease_until": {"$lt": now}},
+            ]
+        }
+        if job_types:
+            query["type"] = {"$in": [t.value for t in job_types]}
+
+        job_doc = await db.jobs.find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "worker_id": worker_id,
+                    "lease_until": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return JobInDB.from_mongo(job_doc) if job_doc else None
+
+    async def extend_lease(self, job: JobInDB, worker_id: str, db: AsyncIOMotorDatabase) -> bool:
+        """Push the lease forward. False if this worker no longer holds it."""
+        now = datetime.utcnow()
+        result = await db.jobs.update_one(
+            {"_id": ObjectId(job.id), "worker_id": worker_id, "status": JobStatus.RUNNING.value},
+            {"$set": {
+                "lease_until": now + timedelta(seconds=self.lease_seconds),
+                "updated_at": now,
+            }}
+        )
+        return result.modified_count == 1
+
+    async def complete(
+        self,
+        job: JobInDB,
+        worker_id: str,
+        result: Optional[Dict[str, Any]],
+        db: AsyncIOMotorDatabase
+    ) -> bool:
+        """Mark a job succeeded. Ignored if the lease was lost to another worker."""
+        now = datetime.utcnow()
+        update = await db.jobs.update_one(
+            {"_id": ObjectId(job.id), "worker_id": worker_id, "status": JobStatus.RUNNING.value},
+            {"$set": {
+                "status": JobStatus.SUCCEEDED.value,
+                "result": result,
+                "lease_until": None,
+                "finished_at": now,
+                "updated_at": now,
+                "expires_at": now + timedelta(hours=self.succeeded_ttl_hours),
+            }}
+        )
+        return update.modified_count == 1
+
+    def retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with full jitter, capped at retry_max_seconds."""
+        ceiling = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** max(attempts - 1, 0)))
+        return random.uniform(ceiling / 2, ceiling)
+
+    async def fail(
+        self,
+        job: JobInDB,
+        worker_id: str,
+        error: str,
+        db: AsyncIOMotorDatabase,
+        permanent: bool = False
+    ) -> JobStatus:
+        """Reschedule a failed job with backoff, or dead-letter it."""
+        now = datetime.utcnow()
+        if permanent or job.attempts >= job.max_attempts:
+            new_status = JobStatus.DEAD
+            fields = {
+                "status": new_status.value,
+                "finished_at": now,
+                "expires_at": now + timedelta(hours=self.dead_ttl_hours),
+            }
+            logger.error(f"Job {job.id} ({job.type.value}) dead after {job.attempts} attempts: {error}")
+        else:
+            new_status = JobStatus.QUEUED
+            delay = self.retry_delay(job.attempts)
+            fields = {"status": new_status.value, "run_at": now + timedelta(seconds=delay)}
+            logger.warning(f"Job {job.id} ({job.type.value}) failed, retrying in {delay:.0f}s: {error}")
+
+        fields.update({"last_error": error[:2000], "lease_until": None, "updated_at": now})
+        await db.jobs.update_one(
+            {"_id": ObjectId(job.id), "worker_id": worker_id, "status": JobStatus.RUNNING.value},
+            {"$set": fields}
+        )
+        return new_status
+
+
+job_queue_service = JobQueueService(
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_base_seconds=settings.JOB_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.JOB_RETRY_MAX_SECONDS,
+    succeeded_ttl_hours=settings.JOB_SUCCEEDED_TTL_HOURS,
+    dead_ttl_hours=settings.JOB_DEAD_TTL_HOURS,
+)
@@ -0,0 +1,490 @@
+"""Multi-provider routing for chat completions.
+
+Requests go to the first provider in priority order whose circuit breaker
+is closed. Retryable failures (429, 5xx, timeouts, connection errors) are
+retried with jittered exponential backoff, honouring Retry-After, before
+failing over to the next provider. When a provider has enough latency
+history, a call still running after its p95 is hedged: a second request
+goes to the next provider (or the same one) and the first answer wins.
+
+Every provider speaks the OpenAI chat-completions protocol; Gemini is
+reached through its OpenAI-compatible endpoint.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.core.http_client import http_client
+from app.models.llm_usage import TokenUsage
+
+logger = logging.getLogger(__name__)
+
+MODELS_SUPPORTING_JSON = [
+    "gpt-4-turbo", "gpt-4-turbo-preview", "gpt-4-0125-preview",
+    "gpt-4o", "gpt-4o-mini", "gpt-3.5-turbo", "gpt-4.1", "gemini"
+]
+
+
+class LLMProviderError(Exception):
+    """A single provider call failed."""
+
+    def __init__(
+        self,
+        provider: str,
+        message: str,
+        status_code: Optional[int] = None,
+        retryable: bool = True,
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class LLMUnavailableError(Exception):
+    """Raised when no provider could serve a request."""
+
+    def __init__(self, message: str, retry_after: int = 30):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _is_retryable_status(status_code: int) -> bool:
+    return status_code in (408, 409, 429) or status_code >= 500
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class CircuitBreaker:
+    """Per-provider breaker: opens after consecutive failures, probes after a cool-down."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now. In half-open, admits one probe at a time."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                logger.warning(f"Circuit opened after {self._failures} consecutive failures")
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Give back a half-open probe slot whose call ended without a verdict (cancelled)."""
+        self._probe_in_flight = False
+
+    def retry_after(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(self.reset_timeout - (self._clock() - self._opened_at), 0.0)
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies (seconds)."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float, min_samples: int = 1) -> Optional[float]:
+        if len(self._samples) < max(min_samples, 1):
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+class LLMProvider(ABC):
+    """A chat-completions backend with its own breaker and latency history."""
+
+    def __init__(self, name: str, model: str, breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.model = model
+        self.breaker = breaker or CircuitBreaker(
+            settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS
+        )
+        self.latency = LatencyTracker()
+
+    @abstractmethod
+    async def complete(self, payload: Dict, timeout: float) -> Tuple[str, TokenUsage]:
+        """Return (message content, usage) or raise LLMProviderError."""
+
+    @abstractmethod
+    def stream(self, payload: Dict, timeout: float) -> AsyncIterator[Dict]:
+        """Yield parsed streaming chunks or raise LLMProviderError."""
+
+    async def warm_up(self) -> None:
+        """Open a connection ahead of the first request (optional; a no-op by default)."""
+        return None
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Any endpoint implementing OpenAI's /chat/completions (OpenAI, Gemini, local stubs)."""
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        api_key: str,
+        model: str,
+        client: Optional[httpx.AsyncClient] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        super().__init__(name, model, breaker)
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or http_client.client
+
+    @property
+    def supports_json_mode(self) -> bool:
+        return any(m in self.model.lower() for m in MODELS_SUPPORTING_JSON)
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+
+    def _timeout(self, timeout: float) -> httpx.Timeout:
+        return httpx.Timeout(timeout, connect=settings.OUTBOUND_CONNECT_TIMEOUT_SECONDS)
+
+    def prepare(self, payload: Dict) -> Dict:
+        """Adapt a request to this provider's model and capabilities."""
+        prepared = {**payload, "model": self.model}
+        if not self.supports_json_mode:
+            prepared.pop("response_format", None)
+        return prepared
+
+    def _status_error(self, resp: httpx.Response) -> LLMProviderError:
+        return LLMProviderError(
+            self.name,
+            f"HTTP {resp.status_code}",
+            status_code=resp.status_code,
+            retryable=_is_retryable_status(resp.status_code),
+            retry_after=_parse_retry_after(resp.headers.get("retry-after")),
+        )
+
+    async def complete(self, payload: Dict, timeout: float) -> Tuple[str, TokenUsage]:
+        try:
+            resp = await self.client.post(
+                f"{self.base_url}/chat/completions",
+                json=self.prepare(payload),
+                headers=self._headers(),
+                timeout=self._timeout(timeout),
+            )
+        except httpx.HTTPError as e:
+            raise LLMProviderError(self.name, f"{type(e).__name__}: {e}")
+        if resp.status_code >= 400:
+            raise self._status_error(resp)
+        try:
+            body = resp.json()
+            content = body["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise LLMProviderError(self.name, "malformed completion body")
+        return content, TokenUsage.from_openai(body.get("usage"))
+
+    async def stream(self, payload: Dict, timeout: float) -> AsyncIterator[Dict]:
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=self.prepare(payload),
+                headers=self._headers(),
+                timeout=self._timeout(timeout),
+            ) as resp:
+                if resp.status_code >= 400:
+                    raise self._status_error(resp)
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        return
+                    try:
+                        chunk = json.loads(data)
+                    except ValueError:
+                        raise LLMProviderError(self.name, "malformed stream chunk")
+                    yield chunk
+        except httpx.HTTPError as e:
+            raise LLMProviderError(self.name, f"{type(e).__name__}: {e}")
+
+    async def warm_up(self) -> None:
+        await http_client.warm_up(f"{self.base_url}/models", headers=self._headers())
+
+
+class LLMRouter:
+    """Routes chat completions across providers with retries, failover and hedging."""
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        max_attempts: int = 2,
+        retry_base_seconds: float = 0.5,
+        retry_max_seconds: float = 8.0,
+        hedge_enabled: bool = True,
+        hedge_min_samples: int = 20,
+        hedge_min_delay_seconds: float = 1.0,
+        sleep=asyncio.sleep
+    ):
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.providers = providers
+        self.max_attempts = max(max_attempts, 1)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self._sleep = sleep
+        self._counters: Counter = Counter()
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = random.uniform(0, min(self.retry_max_seconds, self.retry_base_seconds * 2 ** attempt))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.retry_max_seconds))
+        return delay
+
+    def _hedge_delay(self, provider: LLMProvider) -> Optional[float]:
+        if not self.hedge_enabled:
+            return None
+        p95 = provider.latency.percentile(95, self.hedge_min_samples)
+        return None if p95 is None else max(p95, self.hedge_min_delay_seconds)
+
+    async def _call(self, provider: LLMProvider, payload: Dict, timeout: float) -> Tuple[str, TokenUsage]:
+        """One request to a provider whose breaker has already admitted it."""
+        started = time.perf_counter()
+        try:
+            result = await provider.complete(payload, timeout)
+        except LLMProviderError as e:
+            if e.retryable:
+                provider.breaker.record_failure()
+            else:
+                # The provider answered; the request itself was rejected
+                provider.breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            provider.breaker.release()
+            raise
+        provider.breaker.record_success()
+        provider.latency.add(time.perf_counter() - started)
+        return result
+
+    async def _hedged(
+        self,
+        primary: LLMProvider,
+        secondary: Optional[LLMProvider],
+        payload: Dict,
+        timeout: float
+    ) -> Tuple[str, TokenUsage, LLMProvider]:
+        delay = self._hedge_delay(primary)
+        if delay is None:
+            content, usage = await self._call(primary, payload, timeout)
+            return content, usage, primary
+
+        first = asyncio.create_task(self._call(primary, payload, timeout))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        hedge_target = None
+        if not done:
+            hedge_target = next(
+                (p for p in (secondary, primary) if p is not None and p.breaker.allow()), None
+            )
+        if hedge_target is None:
+            content, usage = await first
+            return content, usage, primary
+
+        self._counters["hedges"] += 1
+        second = asyncio.create_task(self._call(hedge_target, payload, timeout))
+        owners = {first: primary, second: hedge_target}
+        pending = set(owners)
+        first_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self._counters["hedge_wins"] += 1
+                        content, usage = task.result()
+                        return content, usage, owners[task]
+                    first_error = first_error or task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise first_error
+
+    async def complete(self, payload: Dict, timeout: float) -> Tuple[str, TokenUsage, LLMProvider]:
+        """
+        Run a chat completion on the best available provider.
+
+        Returns:
+            (message content, token usage, provider that answered)
+
+        Raises:
+            LLMUnavailableError: every provider failed or is circuit-open
+        """
+        errors: List[str] = []
+        for index, provider in enumerate(self.providers):
+            secondary = self.providers[index + 1] if index + 1 < len(self.providers) else None
+            for attempt in range(self.max_attempts):
+                if not provider.breaker.allow():
+                    errors.append(f"{provider.name}: circuit open")
+                    break
+                try:
+                    return await self._hedged(provider, secondary, payload, timeout)
+                except LLMProviderError as e:
+                    errors.append(str(e))
+                    if not e.retryable or attempt == self.max_attempts - 1:
+                        break
+                    self._counters["retries"] += 1
+                    await self._sleep(self._backoff(attempt, e.retry_after))
+            self._counters["failovers"] += 1
+        raise self._unavailable(errors)
+
+    async def stream(self, payload: Dict, timeout: float) -> AsyncIterator[Tuple[LLMProvider, Dict]]:
+        """
+        Stream a chat completion, yielding (provider, chunk).
+
+        Retries and failover apply only until the first chunk arrives; after
+        that an error is raised to the caller. Streams are not hedged.
+        """
+        errors: List[str] = []
+        for provider in self.providers:
+            for attempt in range(self.max_attempts):
+                if not provider.breaker.allow():
+                    errors.append(f"{provider.name}: circuit open")
+                    break
+                started = False
+                settled = False
+                try:
+                    async for chunk in provider.stream(payload, timeout):
+                        if not started:
+                            started = True
+                            provider.breaker.record_success()
+                            settled = True
+                        yield provider, chunk
+                    if not settled:
+                        provider.breaker.record_success()
+                        settled = True
+                    return
+                except LLMProviderError as e:
+                    if not settled:
+                        if e.retryable:
+                            provider.breaker.record_failure()
+                        else:
+                            provider.breaker.record_success()
+                        settled = True
+                    if started:
+                        raise
+                    errors.append(str(e))
+                    if not e.retryable or attempt == self.max_attempts - 1:
+                        break
+                    self._counters["retries"] += 1
+                    await self._sleep(self._backoff(attempt, e.retry_after))
+                finally:
+                    if not settled:
+                        provider.breaker.release()
+            self._counters["failovers"] += 1
+        raise self._unavailable(errors)
+
+    def _unavailable(self, errors: List[str]) -> LLMUnavailableError:
+        retry_after = min(
+            (p.breaker.retry_after() for p in self.providers if p.breaker.state == CircuitBreaker.OPEN),
+            default=0.0,
+        )
+        logger.error(f"All LLM providers failed: {'; '.join(errors)}")
+        return LLMUnavailableError(
+            "AI service is temporarily unavailable", retry_after=max(int(retry_after) + 1, 5)
+        )
+
+    async def warm_up(self) -> None:
+        for provider in self.providers:
+            await provider.warm_up()
+
+    def stats(self) -> Dict:
+        return {
+            "providers": [
+                {
+                    "name": p.name,
+                    "model": p.model,
+                    "circuit": p.breaker.state,
+                    "p95_ms": round(p95 * 1000, 1) if (p95 := p.latency.percentile(95)) is not None else None,
+                }
+                for p in self.providers
+            ],
+            **{key: self._counters[key] for key in ("retries", "failovers", "hedges", "hedge_wins")},
+        }
+
+
+def build_llm_router() -> LLMRouter:
+    """Provider chain from settings: OpenAI, then an optional fallback model, then Gemini."""
+    providers: List[LLMProvider] = [
+        OpenAICompatibleProvider("openai", settings.OPENAI_BASE_URL, settings.OPENAI_API_KEY, settings.OPENAI_MODEL)
+    ]
+    if settings.OPENAI_FALLBACK_MODEL:
+        providers.append(OpenAICompatibleProvider(
+            "openai-fallback", settings.OPENAI_BASE_URL, settings.OPENAI_API_KEY, settings.OPENAI_FALLBACK_MODEL
+        ))
+    if settings.GEMINI_API_KEY:
+        providers.append(OpenAICompatibleProvider(
+            "gemini", settings.GEMINI_BASE_URL, settings.GEMINI_API_KEY, settings.GEMINI_MODEL
+        ))
+    return LLMRouter(
+        providers,
+        max_attempts=settings.LLM_MAX_ATTEMPTS,
+        retry_base_seconds=settings.LLM_RETRY_BASE_SECONDS,
+        retry_max_seconds=settings.LLM_RETRY_MAX_SECONDS,
+        hedge_enabled=settings.LLM_HEDGE_ENABLED,
+        hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+        hedge_min_delay_seconds=settings.LLM_HEDGE_MIN_DELAY_SECONDS,
+    )
@@ -0,0 +1,175 @@
+"""Token, cost and latency accounting for LLM calls.
+
+Every model call is folded into one document per
+(day, couple_id, feature, model) in ``llm_usage_daily`` with a single
+upsert of $inc counters, so reporting is a small aggregate over
+pre-summed rows rather than a scan of individual calls. Latency is kept
+as a fixed-bucket histogram in the same document.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.models.llm_usage import TokenUsage
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens: (input, cached input, output). Matched by longest prefix.
+MODEL_PRICING: Dict[str, tuple] = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4-turbo": (10.00, 10.00, 30.00),
+    "gpt-3.5-turbo": (0.50, 0.50, 1.50),
+    "gpt-4": (30.00, 30.00, 60.00),
+    # Failover provider (GEMINI_MODEL)
+    "gemini-2.0-flash-lite": (0.075, 0.075, 0.30),
+    "gemini-2.0-flash": (0.10, 0.025, 0.40),
+    "gemini-2.5-flash": (0.30, 0.075, 2.50),
+    # Other Gemini models at Pro rates, the highest of the family
+    "gemini-": (2.50, 0.625, 15.00),
+}
+# Unknown models are priced like the most expensive one so spend is never under-reported
+DEFAULT_PRICING = MODEL_PRICING["gpt-4"]
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000]
+
+
+def _pricing_for(model: str) -> tuple:
+    name = model.lower()
+    for prefix in sorted(MODEL_PRICING, key=len, reverse=True):
+        if name.startswith(prefix):
+            return MODEL_PRICING[prefix]
+    return DEFAULT_PRICING
+
+
+def calculate_cost(model: str, usage: TokenUsage) -> float:
+    """Cost in USD of one call, billing cached prompt tokens at the cached rate."""
+    input_rate, cached_rate, output_rate = _pricing_for(model)
+    uncached = max(usage.prompt_tokens - usage.cached_prompt_tokens, 0)
+    return (
+        uncached * input_rate
+        + usage.cached_prompt_tokens * cached_rate
+        + usage.completion_tokens * output_rate
+    ) / 1_000_000
+
+
+def latency_bucket(latency_ms: float) -> str:
+    for bound in LATENCY_BUCKETS_MS:
+        if latency_ms <= bound:
+            return f"le_{bound}"
+    return "le_inf"
+
+
+class LLMUsageService:
+    """Records per-call usage into daily rollups and queries them."""
+
+    @staticmethod
+    async def record(
+        db: AsyncIOMotorDatabase,
+        feature: str,
+        model: str,
+        usage: TokenUsage,
+        latency_ms: float,
+        couple_id: Optional[str] = None,
+        success: bool = True
+    ) -> float:
+        """
+        Fold one call into its daily rollup. Returns the call's cost.
+
+        Never raises: accounting must not fail the request it describes.
+        """
+        cost = calculate_cost(model, usage)
+        now = datetime.utcnow()
+        key = {
+            "day": datetime(now.year, now.month, now.day),
+            "couple_id": ObjectId(couple_id) if couple_id else None,
+            "feature": feature,
+            "model": model,
+        }
+        try:
+            await db.llm_usage_daily.update_one(
+                key,
+                {
+                    "$inc": {
+                        "calls": 1,
+                        "errors": 0 if success else 1,
+                        "prompt_tokens": usage.prompt_tokens,
+                        "cached_prompt_tokens": usage.cached_prompt_tokens,
+                        "completion_tokens": usage.completion_tokens,
+                        "cost_usd": cost,
+                        "latency_ms_sum": latency_ms,
+                        f"latency_hist.{latency_bucket(latency_ms)}": 1,
+                    },
+                    "$max": {"latency_ms_max": latency_ms},
+                    "$set": {"updated_at": now},
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to record LLM usage for {feature}: {e}")
+        return cost
+
+    @staticmethod
+    async def summarize(
+        db: AsyncIOMotorDatabase,
+        start: datetime,
+        end: datetime,
+        couple_id: Optional[str] = None,
+        group_by: tuple = ("feature", "model")
+    ) -> List[Dict[str, Any]]:
+        """
+        Totals over [start, end) grouped by rollup key fields.
+
+        Each row has calls, errors, token counts, cost_usd, avg/max latency
+        and the merged latency histogram.
+        """
+        match: Dict[str, Any] = {"day": {"$gte": start, "$lt": end}}
+        if couple_id:
+            match["couple_id"] = ObjectId(couple_id)
+
+        buckets = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["le_inf"]
+        group: Dict[str, Any] = {
+            "_id": {field: f"${field}" for field in group_by},
+            "calls": {"$sum": "$calls"},
+            "errors": {"$sum": "$errors"},
+            "prompt_tokens": {"$sum": "$prompt_tokens"},
+            "cached_prompt_tokens": {"$sum": "$cached_prompt_tokens"},
+            "completion_tokens": {"$sum": "$completion_tokens"},
+            "cost_usd": {"$sum": "$cost_usd"},
+            "latency_ms_sum": {"$sum": "$latency_ms_sum"},
+            "latency_ms_max": {"$max": "$latency_ms_max"},
+        }
+        for bucket in buckets:
+            group[bucket] = {"$sum": f"$latency_hist.{bucket}"}
+
+        rows = await db.llm_usage_daily.aggregate([
+            {"$match": match},
+            {"$group": group},
+            {"$sort": {"cost_usd": -1}},
+        ]).to_list(length=None)
+
+        summary = []
+        for row in rows:
+            key = row.pop("_id")
+            histogram = {bucket: row.pop(bucket) for bucket in buckets}
+            latency_sum = row.pop("latency_ms_sum")
+            if isinstance(key.get("couple_id"), ObjectId):
+                key["couple_id"] = str(key["couple_id"])
+            summary.append({
+                **key,
+                **row,
+                "latency_ms_avg": latency_sum / row["calls"] if row["calls"] else 0.0,
+                "latency_hist": histogram,
+            })
+        return summary
+
+
+llm_usage_service = LLMUsageService()
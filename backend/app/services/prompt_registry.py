@@ -0,0 +1,360 @@
+"""Versioned prompt registry and token-budgeted prompt building.
+
+Each prompt's system message is a module-level constant, so every request
+of a kind starts with the same bytes and providers can serve that prefix
+from their prompt cache. Everything that varies per request goes in the
+user message, after the static prefix: context is serialized compactly
+and fitted to the prompt's token budget, trimming low-priority sections
+first. Bump a template's version whenever its text changes; the version
+is stored with generated insights.
+"""
+
+import json
+from typing import Any, Dict, List, Union
+
+# Rough characters-per-token for English text with OpenAI-style tokenizers
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " […] "
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (no tokenizer dependency)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def compact_json(value: Any) -> str:
+    """JSON without indentation or padding; non-ASCII kept as-is (fewer tokens)."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class TextSection:
+    """Free text that may be shortened (keeping its head and tail) down to ``min_tokens``."""
+
+    def __init__(self, text: str, priority: int = 0, min_tokens: int = 0):
+        self.text = text
+        self.priority = priority
+        self.min_tokens = min_tokens
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    def shrink(self, target_tokens: int) -> int:
+        keep_tokens = max(target_tokens, self.min_tokens)
+        if keep_tokens >= self.tokens:
+            return self.tokens
+        keep_chars = max(keep_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER), 0)
+        head = keep_chars * 2 // 3
+        tail = keep_chars - head
+        self.text = self.text[:head].rstrip() + TRUNCATION_MARKER + (self.text[-tail:].lstrip() if tail else "")
+        return self.tokens
+
+
+class ListSection:
+    """Ordered items (most important first); trailing items are dropped, keeping ``min_items``."""
+
+    def __init__(self, items: List[str], priority: int = 0, min_items: int = 1, separator: str = "\n"):
+        self.items = list(items)
+        self.priority = priority
+        self.min_items = min_items
+        self.separator = separator
+
+    @property
+    def text(self) -> str:
+        return self.separator.join(self.items)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    def shrink(self, target_tokens: int) -> int:
+        while len(self.items) > self.min_items and self.tokens > target_tokens:
+            self.items.pop()
+        return self.tokens
+
+
+Section = Union[TextSection, ListSection]
+
+
+def _water_fill(sizes: Dict[str, int], target: int) -> Dict[str, int]:
+    """Split ``target`` tokens across sections as evenly as their sizes allow."""
+    allotment = {}
+    remaining = target
+    ordered = sorted(sizes.items(), key=lambda item: item[1])
+    for index, (name, size) in enumerate(ordered):
+        share = remaining // (len(ordered) - index)
+        allotment[name] = min(size, share)
+        remaining -= allotment[name]
+    return allotment
+
+
+def fit_sections(sections: Dict[str, Union[Section, str]], budget_tokens: int) -> Dict[str, str]:
+    """
+    Trim sections until they fit ``budget_tokens``.
+
+    Plain strings are never trimmed. Sections are trimmed lowest priority
+    first; sections sharing a priority are trimmed evenly. Floors
+    (``min_tokens``/``min_items``) are respected even if the budget is
+    then exceeded.
+    """
+    fixed = {name: value for name, value in sections.items() if isinstance(value, str)}
+    trimmable = {name: value for name, value in sections.items() if not isinstance(value, str)}
+    sizes = {name: section.tokens for name, section in trimmable.items()}
+    over = sum(estimate_tokens(text) for text in fixed.values()) + sum(sizes.values()) - budget_tokens
+
+    for priority in sorted({section.priority for section in trimmable.values()}):
+        if over <= 0:
+            break
+        group = {name: sizes[name] for name, section in trimmable.items() if section.priority == priority}
+        allotment = _water_fill(group, max(sum(group.values()) - over, 0))
+        for name, tokens in allotment.items():
+            sizes[name] = trimmable[name].shrink(tokens)
+        over -= sum(group.values()) - sum(sizes[name] for name in group)
+
+    return {**fixed, **{name: section.text for name, section in trimmable.items()}}
+
+
+class PromptTemplate:
+    """A versioned prompt: static system prefix, user template and generation limits."""
+
+    def __init__(
+        self,
+        name: str,
+        version: int,
+        system: str,
+        user: str,
+        max_tokens: int,
+        context_budget_tokens: int,
+        temperature: float = 0.7,
+        json_mode: bool = True
+    ):
+        self.name = name
+        self.version = version
+        self.system = system
+        self.user = user
+        self.max_tokens = max_tokens
+        self.context_budget_tokens = context_budget_tokens
+        self.temperature = temperature
+        self.json_mode = json_mode
+
+    @property
+    def id(self) -> str:
+        return f"{self.name}@v{self.version}"
+
+    def render(self, sections: Dict[str, Union[Section, str]]) -> List[Dict[str, str]]:
+        """Messages for this prompt with the user message fitted to the context budget."""
+        scaffold = estimate_tokens(self.user.format(**{name: "" for name in sections}))
+        fitted = fit_sections(sections, self.context_budget_tokens - scaffold)
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user.format(**fitted)},
+        ]
+
+    def build_payload(self, model: str, sections: Dict[str, Union[Section, str]]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "model": model,
+            "messages": self.render(sections),
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+        if self.json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+
+
+class PromptRegistry:
+    """Holds the current version of each prompt."""
+
+    def __init__(self):
+        self._templates: Dict[str, PromptTemplate] = {}
+
+    def register(self, template: PromptTemplate) -> PromptTemplate:
+        if template.name in self._templates:
+            raise ValueError(f"Prompt '{template.name}' is already registered")
+        self._templates[template.name] = template
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        return self._templates[name]
+
+    def versions(self) -> Dict[str, str]:
+        return {name: template.id for name, template in self._templates.items()}
+
+
+prompt_registry = PromptRegistry()
+
+
+MEDIATION_SYSTEM = """You are Heka, a specialized AI relationship mediator trained in evidence-based conflict resolution techniques.
+
+CORE COMPETENCIES:
+You are trained in:
+- **Gottman Method principles**: Understanding the Four Horsemen (criticism, contempt, defensiveness, stonewalling), identifying repair attempts, emotional attunement
+- **Nonviolent Communication (NVC) framework**: Distinguishing observations from evaluations, feelings from thoughts, identifying underlying needs, framing requests vs. demands
+- **Emotion-Focused Therapy (EFT)**: Identifying attachment fears, recognizing underlying emotions beneath anger, cycle de-escalation
+- **Solution-focused brief therapy**: Focusing on strengths, exceptions, and future solutions rather than problems
+
+ANALYSIS FRAMEWORK:
+1. **Identify Communication Patterns**: Distinguish healthy vs. destructive patterns (Four Horsemen detection)
+2. **Detect Emotional Subtext**: Look beneath surface disagreements to underlying emotions, needs, and fears
+3. **Find Shared Values**: Identify not just surface agreements, but deeper shared values and goals
+4. **Suggest Specific Behavioral Changes**: Provide concrete, actionable suggestions, not generic advice
+5. **Prioritize Emotional Safety**: Ensure both partners feel heard, validated, and safe
+
+SAFETY PROTOCOLS:
+- If you detect abuse indicators, coercive control, violence threats, or self-harm mentions, IMMEDIATELY recommend professional help with specific resources
+- Do NOT attempt to mediate situations involving safety concerns
+- When safety concerns are present, prioritize safety over mediation
+
+RESPONSE STYLE:
+- Empathetic but direct
+- Use "I notice..." statements for observations (NVC)
+- Frame issues as "us vs. the problem" not "you vs. them"
+- Provide 3-5 concrete, actionable suggestions (not generic advice)
+- Include specific conversation scripts when helpful
+- Acknowledge emotions while focusing on solutions
+
+PROHIBITED:
+- Never diagnose mental health conditions
+- Never provide medical or therapeutic treatment
+- Never take sides or judge either partner
+- Never suggest leaving the relationship unless safety is at risk
+- Never minimize serious concerns
+
+Respond in JSON format with:
+{
+  "summary": "Brief 2-3 sentence overview in empathetic tone",
+  "common_ground": ["point 1", "point 2", "point 3"],
+  "disagreements": ["disagreement 1", "disagreement 2"],
+  "root_causes": ["underlying cause 1", "underlying cause 2"],
+  "suggestions": [
+    {
+      "title": "Specific suggestion title",
+      "description": "Detailed explanation with rationale",
+      "actionable_steps": ["step 1", "step 2", "step 3"]
+    }
+  ],
+  "communication_tips": ["tip 1", "tip 2", "tip 3"]
+}
+
+ANALYSIS REQUEST:
+Using Gottman Method, NVC, and EFT frameworks, provide:
+
+1. **Summary**: Brief empathetic overview identifying the core issue
+2. **Common Ground**: Shared values, goals, or agreements (not just surface-level)
+3. **Disagreements**: Key points where they differ (use NVC: observations, not evaluations)
+4. **Root Causes**: Underlying needs, fears, or attachment issues (EFT perspective)
+5. **Suggestions**: 3-5 specific, actionable solutions with:
+   - Title (clear and specific)
+   - Description (explain why this helps)
+   - Actionable steps (concrete things to do)
+6. **Communication Tips**: Specific phrases or approaches using NVC principles
+
+Focus on:
+- Identifying the Four Horsemen if present (criticism, contempt, defensiveness, stonewalling)
+- Finding underlying needs beneath positions
+- Suggesting repair attempts
+- Framing as "us vs. the problem"
+
+Respond in JSON format only."""
+
+GOALS_SYSTEM = """You are Heka, an expert AI relationship coach trained in the Gottman Method and Emotion-Focused Therapy.
+Based on the provided argument summaries and root causes, generate 3-5 highly actionable, positive relationship goals.
+
+RESPONSE STYLE:
+- Focus on building positive, observable behaviors (not just "stop doing X", but "start doing Y").
+- Goals MUST be SMART (Specific, Measurable, Achievable, Relevant, Time-bound).
+- Frame goals collaboratively ("We will...", "Let's practice...").
+- Do not repeat the argument; focus entirely on the solution and future habits.
+
+Respond in JSON format with:
+{
+  "goals": [
+    {
+      "title": "Specific goal title (e.g., 'Practice Active Listening')",
+      "description": "Detailed explanation of the goal and why it's important for the couple's specific issues.",
+      "category": "Communication"
+    }
+  ]
+}
+
+The user message lists argument insights, one JSON object per line, most relevant first.
+Based on these argument insights, suggest 3-5 relationship goals in the specified JSON format."""
+
+CHECKINS_SYSTEM = """You are Heka, an expert AI relationship coach trained in the Gottman Method.
+Based on the provided argument summaries and root causes, generate 3-5 open-ended check-in questions for a weekly reflection.
+
+RESPONSE STYLE:
+- Questions MUST be incredibly gentle, non-accusatory, and forward-looking.
+- Include at least one question focused entirely on a positive moment or gratitude.
+- Encourage deep reflection on underlying needs (attachment, safety) rather than logistics.
+- Frame questions to open up dialogue and assume positive intent.
+
+Respond in JSON format with:
+{
+  "questions": [
+    {
+      "question": "A specific, open-ended question (e.g., 'When did you feel most connected this week, and what were we doing?')",
+      "category": "Emotional Connection"
+    }
+  ]
+}
+
+The user message lists argument insights, one JSON object per line, most relevant first.
+Based on these argument insights, suggest 3-5 weekly check-in questions in the specified JSON format."""
+
+HARMONY_SYSTEM = """You are Heka, an expert relationship coach.
+You are analyzing a couple's weekly check-in responses.
+Your job is to read both sets of answers and provide a 'Harmony Report'.
+
+Format your response in beautiful, encouraging Markdown. Include:
+1. A brief overview of where they align or differ this week.
+2. Highlighting one specific positive thing you noticed from their answers.
+3. One concrete, easy 'micro-exercise' for them to try this week based on their answers.
+
+Keep the tone warm, insightful, and entirely objective (do not take sides).
+Maximum length: 2 short paragraphs."""
+
+
+MEDIATION = prompt_registry.register(PromptTemplate(
+    name="mediation",
+    version=1,
+    system=MEDIATION_SYSTEM,
+    user="""Argument Context:
+Category: {category}{safety_note}
+
+Partner 1 Perspective:
+{perspective_1}
+
+Partner 2 Perspective:
+{perspective_2}""",
+    max_tokens=1500,
+    context_budget_tokens=2000,
+))
+
+GOAL_SUGGESTIONS = prompt_registry.register(PromptTemplate(
+    name="goal_suggestions",
+    version=1,
+    system=GOALS_SYSTEM,
+    user="Argument insights:\n{insights}",
+    max_tokens=700,
+    context_budget_tokens=1200,
+))
+
+CHECKIN_QUESTIONS = prompt_registry.register(PromptTemplate(
+    name="checkin_questions",
+    version=1,
+    system=CHECKINS_SYSTEM,
+    user="Argument insights:\n{insights}",
+    max_tokens=500,
+    context_budget_tokens=1200,
+))
+
+HARMONY_REPORT = prompt_registry.register(PromptTemplate(
+    name="harmony_report",
+    version=1,
+    system=HARMONY_SYSTEM,
+    user="Partner A answered:\n{user1_responses}\n\nPartner B answered:\n{user2_responses}",
+    max_tokens=450,
+    context_budget_tokens=1500,
+    json_mode=False,  # the report is Markdown
+))
@@ -104,12 +104,12 @@ async def verify_and_rotate_refresh_token(
     # If token has no device_id, we accept any device_id (or None) for backward compatibility
     # If token has device_id but we send None, that's also acceptable (device might not be available)
     
-    # Log device_id comparison for debugging
-    device_match = token.device_id == device_id if (token.device_id and device_id) else 'N/A'
-    logger.info(
-        f"Refresh token validation: stored_device_id={token.device_id}, "
-        f"received_device_id={device_id}, match={device_match}"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        device_match = token.device_id == device_id if (token.device_id and device_id) else 'N/A'
+        logger.debug(
+            f"Refresh token validation: stored_device_id={token.device_id}, "
+            f"received_device_id={device_id}, match={device_match}"
+        )
     
     if token.device_id and device_id and token.device_id != device_id:
         raise RefreshTokenError("device mismatch")
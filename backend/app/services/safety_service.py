@@ -3,6 +3,11 @@
 import logging
 from typing import Dict, List
 
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.keyword_scanner import KeywordScanner
+from app.models.perspective import PerspectiveInDB, SafetyVerdict
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,7 +46,43 @@ class SafetyService:
         r"you're crazy",
         r"you're imagining things"
     ]
+
+    # All keywords and patterns compiled once into a single-pass matcher
+    scanner = KeywordScanner(CRISIS_KEYWORDS, {'abuse': ABUSE_PATTERNS})
     
+    # Severity score per concern type (unknown types score 1)
+    SEVERITY_SCORES = {
+        'violence': 4,  # Critical
+        'abuse': 4,  # Critical
+        'self_harm': 5,  # Critical
+        'substance': 2,  # Medium
+        'mental_health_crisis': 3  # High
+    }
+
+    @property
+    def version(self) -> str:
+        """Version stored with each verdict; changes with the keyword lists."""
+        return self.scanner.version
+
+    def scan_perspective(self, content: str) -> SafetyVerdict:
+        """Scan one perspective; the verdict is stored on the perspective document."""
+        matches = [
+            {"type": m.label, "term": m.term, "start": m.start, "end": m.end}
+            for m in self.scanner.scan(content)
+        ]
+        found_types = {m["type"] for m in matches}
+        return SafetyVerdict(
+            version=self.version,
+            concern_types=[ct for ct in self.scanner.labels if ct in found_types],
+            matches=matches
+        )
+
+    def verdict_for(self, perspective: PerspectiveInDB) -> SafetyVerdict:
+        """The stored verdict, or a fresh scan if it is missing or out of date."""
+        if perspective.safety is not None and perspective.safety.version == self.version:
+            return perspective.safety
+        return self.scan_perspective(perspective.content)
+
     def detect_safety_concerns(
         self,
         perspective_1: str,
@@ -54,6 +95,21 @@ class SafetyService:
             perspective_1: First partner's perspective
             perspective_2: Second partner's perspective
             
+        Returns:
+            Same dictionary as combine_verdicts
+        """
+        return self.combine_verdicts(
+            self.scan_perspective(perspective_1),
+            self.scan_perspective(perspective_2)
+        )
+
+    def combine_verdicts(self, *verdicts: SafetyVerdict) -> Dict[str, any]:
+        """
+        Combine per-perspective verdicts into one safety check without rescanning.
+        
+        Args:
+            verdicts: One verdict per perspective, in partner order
+            
         Returns:
             Dictionary with safety concern information:
             {
@@ -61,37 +117,19 @@ class SafetyService:
                 "concern_types": List[str],
                 "severity": str,  # "low", "medium", "high", "critical"
                 "action": str,  # "show_crisis_resources", "block_mediation", etc.
-                "message": str  # User-facing message
+                "message": str,  # User-facing message
+                "matches": [  # what triggered each concern type
+                    {"perspective": 1, "type": str, "term": str, "start": int, "end": int}
+                ]
             }
         """
-        
-        concern_types = []
-        severity_scores = {
-            'violence': 4,  # Critical
-            'abuse': 4,  # Critical
-            'self_harm': 5,  # Critical
-            'substance': 2,  # Medium
-            'mental_health_crisis': 3  # High
-        }
-        
-        # Check both perspectives
-        all_text = f"{perspective_1} {perspective_2}".lower()
-        
-        import re
-        # Check for keyword matches with word boundaries
-        for concern_type, keywords in self.CRISIS_KEYWORDS.items():
-            for keyword in keywords:
-                if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', all_text):
-                    if concern_type not in concern_types:
-                        concern_types.append(concern_type)
-                    break  # Found one keyword for this type, move on
-        
-        # Check for abuse patterns (regex)
-        for pattern in self.ABUSE_PATTERNS:
-            if re.search(pattern, all_text, re.IGNORECASE):
-                if 'abuse' not in concern_types:
-                    concern_types.append('abuse')
-                break
+        matches = [
+            {"perspective": index, **match}
+            for index, verdict in enumerate(verdicts, start=1)
+            for match in verdict.matches
+        ]
+        found_types = {ct for verdict in verdicts for ct in verdict.concern_types}
+        concern_types = [ct for ct in self.scanner.labels if ct in found_types]
         
         # Determine severity
         if not concern_types:
@@ -100,12 +138,13 @@ class SafetyService:
                 "concern_types": [],
                 "severity": "none",
                 "action": "proceed",
-                "message": None
+                "message": None,
+                "matches": []
             }
         
         # Calculate max severity
         max_severity_score = max(
-            severity_scores.get(ct, 1) for ct in concern_types
+            self.SEVERITY_SCORES.get(ct, 1) for ct in concern_types
         )
         
         if max_severity_score >= 4:
@@ -137,8 +176,51 @@ class SafetyService:
             "concern_types": concern_types,
             "severity": severity,
             "action": action,
-            "message": message
+            "message": message,
+            "matches": matches
         }
+
+    async def rescore_perspectives(
+        self,
+        db: AsyncIOMotorDatabase,
+        batch_size: int = 500
+    ) -> int:
+        """
+        Re-scan perspectives whose stored verdict is missing or was computed
+        with a different keyword list.
+
+        A maintenance task, run with ``python -m app.rescore_perspectives``
+        after the keyword list changes (stale verdicts are rescanned on read
+        meanwhile); the stale filter is served by the ``safety.version``
+        index. Each update is conditional on the verdict still being stale,
+        so overlapping runs do not rewrite documents twice. Returns the
+        number of documents updated.
+        """
+        version = self.version
+        stale = {"safety.version": {"$ne": version}}
+        updated = 0
+        while True:
+            docs = await db.perspectives.find(
+                stale, {"content": 1}
+            ).limit(batch_size).to_list(length=batch_size)
+
+            if not docs:
+                break
+
+            for doc in docs:
+                verdict = self.scan_perspective(doc.get("content", ""))
+                result = await db.perspectives.update_one(
+                    {"_id": doc["_id"], **stale},
+                    {"$set": {"safety": verdict.model_dump()}}
+                )
+                updated += result.modified_count
+
+            if len(docs) < batch_size:
+                break
+
+        if updated:
+            logger.info(f"Re-scored safety verdicts on {updated} perspectives (scanner {version})")
+        return updated
     
     def should_block_mediation(self, safety_check: Dict) -> bool:
         """Determine if mediation should be blocked."""
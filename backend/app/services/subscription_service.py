@@ -2,11 +2,12 @@
 
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Union
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.models.couple_summary import SummarySubscription
 from app.models.subscription import (
     SubscriptionInDB,
     SubscriptionStatus,
@@ -49,6 +50,9 @@ class SubscriptionService:
         result = await db.subscriptions.insert_one(subscription.to_mongo())
         subscription.id = str(result.inserted_id)
         
+        from app.services.couple_summary_service import couple_summary_service
+        await couple_summary_service.subscription_changed(subscription, db)
+        
         logger.info(f"Created free trial subscription for couple {couple_id}")
         return subscription
     
@@ -69,7 +73,7 @@ class SubscriptionService:
         updates: dict,
         db: AsyncIOMotorDatabase
     ) -> SubscriptionInDB:
-        """Update subscription."""
+        """Update subscription (and the couple's summary)."""
         updates["updated_at"] = datetime.utcnow()
         await db.subscriptions.update_one(
             {"_id": ObjectId(subscription_id)},
@@ -77,7 +81,11 @@ class SubscriptionService:
         )
         
         updated_doc = await db.subscriptions.find_one({"_id": ObjectId(subscription_id)})
-        return SubscriptionInDB.from_mongo(updated_doc)
+        subscription = SubscriptionInDB.from_mongo(updated_doc)
+        
+        from app.services.couple_summary_service import couple_summary_service
+        await couple_summary_service.subscription_changed(subscription, db)
+        return subscription
     
     @staticmethod
     def is_trial_active(subscription: SubscriptionInDB) -> bool:
@@ -98,7 +106,7 @@ class SubscriptionService:
         return False
     
     @staticmethod
-    def get_argument_limit(subscription: SubscriptionInDB) -> int:
+    def get_argument_limit(subscription: Union[SubscriptionInDB, SummarySubscription]) -> int:
         """Get argument limit for subscription tier."""
         if subscription.status == SubscriptionStatus.TRIAL:
             return UsageLimit.FREE_TRIAL_ARGS
@@ -2,11 +2,12 @@
 
 import logging
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import Optional, Union
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.models.couple_summary import SummarySubscription
 from app.models.subscription import SubscriptionInDB
 from app.models.usage import UsageInDB, UsageType
 
@@ -17,7 +18,7 @@ class UsageService:
     """Service for tracking and checking usage limits."""
     
     @staticmethod
-    def get_period_dates(subscription: SubscriptionInDB) -> tuple:
+    def get_period_dates(subscription: Union[SubscriptionInDB, SummarySubscription]) -> tuple:
         """Get current period start and end dates."""
         if subscription.current_period_start:
             period_start = subscription.current_period_start.date()
@@ -37,10 +38,10 @@ class UsageService:
         couple_id: str,
         usage_type: UsageType,
         argument_id: Optional[str] = None,
-        subscription: Optional[SubscriptionInDB] = None,
+        subscription: Optional[Union[SubscriptionInDB, SummarySubscription]] = None,
         db: AsyncIOMotorDatabase = None
     ) -> UsageInDB:
-        """Track usage for a couple."""
+        """Track usage for a couple (and count it in the couple's summary)."""
         if not subscription:
             from app.services.subscription_service import subscription_service
             subscription = await subscription_service.get_subscription(couple_id, db)
@@ -50,6 +51,8 @@ class UsageService:
         
         period_start, period_end = UsageService.get_period_dates(subscription)
         
+        from app.services.couple_summary_service import couple_summary_service
+        
         # Check if usage entry exists for this period
         usage_doc = await db.usages.find_one({
             "couple_id": ObjectId(couple_id),
@@ -65,6 +68,7 @@ class UsageService:
                 {"_id": usage_doc["_id"]},
                 {"$inc": {"count": 1}}
             )
+            await couple_summary_service.usage_tracked(couple_id, usage_type, period_start, period_end, db)
             updated_doc = await db.usages.find_one({"_id": usage_doc["_id"]})
             return UsageInDB.from_mongo(updated_doc)
         else:
@@ -79,6 +83,7 @@ class UsageService:
             )
             result = await db.usages.insert_one(usage.to_mongo())
             usage.id = str(result.inserted_id)
+            await couple_summary_service.usage_tracked(couple_id, usage_type, period_start, period_end, db)
             return usage
     
     @staticmethod
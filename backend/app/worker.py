@@ -0,0 +1,141 @@
+"""Background job worker.
+
+Runs embedded in the API process (JOB_WORKER_EMBEDDED) or standalone:
+
+    python -m app.worker
+
+The standalone process imports only the database layer and services, never
+the FastAPI app, so AI work can be scaled independently of HTTP workers.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+from typing import Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+import app.core.logging_config  # noqa: F401  (configures logging)
+from app.config import settings
+from app.core.http_client import http_client
+from app.db.database import close_mongo_connection, connect_to_mongo, get_database
+from app.models.job import JobInDB, JobType
+from app.services.job_handlers import JOB_HANDLERS, JobHandler
+from app.services.job_queue import PermanentJobError, job_queue_service
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Claims jobs under a lease and runs them with bounded concurrency."""
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        concurrency: int = settings.JOB_WORKER_CONCURRENCY,
+        poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+        handlers: Optional[Dict[JobType, JobHandler]] = None,
+        worker_id: Optional[str] = None
+    ):
+        self.db = db
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.handlers = handlers if handlers is not None else JOB_HANDLERS
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stopping = asyncio.Event()
+        self.succeeded = 0
+        self.failed = 0
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Poll for work until stop() is called."""
+        logger.info(f"Job worker {self.worker_id} started (concurrency={self.concurrency})")
+        await asyncio.gather(*(self._slot() for _ in range(self.concurrency)))
+        logger.info(f"Job worker {self.worker_id} stopped")
+
+    async def _slot(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                logger.error(f"Job worker loop error: {e}", exc_info=True)
+                processed = False
+            if not processed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run_once(self) -> bool:
+        """Claim and execute a single job. Returns False when nothing was runnable."""
+        job = await job_queue_service.claim(self.worker_id, self.db, self.handlers.keys())
+        if job is None:
+            return False
+        await self._execute(job)
+        return True
+
+    async def _heartbeat(self, job: JobInDB) -> None:
+        interval = max(job_queue_service.lease_seconds / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            if not await job_queue_service.extend_lease(job, self.worker_id, self.db):
+                logger.warning(f"Lost lease on job {job.id}")
+                return
+
+    async def _execute(self, job: JobInDB) -> None:
+        if job.attempts > job.max_attempts:
+            # Only reachable when every lease expired (worker crashes mid-job)
+            await job_queue_service.fail(
+                job, self.worker_id, "Lease expired on every attempt", self.db, permanent=True
+            )
+            self.failed += 1
+            return
+
+        handler = self.handlers.get(job.type)
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            result = await handler(job, self.db)
+        except PermanentJobError as e:
+            await job_queue_service.fail(job, self.worker_id, str(e), self.db, permanent=True)
+            self.failed += 1
+        except Exception as e:
+            await job_queue_service.fail(job, self.worker_id, f"{type(e).__name__}: {e}", self.db)
+            self.failed += 1
+        else:
+            await job_queue_service.complete(job, self.worker_id, result, self.db)
+            self.succeeded += 1
+        finally:
+            heartbeat.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "concurrency": self.concurrency,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+
+async def _main() -> None:
+    await connect_to_mongo()
+    await http_client.start()
+    worker = JobWorker(get_database())
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await http_client.aclose()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
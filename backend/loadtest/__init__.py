@@ -0,0 +1 @@
+"""Load tests and micro-benchmarks (not shipped with the app)."""
@@ -0,0 +1,270 @@
+"""End-to-end load benchmark for the /api/ai/* endpoints.
+
+Seeds one couple (two users, an argument and both perspectives) per
+request straight into MongoDB, mints access tokens for them, then drives
+a running backend at a fixed concurrency and reports latency percentiles
+and throughput. Each request gets its own user so the per-user rate
+limits don't cap the run. Seeded documents are removed afterwards.
+
+Start the fake model server and a single backend worker, then run::
+
+    python -m loadtest.fake_openai --port 8100 --latency-ms 800
+    OPENAI_BASE_URL=http://localhost:8100/v1 uvicorn app.main:app --port 8000
+    python -m loadtest.bench_ai --scenario mediate --requests 400 --concurrency 1,10,25,50,100
+
+The backend and this script must share MONGODB_URL/MONGODB_DB_NAME and
+SECRET_KEY (both read .env).
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from app.config import settings
+from app.core.security import create_access_token
+from app.models.argument import (
+    ArgumentCategory,
+    ArgumentInDB,
+    ArgumentPriority,
+    ArgumentStatus,
+)
+from app.models.couple import CoupleInDB
+from app.models.perspective import PerspectiveInDB
+from app.models.user import UserInDB
+
+# scenario -> (method, path template, streamed response)
+SCENARIOS: Dict[str, tuple] = {
+    "mediate": ("POST", "/api/ai/arguments/{argument_id}/analyze", False),
+    "mediate_stream": ("POST", "/api/ai/arguments/{argument_id}/analyze/stream", True),
+    "goals": ("POST", "/api/ai/arguments/{argument_id}/generate-goals", False),
+    "checkins": ("POST", "/api/ai/arguments/{argument_id}/generate-checkins", False),
+}
+
+PERSPECTIVES = (
+    "I feel like I do most of the chores and it leaves me exhausted by the weekend.",
+    "I help when I can, but my work hours changed and I feel criticised for it.",
+)
+
+
+@dataclass
+class BenchRequest:
+    method: str
+    path: str
+    headers: Dict[str, str]
+
+
+@dataclass
+class SeededData:
+    requests: List[BenchRequest] = field(default_factory=list)
+    ids: Dict[str, List[ObjectId]] = field(default_factory=dict)
+
+
+@dataclass
+class BenchResult:
+    concurrency: int
+    duration_s: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list)
+    first_byte_ms: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+
+    def summary(self) -> Dict:
+        ok = sum(n for code, n in self.statuses.items() if isinstance(code, int) and code < 400)
+        latencies = sorted(self.latencies_ms)
+        row = {
+            "concurrency": self.concurrency,
+            "requests": len(latencies),
+            "ok": ok,
+            "throughput_rps": round(len(latencies) / self.duration_s, 2) if self.duration_s else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items(), key=str)},
+        }
+        if self.first_byte_ms:
+            row["ttfb_p50_ms"] = round(percentile(sorted(self.first_byte_ms), 50), 1)
+            row["ttfb_p95_ms"] = round(percentile(sorted(self.first_byte_ms), 95), 1)
+        return row
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+async def seed(db: AsyncIOMotorDatabase, scenario: str, count: int) -> SeededData:
+    """Insert one couple + argument with both perspectives per request."""
+    method, template, _ = SCENARIOS[scenario]
+    run = uuid.uuid4().hex[:8]
+    users, couples, arguments, perspectives = [], [], [], []
+    data = SeededData()
+
+    for i in range(count):
+        pair = [
+            UserInDB(
+                id=str(ObjectId()),
+                email=f"bench-{run}-{i}-{side}@example.com",
+                password_hash="!",  # no usable password; auth is by minted token
+                name=f"Bench {side.upper()}",
+                age=30,
+            )
+            for side in ("a", "b")
+        ]
+        couple = CoupleInDB(id=str(ObjectId()), user1_id=pair[0].id, user2_id=pair[1].id)
+        argument = ArgumentInDB(
+            id=str(ObjectId()),
+            couple_id=couple.id,
+            title="Household chores",
+            category=ArgumentCategory.LIFESTYLE,
+            priority=ArgumentPriority.HIGH,
+            status=ArgumentStatus.ACTIVE,
+        )
+        users.extend(u.to_mongo() for u in pair)
+        couples.append(couple.to_mongo())
+        arguments.append(argument.to_mongo())
+        perspectives.extend(
+            PerspectiveInDB(argument_id=argument.id, user_id=user.id, content=content).to_mongo()
+            for user, content in zip(pair, PERSPECTIVES, strict=False)
+        )
+
+        token = create_access_token({"sub": pair[0].id})
+        data.requests.append(BenchRequest(
+            method=method,
+            path=template.format(argument_id=argument.id),
+            headers={"Authorization": f"Bearer {token}"},
+        ))
+
+    for collection, docs in (
+        ("users", users), ("couples", couples), ("arguments", arguments), ("perspectives", perspectives)
+    ):
+        result = await db[collection].insert_many(docs)
+        data.ids[collection] = list(result.inserted_ids)
+    return data
+
+
+async def cleanup(db: AsyncIOMotorDatabase, data: SeededData) -> None:
+    argument_ids = data.ids.get("arguments", [])
+    couple_ids = data.ids.get("couples", [])
+    await db.ai_insights.delete_many({"argument_id": {"$in": argument_ids}})
+    await db.jobs.delete_many({"couple_id": {"$in": couple_ids}})
+    await db.llm_usage_daily.delete_many({"couple_id": {"$in": couple_ids}})
+    for collection, ids in data.ids.items():
+        if ids:
+            await db[collection].delete_many({"_id": {"$in": ids}})
+
+
+async def run_benchmark(
+    client: httpx.AsyncClient,
+    requests: List[BenchRequest],
+    concurrency: int,
+    stream: bool = False
+) -> BenchResult:
+    """Send ``requests`` with at most ``concurrency`` in flight (closed loop)."""
+    result = BenchResult(concurrency=concurrency)
+    queue: asyncio.Queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    async def send(request: BenchRequest) -> None:
+        started = time.perf_counter()
+        try:
+            async with client.stream(request.method, request.path, headers=request.headers) as resp:
+                first_byte = None
+                async for _ in resp.aiter_bytes():
+                    if first_byte is None:
+                        first_byte = time.perf_counter()
+                result.statuses[resp.status_code] += 1
+                if stream and first_byte is not None:
+                    result.first_byte_ms.append((first_byte - started) * 1000)
+        except httpx.HTTPError as e:
+            result.statuses[type(e).__name__] += 1
+        result.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    async def worker() -> None:
+        while True:
+            try:
+                request = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await send(request)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration_s = time.perf_counter() - started
+    return result
+
+
+def format_report(scenario: str, rows: List[Dict]) -> str:
+    columns = ["concurrency", "requests", "ok", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    if any("ttfb_p50_ms" in row for row in rows):
+        columns += ["ttfb_p50_ms", "ttfb_p95_ms"]
+    lines = [f"scenario: {scenario}", "  ".join(f"{c:>14}" for c in columns)]
+    for row in rows:
+        lines.append("  ".join(f"{row.get(c, ''):>14}" for c in columns))
+        failures = {code: n for code, n in row["statuses"].items() if not (code.isdigit() and int(code) < 400)}
+        if failures:
+            lines.append(f"{'':>14}  failures: {failures}")
+    return "\n".join(lines)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    _, _, stream = SCENARIOS[args.scenario]
+    mongo = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = mongo[settings.MONGODB_DB_NAME]
+    rows = []
+    try:
+        async with httpx.AsyncClient(
+            base_url=args.base_url,
+            timeout=httpx.Timeout(args.timeout),
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        ) as client:
+            for concurrency in args.concurrency:
+                data = await seed(db, args.scenario, args.requests)
+                try:
+                    result = await run_benchmark(client, data.requests, concurrency, stream=stream)
+                finally:
+                    if not args.keep:
+                        await cleanup(db, data)
+                rows.append(result.summary())
+    finally:
+        mongo.close()
+
+    if args.json:
+        print(json.dumps({"scenario": args.scenario, "results": rows}, indent=2))
+    else:
+        print(format_report(args.scenario, rows))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mediate")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[10],
+        help="Comma-separated levels to sweep, e.g. 1,10,50",
+    )
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--keep", action="store_true", help="Keep seeded documents")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Micro-benchmark: MongoCodec decode/encode vs. validating every read.
+
+The previous ``from_mongo`` methods copied the document, turned its
+ObjectIds into strings and ran full Pydantic validation (``Model(**data)``);
+``legacy_from_mongo`` below does the same. The old ``to_mongo`` called
+``model_dump()`` before converting ids and dates back, so ``model_dump`` is a
+lower bound for it.
+
+    python -m loadtest.bench_codec --number 5000
+"""
+
+import argparse
+import timeit
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from bson import ObjectId
+
+from app.models.argument import ArgumentInDB
+from app.models.couple import CoupleInDB
+from app.models.job import JobInDB
+from app.models.perspective import PerspectiveInDB, SafetyVerdict
+from app.models.relationship_checkin import RelationshipCheckInInDB
+from app.models.relationship_goal import GoalProgress, RelationshipGoalInDB
+from app.models.usage import UsageInDB
+from app.models.user import UserInDB
+
+USER_A = "507f1f77bcf86cd799439011"
+USER_B = "507f1f77bcf86cd799439012"
+COUPLE = "507f1f77bcf86cd799439013"
+ARGUMENT = "507f1f77bcf86cd799439014"
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+def legacy_from_mongo(model: type, document: Dict[str, Any]):
+    data = {}
+    for key, value in document.items():
+        if isinstance(value, ObjectId):
+            value = str(value)
+        elif isinstance(value, list) and value and isinstance(value[0], ObjectId):
+            value = [str(item) for item in value]
+        data[key] = value
+    return model(**data)
+
+
+def _stored(instance) -> Tuple[type, Dict[str, Any]]:
+    """Document as read back from MongoDB (with an _id)."""
+    document = instance.to_mongo()
+    document["_id"] = ObjectId()
+    return type(instance), document
+
+
+def documents() -> List[Tuple[str, type, Dict[str, Any]]]:
+    progress = [
+        GoalProgress(user_id=USER_A, date=date(2024, 5, day), notes="Walked together", progress_value=day / 10,
+                     reactions=[{"user_id": USER_B, "emoji": "❤️"}])
+        for day in range(1, 6)
+    ]
+    instances = [
+        ("argument", ArgumentInDB(couple_id=COUPLE, title="Chores", category="lifestyle", priority="medium")),
+        ("goal (5 progress)", RelationshipGoalInDB(couple_id=COUPLE, title="Weekly walk", created_by_user_id=USER_A,
+                                                   target_date=date(2024, 12, 1), progress=progress,
+                                                   progress_updates=5)),
+        ("usage", UsageInDB(couple_id=COUPLE, usage_type="argument_resolution", argument_id=ARGUMENT,
+                            period_start=NOW.date(), period_end=(NOW + timedelta(days=30)).date())),
+        ("couple", CoupleInDB(user1_id=USER_A, user2_id=USER_B, relationship_start_date=date(2020, 2, 14))),
+        ("checkin", RelationshipCheckInInDB(couple_id=COUPLE, week_start_date=NOW.date(), completed_by=[USER_A, USER_B])),
+        ("perspective", PerspectiveInDB(argument_id=ARGUMENT, user_id=USER_A, content="I feel unheard. " * 40,
+                                        safety=SafetyVerdict(version="abc", concern_types=[]))),
+        ("job", JobInDB(type="mediate_argument", user_id=USER_A, couple_id=COUPLE, payload={"argument_id": ARGUMENT})),
+        ("user", UserInDB(email="a@example.com", password_hash="x" * 60, name="A", age=30)),
+    ]
+    return [(name, *_stored(instance)) for name, instance in instances]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=5000, help="Calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    def best(func) -> float:
+        return min(timeit.repeat(func, number=args.number, repeat=args.repeat)) * 1e6 / args.number
+
+    print(f"{'model':>18}  {'validated us':>12}  {'decode us':>9}  speedup  {'model_dump us':>13}  {'encode us':>9}")
+    for name, model, document in documents():
+        decoded = model.from_mongo(document)
+        assert decoded == legacy_from_mongo(model, document)
+
+        validated = best(lambda m=model, d=document: legacy_from_mongo(m, d))
+        decode = best(lambda m=model, d=document: m.from_mongo(d))
+        dumped = best(decoded.model_dump)
+        encode = best(decoded.to_mongo)
+        print(f"{name:>18}  {validated:12.2f}  {decode:9.2f}  {validated / decode:6.1f}x  {dumped:13.2f}  {encode:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
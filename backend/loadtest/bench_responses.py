@@ -0,0 +1,104 @@
+"""Micro-benchmark: rendering a page of goals, old path vs. the fast path.
+
+The old ``get_goals`` decoded every document into a model, copied it into a
+``GoalResponse``, then FastAPI validated the list against ``response_model``
+again, dumped it to JSON-compatible data and rendered it with ``json.dumps``.
+``legacy_render`` below does the same work. The fast path shapes the stored
+documents directly (``goal_response``) and renders them with orjson.
+
+    python -m loadtest.bench_responses --goals 20 --number 500
+"""
+
+import argparse
+import json
+import timeit
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from app.api.goals import goal_response
+from app.api.schemas import GoalResponse
+from app.core.responses import dumps
+from app.models.relationship_goal import GoalProgress, RelationshipGoalInDB
+
+USER_A = "507f1f77bcf86cd799439011"
+COUPLE = "507f1f77bcf86cd799439013"
+
+_goals_adapter = TypeAdapter(List[GoalResponse])
+
+
+def stored_goals(count: int, progress: int = 5) -> List[Dict[str, Any]]:
+    goals = []
+    for i in range(count):
+        goal = RelationshipGoalInDB(
+            couple_id=COUPLE, title=f"Goal {i}", description="Spend more time together",
+            created_by_user_id=USER_A, target_date=date(2024, 12, 1), progress_updates=progress,
+            progress=[
+                GoalProgress(user_id=USER_A, date=date(2024, 5, day + 1), notes="Walked", progress_value=0.1,
+                             reactions=[{"user_id": USER_A, "emoji": "❤️"}])
+                for day in range(progress)
+            ],
+            completed_at=datetime(2024, 6, 1, 12, 0, 0, 123000),
+        )
+        goals.append({**goal.to_mongo(), "_id": ObjectId()})
+    return goals
+
+
+def legacy_render(docs: List[Dict[str, Any]]) -> bytes:
+    responses = []
+    for doc in docs:
+        goal = RelationshipGoalInDB.from_mongo(doc)
+        responses.append(GoalResponse(
+            id=goal.id,
+            couple_id=goal.couple_id,
+            title=goal.title,
+            description=goal.description,
+            status=goal.status.value,
+            target_date=goal.target_date.isoformat() if goal.target_date else None,
+            progress=[{
+                "id": p.id if hasattr(p, 'id') else None,
+                "user_id": p.user_id if hasattr(p, 'user_id') else None,
+                "date": p.date.isoformat(),
+                "notes": p.notes,
+                "progress_value": p.progress_value,
+                "reactions": p.reactions if hasattr(p, 'reactions') else []
+            } for p in goal.progress],
+            created_by_user_id=goal.created_by_user_id,
+            progress_updates=goal.progress_updates,
+            created_at=goal.created_at,
+            updated_at=goal.updated_at,
+            completed_at=goal.completed_at
+        ))
+    # response_model handling, then JSONResponse.render
+    content = _goals_adapter.dump_python(_goals_adapter.validate_python(responses), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def fast_render(docs: List[Dict[str, Any]]) -> bytes:
+    return dumps([goal_response(doc) for doc in docs])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--goals", type=int, default=20, help="Goals per page")
+    parser.add_argument("--progress", type=int, default=5, help="Progress entries per goal")
+    parser.add_argument("--number", type=int, default=500, help="Pages per timing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = stored_goals(args.goals, args.progress)
+    assert json.loads(legacy_render(docs)) == json.loads(fast_render(docs))
+
+    timings = [
+        min(timeit.repeat(lambda f=f: f(docs), number=args.number, repeat=args.repeat)) * 1e6 / args.number
+        for f in (legacy_render, fast_render)
+    ]
+    print(f"{args.goals} goals x {args.progress} progress entries")
+    print(f"  legacy: {timings[0]:9.1f} us/page")
+    print(f"  fast:   {timings[1]:9.1f} us/page  ({timings[0] / timings[1]:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Micro-benchmark: single-pass safety scan vs. the per-keyword regex loop.
+
+The legacy implementation below is the loop ``SafetyService`` used before
+``KeywordScanner``: one ``re.search`` per keyword (served from ``re``'s
+pattern cache) plus one per abuse pattern, over both perspectives joined.
+
+    python -m loadtest.bench_safety --texts 2000 --length 1500
+"""
+
+import argparse
+import random
+import re
+import timeit
+from typing import List
+
+from app.services.safety_service import SafetyService
+
+FILLER = (
+    "we keep arguing about chores and money and i feel like nobody listens when i say "
+    "that the weekends are the only time we have together and then plans change again"
+).split()
+
+
+def legacy_concern_types(text: str) -> List[str]:
+    concern_types = []
+    all_text = text.lower()
+    for concern_type, keywords in SafetyService.CRISIS_KEYWORDS.items():
+        for keyword in keywords:
+            if re.search(r'\b' + re.escape(keyword.lower()) + r'\b', all_text):
+                if concern_type not in concern_types:
+                    concern_types.append(concern_type)
+                break
+    for pattern in SafetyService.ABUSE_PATTERNS:
+        if re.search(pattern, all_text, re.IGNORECASE):
+            if 'abuse' not in concern_types:
+                concern_types.append('abuse')
+            break
+    return concern_types
+
+
+def make_corpus(count: int, length: int, hit_ratio: float, seed: int = 0) -> List[str]:
+    """Perspective-like texts; ``hit_ratio`` of them contain one concern term."""
+    rng = random.Random(seed)
+    terms = [t for ts in SafetyService.CRISIS_KEYWORDS.values() for t in ts] + ["you're crazy"]
+    corpus = []
+    for _ in range(count):
+        words = []
+        while sum(len(w) + 1 for w in words) < length:
+            words.append(rng.choice(FILLER))
+        if rng.random() < hit_ratio:
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--length", type=int, default=1500, help="Characters per text")
+    parser.add_argument("--hit-ratio", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.texts, args.length, args.hit_ratio)
+    scanner = SafetyService.scanner
+
+    mismatches = sum(legacy_concern_types(t) != scanner.labels_in(t) for t in corpus)
+    if mismatches:
+        # Only ordering can differ: the loop appends pattern-only 'abuse' last
+        mismatches = sum(set(legacy_concern_types(t)) != set(scanner.labels_in(t)) for t in corpus)
+    print(f"{args.texts} texts x {args.length} chars, {args.hit_ratio:.0%} with a concern; mismatches: {mismatches}")
+
+    legacy = min(timeit.repeat(lambda: [legacy_concern_types(t) for t in corpus], number=1, repeat=args.repeat))
+    single = min(timeit.repeat(lambda: [scanner.scan(t) for t in corpus], number=1, repeat=args.repeat))
+    batch = min(timeit.repeat(lambda: scanner.scan_many(corpus), number=1, repeat=args.repeat))
+
+    for name, seconds in (("per-keyword loop", legacy), ("scanner.scan", single), ("scanner.scan_many", batch)):
+        print(f"{name:>18}: {seconds * 1e6 / len(corpus):8.1f} us/text  ({legacy / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Micro-benchmark: sanitize_text vs. its previous implementation.
+
+``legacy_sanitize_text`` below is the version that counted '$', '{' and '('
+with three str.count calls and ran six uncompiled re.search calls over a
+lowercased copy of every input.
+
+    python -m loadtest.bench_sanitize --number 5000
+"""
+
+import argparse
+import re
+import timeit
+from typing import Optional
+
+from app.core.sanitization import sanitize_text
+
+PERSPECTIVE = (
+    "I feel like I do most of the chores (cooking, laundry, the school run) and when I "
+    "bring it up we end up arguing about whose job is harder. Last week I said: \"can we "
+    "split the weekends?\" and it turned into a fight about money instead. "
+)
+
+# (name, text) at the sizes the API accepts: titles, typical and maximum perspectives
+PAYLOADS = [
+    ("title (60)", "Household chores: who does what on weekends"[:60]),
+    ("perspective (1000)", (PERSPECTIVE * 10)[:1000]),
+    ("perspective (5000)", (PERSPECTIVE.replace("(", "").replace(")", "") * 30)[:5000]),
+    ("with '=' (1000)", ("a = b, " + PERSPECTIVE * 10)[:1000]),
+]
+
+
+def legacy_sanitize_text(text: str, max_length: Optional[int] = None) -> str:
+    if not isinstance(text, str):
+        raise ValueError("Input must be a string")
+    text = text.replace('\x00', '')
+    dollar_count = text.count('$')
+    brace_count = text.count('{')
+    paren_count = text.count('(')
+    if dollar_count > 5:
+        raise ValueError("Content contains suspicious patterns (too many '$' characters)")
+    if brace_count > 10:
+        raise ValueError("Content contains suspicious patterns (too many '{' characters)")
+    if paren_count > 20:
+        raise ValueError("Content contains suspicious patterns (too many '(' characters)")
+    dangerous_patterns = [
+        r'\$where', r'\$regex', r'\$code', r'\$eval', r'javascript:', r'on\w+\s*=',
+    ]
+    text_lower = text.lower()
+    for pattern in dangerous_patterns:
+        if re.search(pattern, text_lower):
+            raise ValueError(f"Content contains potentially dangerous pattern: {pattern}")
+    text = text.strip()
+    if max_length and len(text) > max_length:
+        raise ValueError(f"Content exceeds maximum length of {max_length} characters")
+    return text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=5000, help="Calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'payload':>20}  {'legacy us':>10}  {'current us':>10}  speedup")
+    for name, text in PAYLOADS:
+        assert legacy_sanitize_text(text, 5000) == sanitize_text(text, 5000)
+        timings = [
+            min(timeit.repeat(lambda f=f, text=text: f(text, 5000), number=args.number, repeat=args.repeat))
+            * 1e6 / args.number
+            for f in (legacy_sanitize_text, sanitize_text)
+        ]
+        print(f"{name:>20}  {timings[0]:10.2f}  {timings[1]:10.2f}  {timings[0] / timings[1]:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
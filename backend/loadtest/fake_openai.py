@@ -0,0 +1,271 @@
+"""Local stand-in for the OpenAI chat-completions API.
+
+Answers ``POST /v1/chat/completions`` with deterministic, well-formed
+output for each Heka prompt (mediation, goal suggestions, check-in
+questions, harmony report), so the AI endpoints can be load-tested
+without calling OpenAI. Latency, streaming pace, 429s and malformed
+output are configurable at startup or at runtime via ``PUT /_config``.
+
+Run it and point the backend at it::
+
+    python -m loadtest.fake_openai --port 8100 --latency-ms 800
+    OPENAI_BASE_URL=http://localhost:8100/v1 uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class FakeOpenAIConfig:
+    """Behaviour knobs for the fake server."""
+
+    latency_ms: float = 800.0  # time to first byte (whole response when not streaming)
+    latency_jitter_ms: float = 200.0  # uniform +/- spread around latency_ms
+    stream_chunk_ms: float = 15.0  # delay between streamed chunks
+    stream_chunk_chars: int = 24  # content characters per streamed chunk
+    rate_limit_ratio: float = 0.0  # fraction of requests answered with 429
+    retry_after_seconds: int = 1
+    malformed_ratio: float = 0.0  # fraction of responses with truncated, unparseable content
+    cached_prompt_ratio: float = 0.0  # share of prompt tokens reported as cached
+    seed: int = 0
+
+
+# Prompt kinds, detected from the system prompt
+MEDIATION = "mediation"
+GOALS = "goals"
+CHECKINS = "checkins"
+HARMONY = "harmony"
+UNKNOWN = "unknown"
+
+
+def classify_prompt(messages: List[Dict[str, Any]]) -> str:
+    """Tell which Heka prompt a request carries from its system message."""
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    if '"common_ground"' in system:
+        return MEDIATION
+    if '"goals"' in system:
+        return GOALS
+    if '"questions"' in system:
+        return CHECKINS
+    if "Harmony Report" in system:
+        return HARMONY
+    return UNKNOWN
+
+
+def render_content(kind: str, digest: str) -> str:
+    """Deterministic response content for a prompt kind; ``digest`` varies the wording."""
+    tag = digest[:8]
+    if kind == MEDIATION:
+        return json.dumps({
+            "summary": f"Both partners want to feel supported ({tag}). The disagreement is about how, not whether.",
+            "common_ground": ["You both value fairness", "You both want less tension at home"],
+            "disagreements": ["How chores are divided", "When to talk about it"],
+            "root_causes": ["Feeling unappreciated", "Different stress responses"],
+            "suggestions": [
+                {
+                    "title": "Weekly planning check-in",
+                    "description": "Agree the week's tasks together so expectations are explicit.",
+                    "actionable_steps": ["Pick a fixed time", "List the tasks", "Swap one task each week"],
+                },
+                {
+                    "title": "Soft start-up",
+                    "description": "Open hard conversations with an observation and a feeling.",
+                    "actionable_steps": ["Use 'I notice...'", "Name one feeling", "Make one request"],
+                },
+                {
+                    "title": "Repair attempts",
+                    "description": "Pause and reconnect when a discussion escalates.",
+                    "actionable_steps": ["Agree a pause word", "Take 20 minutes", "Come back to it"],
+                },
+            ],
+            "communication_tips": ["Describe, don't evaluate", "Reflect back before replying", "Ask for one change"],
+        })
+    if kind == GOALS:
+        return json.dumps({"goals": [
+            {"title": "Practice Active Listening", "description": f"Reflect back before replying ({tag}).",
+             "category": "Communication"},
+            {"title": "Weekly Appreciation", "description": "Share one thing you appreciated each week.",
+             "category": "Connection"},
+            {"title": "Shared Chore Plan", "description": "Plan household tasks together every Sunday.",
+             "category": "Lifestyle"},
+        ]})
+    if kind == CHECKINS:
+        return json.dumps({"questions": [
+            {"question": f"When did you feel most connected this week? ({tag})", "category": "Emotional Connection"},
+            {"question": "What is one thing I did that helped you feel supported?", "category": "Gratitude"},
+            {"question": "Is there anything you'd like us to try differently next week?", "category": "Growth"},
+        ]})
+    if kind == HARMONY:
+        return (
+            f"**This week ({tag})** you both named rest as a priority, and you differ on how to plan it.\n\n"
+            "**Micro-exercise:** spend ten minutes on Sunday choosing one evening that is just for the two of you."
+        )
+    return json.dumps({"message": f"fake response {tag}"})
+
+
+def approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeOpenAI:
+    """State and behaviour behind the fake server's routes."""
+
+    def __init__(self, config: Optional[FakeOpenAIConfig] = None):
+        self.config = config or FakeOpenAIConfig()
+        self.rng = random.Random(self.config.seed)
+        self.stats: Counter = Counter()
+
+    def reconfigure(self, changes: Dict[str, Any]) -> None:
+        known = {f.name for f in fields(FakeOpenAIConfig)}
+        for name, value in changes.items():
+            if name in known:
+                setattr(self.config, name, type(getattr(self.config, name))(value))
+        if "seed" in changes:
+            self.rng = random.Random(self.config.seed)
+
+    def _latency_seconds(self) -> float:
+        spread = self.rng.uniform(-self.config.latency_jitter_ms, self.config.latency_jitter_ms)
+        return max(self.config.latency_ms + spread, 0.0) / 1000
+
+    def _usage(self, messages: List[Dict[str, Any]], content: str) -> Dict[str, Any]:
+        prompt_tokens = sum(approx_tokens(m.get("content", "")) for m in messages)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": approx_tokens(content),
+            "total_tokens": prompt_tokens + approx_tokens(content),
+            "prompt_tokens_details": {"cached_tokens": int(prompt_tokens * self.config.cached_prompt_ratio)},
+        }
+
+    async def chat_completions(self, request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        model = body.get("model", "gpt-4o-mini")
+        kind = classify_prompt(messages)
+        self.stats[f"requests.{kind}"] += 1
+
+        if self.rng.random() < self.config.rate_limit_ratio:
+            self.stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"Retry-After": str(self.config.retry_after_seconds)},
+                content={"error": {
+                    "message": "Rate limit reached (fake)",
+                    "type": "requests",
+                    "code": "rate_limit_exceeded",
+                }},
+            )
+
+        digest = hashlib.sha256(json.dumps(messages, sort_keys=True).encode()).hexdigest()
+        content = render_content(kind, digest)
+        if self.rng.random() < self.config.malformed_ratio:
+            self.stats["malformed"] += 1
+            content = content[: len(content) // 2]
+        usage = self._usage(messages, content)
+        completion_id = f"chatcmpl-fake-{digest[:16]}"
+        latency = self._latency_seconds()
+
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            return StreamingResponse(
+                self._stream(completion_id, model, content, usage if include_usage else None, latency),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(latency)
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    async def _stream(
+        self,
+        completion_id: str,
+        model: str,
+        content: str,
+        usage: Optional[Dict[str, Any]],
+        latency: float
+    ):
+        def chunk(choices: List[Dict[str, Any]], **extra) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(data)}\n\n"
+
+        await asyncio.sleep(latency)
+        step = max(self.config.stream_chunk_chars, 1)
+        for start in range(0, len(content), step):
+            if start:
+                await asyncio.sleep(self.config.stream_chunk_ms / 1000)
+            yield chunk([{"index": 0, "delta": {"content": content[start:start + step]}, "finish_reason": None}])
+        yield chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if usage is not None:
+            yield chunk([], usage=usage)
+        yield "data: [DONE]\n\n"
+
+
+def create_app(config: Optional[FakeOpenAIConfig] = None) -> FastAPI:
+    """Build the fake chat-completions app."""
+    fake = FakeOpenAI(config)
+    app = FastAPI(title="Fake OpenAI")
+    app.state.fake = fake
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        return await fake.chat_completions(request)
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model"}]}
+
+    @app.get("/_stats")
+    async def stats():
+        return {"config": asdict(fake.config), "counters": dict(fake.stats)}
+
+    @app.put("/_config")
+    async def update_config(request: Request):
+        fake.reconfigure(await request.json())
+        return asdict(fake.config)
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    for f in fields(FakeOpenAIConfig):
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=type(f.default), default=f.default)
+    args = parser.parse_args()
+
+    config = FakeOpenAIConfig(**{f.name: getattr(args, f.name) for f in fields(FakeOpenAIConfig)})
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
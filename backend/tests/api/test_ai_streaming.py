@@ -0,0 +1,177 @@
+"""Tests for the analysis endpoints (inline and SSE streaming)."""
+
+import json
+
+import httpx
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.api.dependencies import get_current_user
+from app.core.http_client import SharedHTTPClient
+from app.core.json_stream import IncrementalJSONObjectParser
+from app.db.database import get_database
+from app.main import app
+from app.models.couple import CoupleInDB
+from app.models.user import UserInDB
+from app.services.ai_service import ai_service
+from app.services.llm_router import LLMRouter, OpenAICompatibleProvider
+
+USER_ID = "507f1f77bcf86cd799439011"
+PARTNER_ID = "507f1f77bcf86cd799439012"
+
+ANALYSIS = {
+    "summary": "You both want to feel heard, {even} when \"busy\".",
+    "common_ground": ["Shared budget goals", "Care for each other"],
+    "disagreements": ["Timing of purchases"],
+    "root_causes": ["Need for security"],
+    "suggestions": [{"title": "Weekly check-in", "description": "d", "actionable_steps": ["a"]}],
+    "communication_tips": ["Use I-statements"],
+}
+
+
+def _openai_stream(content: str, chunk_size: int = 7) -> bytes:
+    lines = []
+    for i in range(0, len(content), chunk_size):
+        delta = {"choices": [{"delta": {"content": content[i:i + chunk_size]}}]}
+        lines.append(f"data: {json.dumps(delta)}\n\n")
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines).encode()
+
+
+@pytest.fixture
+async def stream_setup(monkeypatch):
+    db = AsyncMongoMockClient()["heka_test_db"]
+    user = UserInDB(id=USER_ID, email="a@example.com", password_hash="x", name="A", age=30)
+
+    couple = CoupleInDB(user1_id=USER_ID, user2_id=PARTNER_ID)
+    couple_id = (await db.couples.insert_one(couple.to_mongo())).inserted_id
+    argument_id = (await db.arguments.insert_one({
+        "couple_id": couple_id, "title": "Money", "category": "finances",
+        "priority": "medium", "status": "active",
+    })).inserted_id
+    for uid, text in ((USER_ID, "I feel we overspend."), (PARTNER_ID, "I feel restricted.")):
+        await db.perspectives.insert_one({
+            "argument_id": argument_id, "user_id": ObjectId(uid), "content": text,
+        })
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, content=_openai_stream(json.dumps(ANALYSIS)))
+
+    shared = SharedHTTPClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("app.services.llm_router.http_client", shared)
+    app.dependency_overrides[get_database] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client, db, str(argument_id), requests
+
+    app.dependency_overrides.clear()
+    await shared.aclose()
+
+
+def _parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_fields_then_persists(stream_setup):
+    client, db, argument_id, requests = stream_setup
+
+    response = await client.post(f"/api/ai/arguments/{argument_id}/analyze/stream")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert requests[0]["stream"] is True
+
+    events = _parse_sse(response.text)
+    fields = [(data["name"], data["value"]) for event, data in events if event == "field"]
+    assert fields == list(ANALYSIS.items())
+    assert events[-1][0] == "done"
+
+    insight = await db.ai_insights.find_one({"argument_id": ObjectId(argument_id)})
+    assert insight["summary"] == ANALYSIS["summary"]
+    assert events[-1][1]["id"] == str(insight["_id"])
+    argument = await db.arguments.find_one({"_id": ObjectId(argument_id)})
+    assert argument["status"] == "analyzed"
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_existing_analysis(stream_setup):
+    client, db, argument_id, requests = stream_setup
+    await db.ai_insights.insert_one({"argument_id": ObjectId(argument_id)})
+
+    response = await client.post(f"/api/ai/arguments/{argument_id}/analyze/stream")
+
+    assert response.status_code == 400
+    assert requests == []
+
+
+@pytest.mark.asyncio
+async def test_inline_analysis_returns_503_when_every_provider_fails(stream_setup, monkeypatch):
+    client, db, argument_id, _ = stream_setup
+
+    async def no_sleep(_):
+        return None
+
+    down = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+    provider = OpenAICompatibleProvider("openai", "http://down/v1", "key", "gpt-4o-mini", client=down)
+    monkeypatch.setattr(ai_service, "router", LLMRouter([provider], max_attempts=2, sleep=no_sleep))
+
+    response = await client.post(f"/api/ai/arguments/{argument_id}/analyze")
+
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) > 0
+    assert await db.ai_insights.count_documents({}) == 0
+    await down.aclose()
+
+
+@pytest.mark.asyncio
+async def test_inline_analysis_records_the_model_that_answered(stream_setup, monkeypatch):
+    client, db, argument_id, _ = stream_setup
+
+    async def no_sleep(_):
+        return None
+
+    def answer(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": json.dumps(ANALYSIS)}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+        })
+
+    down = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+    up = httpx.AsyncClient(transport=httpx.MockTransport(answer))
+    monkeypatch.setattr(ai_service, "router", LLMRouter([
+        OpenAICompatibleProvider("openai", "http://down/v1", "key", "gpt-4o-mini", client=down),
+        OpenAICompatibleProvider("gemini", "http://up/v1", "key", "gemini-2.0-flash", client=up),
+    ], max_attempts=1, sleep=no_sleep))
+
+    response = await client.post(f"/api/ai/arguments/{argument_id}/analyze")
+
+    assert response.status_code == 200
+    assert response.json()["model_used"] == "gemini-2.0-flash"
+    insight = await db.ai_insights.find_one({"argument_id": ObjectId(argument_id)})
+    assert insight["ai_model"] == "gemini-2.0-flash"
+    assert await db.llm_usage_daily.distinct("model") == ["gemini-2.0-flash"]
+    await down.aclose()
+    await up.aclose()
+
+
+def test_parser_handles_arbitrary_chunking():
+    text = "noise " + json.dumps(ANALYSIS, indent=2) + " trailing"
+    for size in (1, 2, 5, 64):
+        parser = IncrementalJSONObjectParser()
+        members = []
+        for i in range(0, len(text), size):
+            members.extend(parser.feed(text[i:i + size]))
+        assert members == list(ANALYSIS.items())
+        assert parser.finished
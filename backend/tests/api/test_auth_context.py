@@ -0,0 +1,65 @@
+"""Tests for the request-scoped AuthContext dependency."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson import ObjectId
+from httpx import AsyncClient
+
+from app.api.dependencies import get_current_user
+from app.main import app
+from app.models.user import UserInDB
+
+USER_ID = "507f1f77bcf86cd799439011"
+PARTNER_ID = "507f1f77bcf86cd799439012"
+COUPLE_ID = "507f1f77bcf86cd799439013"
+
+
+@pytest.fixture
+def current_user() -> UserInDB:
+    user = UserInDB(
+        id=USER_ID,
+        email="test@example.com",
+        password_hash="x",
+        name="Test User",
+        age=25,
+    )
+    app.dependency_overrides[get_current_user] = lambda: user
+    return user
+
+
+@pytest.mark.asyncio
+async def test_couple_context_resolves_partner(client: AsyncClient, mock_db: MagicMock, current_user):
+    """The active couple and partner are resolved with a single couple lookup."""
+    mock_db.couples.find_one = AsyncMock(return_value={
+        "_id": ObjectId(COUPLE_ID),
+        "user1_id": ObjectId(PARTNER_ID),
+        "user2_id": ObjectId(USER_ID),
+        "status": "active",
+    })
+
+    response = await client.get("/api/couples/me")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == COUPLE_ID
+    assert data["user1_id"] == PARTNER_ID
+    assert mock_db.couples.find_one.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_couple_context_requires_active_couple(client: AsyncClient, mock_db: MagicMock, current_user):
+    """Endpoints that need a couple return 404 when the user has none."""
+    response = await client.get("/api/couples/me")
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "No active couple profile found"
+
+
+@pytest.mark.asyncio
+async def test_arguments_list_empty_without_couple(client: AsyncClient, mock_db: MagicMock, current_user):
+    """Listing arguments without a couple returns an empty list instead of an error."""
+    response = await client.get("/api/arguments/")
+
+    assert response.status_code == 200
+    assert response.json() == []
@@ -20,3 +20,12 @@ async def test_health_check(client: AsyncClient):
     assert response.status_code in [200, 503]
     data = response.json()
     assert "checks" in data
+
+@pytest.mark.asyncio
+async def test_request_id_is_echoed(client: AsyncClient):
+    """Incoming X-Request-ID is reused and returned for log correlation."""
+    response = await client.get("/", headers={"X-Request-ID": "req-123"})
+    assert response.headers["x-request-id"] == "req-123"
+
+    response = await client.get("/")
+    assert response.headers["x-request-id"]
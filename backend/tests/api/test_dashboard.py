@@ -0,0 +1,67 @@
+"""Dashboard overview: read from the couple summary, with the Server-Timing header."""
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.api.dependencies import get_current_user
+from app.db.database import get_database
+from app.main import app
+from app.models.argument import ArgumentInDB
+from app.models.couple import CoupleInDB
+from app.models.user import UserInDB
+from app.services.couple_summary_service import couple_summary_service
+
+USER_ID = "507f1f77bcf86cd799439011"
+PARTNER_ID = "507f1f77bcf86cd799439012"
+
+
+@pytest.fixture
+async def db():
+    db = AsyncMongoMockClient()["heka_test_db"]
+    result = await db.couples.insert_one(CoupleInDB(user1_id=USER_ID, user2_id=PARTNER_ID).to_mongo())
+    db.couple_id = str(result.inserted_id)
+    return db
+
+
+@pytest.fixture
+async def client(db):
+    user = UserInDB(id=USER_ID, email="u@example.com", password_hash="x", name="U", age=30)
+    app.dependency_overrides[get_database] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_overview_sections_and_server_timing(client, db):
+    await db.arguments.insert_one(ArgumentInDB(couple_id=db.couple_id, title="Chores", category="lifestyle").to_mongo())
+
+    response = await client.get("/api/dashboard/overview")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [a["title"] for a in data["arguments"]] == ["Chores"]
+    assert data["goals"] == []
+    assert data["current_checkin"] == {"status": "pending", "completed_at": None}
+    assert data["usage"]["count"] == 0
+    sections = [entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")]
+    assert sections == ["summary"]
+
+
+@pytest.mark.asyncio
+async def test_later_reads_use_the_stored_summary(client, db, monkeypatch):
+    first = await client.get("/api/dashboard/overview")
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("summary rebuilt")
+
+    monkeypatch.setattr(couple_summary_service, "build", fail)
+    second = await client.get("/api/dashboard/overview")
+
+    assert second.status_code == 200
+    # (the first read returns the trial subscription as created, before Mongo rounds its timestamps)
+    assert {**second.json(), "subscription": None} == {**first.json(), "subscription": None}
@@ -0,0 +1,149 @@
+"""Goal progress and reactions are single atomic updates."""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+from pymongo import ReturnDocument
+
+from app.api.dependencies import get_current_user
+from app.config import settings
+from app.db.database import get_database
+from app.main import app
+from app.models.couple import CoupleInDB
+from app.models.relationship_goal import GoalProgress, GoalStatus, RelationshipGoalInDB
+from app.models.user import UserInDB
+
+USER_ID = "507f1f77bcf86cd799439011"
+PARTNER_ID = "507f1f77bcf86cd799439012"
+COUPLE_ID = "507f1f77bcf86cd799439013"
+
+
+@pytest.fixture
+def user():
+    user = UserInDB(id=USER_ID, email="u@example.com", password_hash="x", name="U", age=30)
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def db(user):
+    db = AsyncMongoMockClient()["heka_test_db"]
+    await db.couples.insert_one({**CoupleInDB(user1_id=USER_ID, user2_id=PARTNER_ID).to_mongo(),
+                                 "_id": ObjectId(COUPLE_ID)})
+    app.dependency_overrides[get_database] = lambda: db
+    return db
+
+
+@pytest.fixture
+async def api():
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+async def insert_goal(db, **overrides):
+    goal = RelationshipGoalInDB(couple_id=COUPLE_ID, title="Walk", created_by_user_id=USER_ID, **overrides)
+    return (await db.relationship_goals.insert_one(goal.to_mongo())).inserted_id
+
+
+@pytest.mark.asyncio
+async def test_concurrent_progress_updates_all_land(api, db):
+    goal_id = await insert_goal(db)
+
+    responses = await asyncio.gather(*[
+        api.post(f"/api/goals/{goal_id}/progress", json={"notes": f"update {i}", "progress_value": 0.1})
+        for i in range(5)
+    ])
+
+    assert all(r.status_code == 200 for r in responses)
+    stored = await db.relationship_goals.find_one({"_id": goal_id})
+    assert stored["progress_updates"] == 5
+    assert sorted(p["notes"] for p in stored["progress"]) == [f"update {i}" for i in range(5)]
+    assert isinstance(stored["progress"][0]["date"], datetime)
+    assert responses[-1].json()["progress"][-1]["user_id"] == USER_ID
+
+
+@pytest.mark.asyncio
+async def test_progress_cap_trims_oldest_entries(api, db, monkeypatch):
+    monkeypatch.setattr(settings, "GOAL_PROGRESS_MAX_ENTRIES", 2)
+    goal_id = await insert_goal(db)
+
+    for i in range(3):
+        response = await api.post(f"/api/goals/{goal_id}/progress", json={"notes": f"update {i}"})
+
+    data = response.json()
+    assert [p["notes"] for p in data["progress"]] == ["update 1", "update 2"]
+    assert data["progress_updates"] == 3
+
+
+@pytest.mark.asyncio
+async def test_progress_errors(api, db):
+    completed = await insert_goal(db, status=GoalStatus.COMPLETED)
+
+    inactive = await api.post(f"/api/goals/{completed}/progress", json={"notes": "late"})
+    missing = await api.post(f"/api/goals/{ObjectId()}/progress", json={"notes": "late"})
+
+    assert (inactive.status_code, inactive.json()["detail"]) == (400, "Can only update progress for active goals")
+    assert (missing.status_code, missing.json()["detail"]) == (404, "Goal not found")
+
+
+@pytest.mark.asyncio
+async def test_complete_goal(api, db):
+    goal_id = await insert_goal(db)
+
+    response = await api.post(f"/api/goals/{goal_id}/complete")
+
+    assert response.json()["status"] == "completed"
+    assert response.json()["completed_at"] is not None
+
+
+@pytest.fixture
+def goals_collection(user):
+    # mongomock does not implement arrayFilters, so reactions are checked against the issued updates
+    db = MagicMock()
+    db.couples.find_one = AsyncMock(return_value={
+        "_id": ObjectId(COUPLE_ID), "user1_id": ObjectId(USER_ID), "user2_id": ObjectId(PARTNER_ID),
+        "status": "active",
+    })
+    app.dependency_overrides[get_database] = lambda: db
+    return db.relationship_goals
+
+
+@pytest.mark.asyncio
+async def test_reaction_toggles_on_with_add_to_set(api, goals_collection):
+    goal_id = ObjectId()
+    entry = GoalProgress(id="p1", user_id=PARTNER_ID, date=datetime(2024, 6, 1).date(),
+                         reactions=[{"user_id": USER_ID, "emoji": "🎉"}])
+    after = {**RelationshipGoalInDB(couple_id=COUPLE_ID, title="Walk", created_by_user_id=USER_ID,
+                                    progress=[entry]).to_mongo(), "_id": goal_id}
+    goals_collection.find_one_and_update = AsyncMock(side_effect=[None, after])
+
+    response = await api.post(f"/api/goals/{goal_id}/progress/p1/react", json={"emoji": "🎉"})
+
+    assert response.status_code == 200
+    assert response.json()["progress"][0]["reactions"] == [{"user_id": USER_ID, "emoji": "🎉"}]
+    pull, add = goals_collection.find_one_and_update.await_args_list
+    reaction = {"user_id": USER_ID, "emoji": "🎉"}
+    assert pull.args[0]["progress"] == {"$elemMatch": {"id": "p1", "reactions": {"$elemMatch": reaction}}}
+    assert pull.args[1]["$pull"] == {"progress.$[entry].reactions": reaction}
+    assert add.args[0]["progress.id"] == "p1"
+    assert add.args[1]["$addToSet"] == {"progress.$[entry].reactions": reaction}
+    for call in (pull, add):
+        assert call.kwargs == {"array_filters": [{"entry.id": "p1"}], "return_document": ReturnDocument.AFTER}
+
+
+@pytest.mark.asyncio
+async def test_reaction_on_unknown_entry_is_404(api, goals_collection):
+    goals_collection.find_one_and_update = AsyncMock(return_value=None)
+    goals_collection.find_one = AsyncMock(return_value={"_id": ObjectId()})
+
+    response = await api.post(f"/api/goals/{ObjectId()}/progress/nope/react", json={"emoji": "🎉"})
+
+    assert (response.status_code, response.json()["detail"]) == (404, "Progress update not found")
@@ -0,0 +1,150 @@
+"""Tests for queued (202) analysis and the job-status endpoint."""
+
+import httpx
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.api.dependencies import get_current_user
+from app.db.database import get_database
+from app.main import app
+from app.models.ai_insight import AIInsightInDB
+from app.models.couple import CoupleInDB
+from app.models.user import UserInDB
+from app.services.ai_service import ai_service
+from app.worker import JobWorker
+
+USER_ID = "507f1f77bcf86cd799439011"
+PARTNER_ID = "507f1f77bcf86cd799439012"
+OUTSIDER_ID = "507f1f77bcf86cd799439099"
+
+
+@pytest.fixture
+async def setup():
+    db = AsyncMongoMockClient()["heka_test_db"]
+    users = {
+        uid: UserInDB(id=uid, email=f"{uid}@example.com", password_hash="x", name="U", age=30)
+        for uid in (USER_ID, PARTNER_ID, OUTSIDER_ID)
+    }
+    current = {"user": users[USER_ID]}
+
+    couple_id = (await db.couples.insert_one(
+        CoupleInDB(user1_id=USER_ID, user2_id=PARTNER_ID).to_mongo()
+    )).inserted_id
+    argument_id = (await db.arguments.insert_one({
+        "couple_id": couple_id, "title": "Chores", "category": "lifestyle",
+        "priority": "medium", "status": "active",
+    })).inserted_id
+    for uid in (USER_ID, PARTNER_ID):
+        await db.perspectives.insert_one({
+            "argument_id": argument_id, "user_id": ObjectId(uid), "content": "I feel tired.",
+        })
+
+    app.dependency_overrides[get_database] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: current["user"]
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client, db, str(argument_id), current, users
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_background_analysis_returns_202_and_is_pollable(setup):
+    client, db, argument_id, current, users = setup
+
+    response = await client.post(f"/api/ai/arguments/{argument_id}/analyze?background=true")
+
+    assert response.status_code == 202
+    body = response.json()
+    assert response.headers["location"] == body["status_url"] == f"/api/jobs/{body['job_id']}"
+
+    # A repeat request while the job is pending reuses it
+    again = await client.post(f"/api/ai/arguments/{argument_id}/analyze?background=true")
+    assert again.json()["job_id"] == body["job_id"]
+    assert await db.jobs.count_documents({}) == 1
+
+    # The partner can poll it; someone outside the couple cannot see it
+    current["user"] = users[PARTNER_ID]
+    status_response = await client.get(body["status_url"])
+    assert status_response.status_code == 200
+    assert status_response.json()["status"] == "queued"
+    assert status_response.json()["type"] == "mediate_argument"
+
+    current["user"] = users[OUTSIDER_ID]
+    assert (await client.get(body["status_url"])).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_job_payload_holds_references_and_worker_rereads_perspectives(setup, monkeypatch):
+    client, db, argument_id, current, users = setup
+    await db.perspectives.update_one(
+        {"user_id": ObjectId(PARTNER_ID)}, {"$set": {"content": "I feel unheard."}}
+    )
+    response = await client.post(f"/api/ai/arguments/{argument_id}/analyze?background=true")
+    job_doc = await db.jobs.find_one({"_id": ObjectId(response.json()["job_id"])})
+    assert job_doc["payload"] == {"argument_id": argument_id, "category": "lifestyle"}
+
+    seen = {}
+
+    async def mediate(**kwargs):
+        seen.update(kwargs)
+        return {"id": "insight"}
+
+    monkeypatch.setattr(ai_service, "mediate_argument", mediate)
+    assert await JobWorker(db).run_once()
+
+    assert (seen["perspective_1"], seen["perspective_2"]) == ("I feel tired.", "I feel unheard.")
+    assert seen["safety_check"]["has_concerns"] is False
+    assert (await db.jobs.find_one({"_id": job_doc["_id"]}))["status"] == "succeeded"
+
+    # Deleting the account removes the jobs the user queued
+    deleted = await client.delete("/api/users/me/account", params={"confirmation": "DELETE"})
+    assert deleted.status_code == 200
+    assert await db.jobs.count_documents({}) == 0
+
+
+@pytest.mark.asyncio
+async def test_job_result_has_the_full_body_when_the_insight_already_exists(setup):
+    client, db, argument_id, current, users = setup
+    response = await client.post(f"/api/ai/arguments/{argument_id}/analyze?background=true")
+
+    # A previous attempt saved the insight before losing its lease
+    insight = AIInsightInDB(
+        argument_id=argument_id, summary="Both of you are tired.", common_ground=["Rest"],
+        disagreements=[], root_causes=[], suggestions=[], communication_tips=[],
+        ai_model="gpt-4o-mini", cost=0.01,
+    )
+    insight.id = str((await db.ai_insights.insert_one(insight.to_mongo())).inserted_id)
+    assert await JobWorker(db).run_once()
+
+    job = (await client.get(response.json()["status_url"])).json()
+    assert job["status"] == "succeeded"
+    assert job["result"] == {
+        "id": insight.id,
+        "summary": "Both of you are tired.",
+        "common_ground": ["Rest"],
+        "disagreements": [],
+        "root_causes": [],
+        "suggestions": [],
+        "communication_tips": [],
+        "cost": 0.01,
+        "model_used": "gpt-4o-mini",
+        "safety_check": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_rejected_mediation_request_dead_letters_the_job(setup, monkeypatch):
+    client, db, argument_id, current, users = setup
+    response = await client.post(f"/api/ai/arguments/{argument_id}/analyze?background=true")
+
+    async def reject(**kwargs):
+        raise ValueError("Mediation is not appropriate for this conflict")
+
+    monkeypatch.setattr(ai_service, "mediate_argument", reject)
+    assert await JobWorker(db).run_once()
+
+    job = await db.jobs.find_one({"_id": ObjectId(response.json()["job_id"])})
+    assert job["status"] == "dead"
+    assert job["attempts"] == 1
@@ -0,0 +1,140 @@
+"""List endpoints return pre-shaped documents rendered by ORJSONResponse."""
+
+from datetime import date, datetime
+
+import httpx
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.api.dependencies import get_current_user
+from app.api.schemas import ArgumentResponse, GoalResponse, PerspectiveResponse
+from app.core.responses import dumps
+from app.db.database import get_database
+from app.db.repositories import goal_repository
+from app.main import app
+from app.models.argument import ArgumentInDB
+from app.models.couple import CoupleInDB
+from app.models.perspective import PerspectiveInDB
+from app.models.relationship_goal import GoalProgress, RelationshipGoalInDB
+from app.models.user import UserInDB
+
+USER_ID = "507f1f77bcf86cd799439011"
+PARTNER_ID = "507f1f77bcf86cd799439012"
+CREATED = datetime(2024, 6, 1, 12, 30, 5, 123000)
+
+
+@pytest.fixture
+async def db():
+    db = AsyncMongoMockClient()["heka_test_db"]
+    result = await db.couples.insert_one(CoupleInDB(user1_id=USER_ID, user2_id=PARTNER_ID).to_mongo())
+    db.couple_id = str(result.inserted_id)
+    return db
+
+
+@pytest.fixture
+async def client(db):
+    user = UserInDB(id=USER_ID, email="u@example.com", password_hash="x", name="U", age=30)
+    app.dependency_overrides[get_database] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+def assert_matches_schema(items, schema):
+    # The fast path must produce exactly what response_model serialization would
+    assert items
+    for item in items:
+        assert schema.model_validate(item).model_dump(mode="json") == item
+
+
+@pytest.mark.asyncio
+async def test_goals_list(client, db):
+    goal = RelationshipGoalInDB(
+        couple_id=db.couple_id, title="Walk", created_by_user_id=USER_ID, target_date=date(2024, 12, 1),
+        progress=[GoalProgress(user_id=USER_ID, date=date(2024, 6, 2), progress_value=0.5,
+                               reactions=[{"user_id": PARTNER_ID, "emoji": "❤️"}])],
+        progress_updates=1, created_at=CREATED, updated_at=CREATED,
+    )
+    await db.relationship_goals.insert_one(goal.to_mongo())
+
+    response = await client.get("/api/goals/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    [item] = response.json()
+    assert_matches_schema([item], GoalResponse)
+    assert item["couple_id"] == db.couple_id
+    assert item["target_date"] == "2024-12-01"
+    assert item["progress"][0]["date"] == "2024-06-02"
+    assert item["created_at"] == "2024-06-01T12:30:05.123000"
+
+
+@pytest.mark.asyncio
+async def test_create_goal_keeps_201(client):
+    response = await client.post("/api/goals/create", json={"title": "Date night"})
+
+    assert response.status_code == 201
+    assert_matches_schema([response.json()], GoalResponse)
+
+
+@pytest.mark.asyncio
+async def test_arguments_and_perspectives_lists(client, db):
+    argument = ArgumentInDB(couple_id=db.couple_id, title="Chores", category="lifestyle",
+                            created_at=CREATED, updated_at=CREATED)
+    argument_id = (await db.arguments.insert_one(argument.to_mongo())).inserted_id
+    perspective = PerspectiveInDB(argument_id=str(argument_id), user_id=USER_ID, content="I feel unheard lately.")
+    await db.perspectives.insert_one(perspective.to_mongo())
+
+    arguments = (await client.get("/api/arguments/")).json()
+    perspectives = (await client.get(f"/api/perspectives/argument/{argument_id}")).json()
+
+    assert_matches_schema(arguments, ArgumentResponse)
+    assert arguments[0]["id"] == str(argument_id)
+    assert_matches_schema(perspectives, PerspectiveResponse)
+    assert set(perspectives[0]) == set(PerspectiveResponse.model_fields)
+
+
+def test_dumps_encodes_object_ids_and_models():
+    oid = ObjectId()
+    model = ArgumentResponse(id=str(oid), couple_id=str(oid), title="t", category="other", priority="low",
+                             status="draft", created_at=CREATED, updated_at=CREATED)
+
+    assert dumps({"id": oid, "model": model, 1: "x"}) == (
+        f'{{"id":"{oid}","model":{model.model_dump_json()},"1":"x"}}'.encode()
+    )
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets_are_pushed_down(client, db):
+    goal = RelationshipGoalInDB(
+        couple_id=db.couple_id, title="Walk", created_by_user_id=USER_ID,
+        progress=[GoalProgress(date=date(2024, 6, 2))],
+    )
+    goal_id = (await db.relationship_goals.insert_one(goal.to_mongo())).inserted_id
+
+    listed = await client.get("/api/goals/", params={"fields": "title, status,title"})
+    single = await client.get(f"/api/goals/{goal_id}", params={"fields": "id"})
+
+    assert listed.json() == [{"id": str(goal_id), "title": "Walk", "status": "active"}]
+    assert single.json() == {"id": str(goal_id)}
+
+
+@pytest.mark.asyncio
+async def test_unknown_sparse_fields_are_400(client):
+    response = await client.get("/api/arguments/", params={"fields": "title,password_hash"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Unknown fields: password_hash.")
+
+
+def test_repository_projections():
+    assert goal_repository.projection("summary") == {"title": 1, "status": 1, "target_date": 1, "created_at": 1}
+    assert goal_repository.projection("response", ["id", "title"]) == {"title": 1}
+    # An empty projection would return whole documents
+    assert goal_repository.projection("response", ["id"]) == {"_id": 1}
+    with pytest.raises(ValueError, match="Unknown fields: progress"):
+        goal_repository.projection("summary", ["progress"])
@@ -0,0 +1,79 @@
+"""Tests for ObjectId path/body parameters (PyObjectId) and their 400 errors."""
+
+import httpx
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+from pydantic import BaseModel
+
+from app.api.dependencies import get_current_user
+from app.core.sanitization import PyObjectId
+from app.db.database import get_database
+from app.main import app
+from app.models.couple import CoupleInDB
+from app.models.user import UserInDB
+
+USER_ID = "507f1f77bcf86cd799439011"
+PARTNER_ID = "507f1f77bcf86cd799439012"
+
+
+@pytest.fixture
+async def client():
+    db = AsyncMongoMockClient()["heka_test_db"]
+    await db.couples.insert_one(CoupleInDB(user1_id=USER_ID, user2_id=PARTNER_ID).to_mongo())
+    user = UserInDB(id=USER_ID, email="u@example.com", password_hash="x", name="U", age=30)
+
+    app.dependency_overrides[get_database] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method,path", [
+    ("GET", "/api/goals/not-an-id"),
+    ("POST", "/api/goals/not-an-id/complete"),
+    ("POST", "/api/couples/resend-invitation/not-an-id"),
+    ("GET", "/api/jobs/not-an-id"),
+    ("GET", "/api/arguments/not-an-id"),
+    ("GET", "/api/ai/arguments/not-an-id/insights"),
+])
+async def test_malformed_path_ids_are_400(client, method, path):
+    response = await client.request(method, path)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid ObjectId length: 9 (expected 24)"}
+
+
+@pytest.mark.asyncio
+async def test_well_formed_unknown_ids_are_404(client):
+    response = await client.get(f"/api/goals/{ObjectId()}")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_body_ids_are_400_and_other_errors_stay_422(client):
+    bad_id = await client.post(
+        "/api/perspectives/create",
+        json={"argument_id": "zz" * 12, "content": "I feel unheard lately."},
+    )
+    assert bad_id.status_code == 400
+    assert bad_id.json()["detail"].startswith("Invalid ObjectId format")
+
+    mixed = await client.post("/api/perspectives/create", json={"argument_id": "x", "content": "short"})
+    assert mixed.status_code == 422
+
+
+def test_model_field_parses_once_and_serializes_to_string():
+    class Body(BaseModel):
+        argument_id: PyObjectId
+
+    body = Body(argument_id=f"  {USER_ID} ")
+
+    assert body.argument_id == ObjectId(USER_ID)
+    assert body.model_dump(mode="json") == {"argument_id": USER_ID}
+    assert Body.model_json_schema()["properties"]["argument_id"]["type"] == "string"
@@ -0,0 +1,119 @@
+"""Keyset (cursor) pagination for arguments, goals and check-in history."""
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.api.dependencies import get_current_user
+from app.core.pagination import created_at_keyset
+from app.db.database import get_database
+from app.main import app
+from app.models.couple import CoupleInDB
+from app.models.relationship_checkin import RelationshipCheckInInDB
+from app.models.relationship_goal import RelationshipGoalInDB
+from app.models.user import UserInDB
+
+USER_ID = "507f1f77bcf86cd799439011"
+PARTNER_ID = "507f1f77bcf86cd799439012"
+START = datetime(2024, 1, 1, 9, 0, 0, 250000)
+
+
+@pytest.fixture
+async def db():
+    db = AsyncMongoMockClient()["heka_test_db"]
+    result = await db.couples.insert_one(CoupleInDB(user1_id=USER_ID, user2_id=PARTNER_ID).to_mongo())
+    db.couple_id = str(result.inserted_id)
+    return db
+
+
+@pytest.fixture
+async def client(db):
+    user = UserInDB(id=USER_ID, email="u@example.com", password_hash="x", name="U", age=30)
+    app.dependency_overrides[get_database] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+async def insert_goals(db, count):
+    # Pairs of goals share a created_at, so the _id tie-break matters
+    goals = [
+        RelationshipGoalInDB(
+            couple_id=db.couple_id, title=f"Goal {i}", created_by_user_id=USER_ID,
+            created_at=START + timedelta(minutes=i // 2),
+        ).to_mongo()
+        for i in range(count)
+    ]
+    await db.relationship_goals.insert_many(goals)
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_match_offset_pages(client, db):
+    await insert_goals(db, 7)
+
+    by_offset = []
+    for offset in range(0, 9, 3):
+        by_offset += (await client.get("/api/goals/", params={"limit": 3, "offset": offset})).json()
+
+    by_cursor, params = [], {"limit": 3}
+    while True:
+        response = await client.get("/api/goals/", params=params)
+        by_cursor += response.json()
+        if "x-next-cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["x-next-cursor"]
+
+    assert [g["title"] for g in by_cursor] == [g["title"] for g in by_offset]
+    assert len({g["id"] for g in by_cursor}) == 7
+    created = [(g["created_at"], g["id"]) for g in by_cursor]
+    assert created == sorted(created, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_cursor_with_sparse_fields_omits_sort_key(client, db):
+    await insert_goals(db, 2)
+
+    first = await client.get("/api/goals/", params={"limit": 1, "fields": "title"})
+    second = await client.get(
+        "/api/goals/", params={"limit": 1, "fields": "title", "cursor": first.headers["x-next-cursor"]}
+    )
+
+    assert set(first.json()[0]) == {"id", "title"}
+    assert first.json() != second.json()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params,detail", [
+    ({"cursor": "not-a-cursor"}, "Invalid cursor"),
+    ({"cursor": created_at_keyset.encode({"created_at": START, "_id": ObjectId()}), "offset": 3},
+     "Use either cursor or offset, not both"),
+])
+async def test_bad_cursor_requests_are_400(client, params, detail):
+    for path in ("/api/goals/", "/api/arguments/", "/api/checkins/history"):
+        response = await client.get(path, params=params)
+        assert response.status_code == 400
+        assert response.json()["detail"] == detail
+
+
+@pytest.mark.asyncio
+async def test_checkin_history_returns_next_cursor(client, db):
+    weeks = [START - timedelta(weeks=i) for i in range(3)]
+    await db.relationship_checkins.insert_many([
+        RelationshipCheckInInDB(couple_id=db.couple_id, week_start_date=week.date()).to_mongo()
+        for week in weeks
+    ])
+
+    first = (await client.get("/api/checkins/history", params={"limit": 2})).json()
+    rest = (await client.get("/api/checkins/history", params={"limit": 2, "cursor": first["next_cursor"]})).json()
+
+    assert [c["week_start_date"] for c in first["checkins"] + rest["checkins"]] == [
+        week.date().isoformat() for week in weeks
+    ]
+    assert first["next_offset"] == 2
+    assert rest["next_cursor"] is None and rest["next_offset"] is None
@@ -11,6 +11,7 @@ os.environ["MONGODB_URL"] = "mongodb://localhost:27017"
 os.environ["MONGODB_DB_NAME"] = "heka_test_db"
 os.environ["SECRET_KEY"] = "test_secret_key_needs_to_be_at_least_32_chars_long"
 os.environ["OPENAI_API_KEY"] = "sk-test-key-mock"
+os.environ["RATE_LIMIT_STORAGE_URI"] = "memory://"
 
 from app.db.database import get_database  # noqa: E402
 from app.main import app  # noqa: E402
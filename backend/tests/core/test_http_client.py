@@ -0,0 +1,81 @@
+"""Tests for the shared outbound HTTP client."""
+
+import json
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.config import settings
+from app.core import http_client as http_client_module
+from app.core.http_client import SharedHTTPClient
+from app.services.ai_service import ai_service
+from app.services.prompt_registry import CHECKIN_QUESTIONS as CHECKINS
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["heka_test_db"]
+
+
+@pytest.fixture
+def openai_calls(monkeypatch):
+    """Route the shared client through a mock transport recording each request."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": json.dumps({"questions": []})}}]
+        })
+
+    shared = SharedHTTPClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_client_module, "http_client", shared)
+    monkeypatch.setattr("app.services.llm_router.http_client", shared)
+    yield calls, shared
+
+
+@pytest.mark.asyncio
+async def test_ai_calls_reuse_one_client(openai_calls, db):
+    calls, shared = openai_calls
+
+    await ai_service._call_openai(CHECKINS, {"insights": "{}"}, feature="test", db=db)
+    first = shared.client
+    await ai_service._call_openai(CHECKINS, {"insights": "{}"}, feature="test", db=db)
+
+    assert len(calls) == 2
+    assert shared.client is first
+    assert calls[0].headers["authorization"] == f"Bearer {settings.OPENAI_API_KEY}"
+
+
+@pytest.mark.asyncio
+async def test_per_call_timeout_applied(openai_calls, db):
+    calls, _ = openai_calls
+
+    await ai_service._call_openai(CHECKINS, {"insights": "{}"}, feature="test", db=db)
+
+    assert calls[0].extensions["timeout"]["read"] == 60.0
+
+
+@pytest.mark.asyncio
+async def test_aclose_releases_client():
+    shared = SharedHTTPClient(transport=httpx.MockTransport(lambda r: httpx.Response(204)))
+    await shared.start()
+    client = shared.client
+
+    await shared.aclose()
+
+    assert client.is_closed
+    # A later call (e.g. from a script) transparently opens a new client
+    assert shared.client is not client
+    await shared.aclose()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_swallows_connection_errors():
+    def refuse(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    shared = SharedHTTPClient(transport=httpx.MockTransport(refuse))
+    await shared.warm_up("https://api.openai.com/v1/models")
+    await shared.aclose()
@@ -0,0 +1,85 @@
+"""Tests for the single-pass keyword scanner and the safety check built on it."""
+
+import random
+import re
+
+from app.core.keyword_scanner import KeywordMatch, KeywordScanner
+from app.services.safety_service import SafetyService, safety_service
+
+
+def legacy_concern_types(text: str) -> set:
+    """The per-keyword loop SafetyService used before the scanner."""
+    found = set()
+    all_text = text.lower()
+    for concern_type, keywords in SafetyService.CRISIS_KEYWORDS.items():
+        if any(re.search(r'\b' + re.escape(k.lower()) + r'\b', all_text) for k in keywords):
+            found.add(concern_type)
+    if any(re.search(p, all_text, re.IGNORECASE) for p in SafetyService.ABUSE_PATTERNS):
+        found.add('abuse')
+    return found
+
+
+def test_matches_legacy_loop_on_random_corpus():
+    rng = random.Random(1234)
+    vocabulary = (
+        [t for terms in SafetyService.CRISIS_KEYWORDS.values() for t in terms]
+        + ["you're crazy", "Don't tell anyone", "punchline", "cuttings", "suicidehotline"]
+        + "we argue about money and chores, I feel unheard. She said: fine!".split()
+    )
+    scanner = SafetyService.scanner
+    for _ in range(500):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(0, 12))]
+        text = " ".join(w.upper() if rng.random() < 0.2 else w for w in words)
+        assert set(scanner.labels_in(text)) == legacy_concern_types(text), text
+
+
+def test_reports_spans_and_overlapping_terms():
+    text = "Call the Suicide Hotline now"
+    matches = SafetyService.scanner.scan(text)
+
+    assert KeywordMatch("mental_health_crisis", "suicide hotline", 9, 24) in matches
+    assert KeywordMatch("self_harm", "suicide", 9, 16) in matches
+    assert text[9:24] == "Suicide Hotline"
+
+
+def test_keywords_need_word_boundaries():
+    scanner = KeywordScanner({"harmful": ["stupid", "idiot"]})
+
+    assert scanner.scan("that was a stupidly good idea, idiots") == []
+    assert scanner.labels_in("don't be stupid.") == ["harmful"]
+
+
+def test_patterns_match_anywhere_including_inside_keywords():
+    scanner = KeywordScanner({"a": ["dont"]}, {"b": [r"don"]})
+
+    assert [(m.label, m.start) for m in scanner.scan("dont")] == [("a", 0), ("b", 0)]
+    assert scanner.labels_in("abandon") == ["b"]
+
+
+def test_scan_many_scans_each_text():
+    scanner = KeywordScanner({"x": ["alpha"], "y": ["beta"]})
+
+    result = scanner.scan_many(["alpha", "", "beta alpha"])
+
+    assert [[m.label for m in found] for found in result] == [["x"], [], ["y", "x"]]
+
+
+def test_detect_safety_concerns_reports_matches_per_perspective():
+    result = safety_service.detect_safety_concerns(
+        "We had a panic attack during the fight.",
+        "He keeps telling me you're crazy.",
+    )
+
+    assert result["concern_types"] == ["abuse", "mental_health_crisis"]
+    assert result["severity"] == "critical"
+    assert {(m["perspective"], m["type"], m["term"]) for m in result["matches"]} == {
+        (1, "mental_health_crisis", "panic attack"),
+        (2, "abuse", "you're crazy"),
+    }
+
+
+def test_detect_safety_concerns_clean_text():
+    result = safety_service.detect_safety_concerns("We disagree about chores.", "I want more date nights.")
+
+    assert result["has_concerns"] is False
+    assert result["matches"] == []
@@ -0,0 +1,102 @@
+"""Tests for the Redis-backed rate limiter."""
+
+import fakeredis
+import pytest
+import redis
+from limits import parse
+from starlette.requests import Request
+
+from app.core import limiter as limiter_module
+from app.core.limiter import build_limiter, get_client_ip, rate_limit_key
+from app.core.security import create_access_token
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+def make_limiter(server):
+    pool = redis.ConnectionPool(connection_class=fakeredis.FakeConnection, server=server)
+    return build_limiter("redis://localhost:6379/0", {"connection_pool": pool})
+
+
+def make_request(headers=None, client=("10.0.0.5", 1234)) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw, "client": client})
+
+
+def test_quota_is_shared_across_workers(redis_server):
+    """Two limiter instances (workers) draw from one sliding window."""
+    worker_a = make_limiter(redis_server)
+    worker_b = make_limiter(redis_server)
+    item = parse("3/minute")
+
+    assert worker_a.limiter.hit(item, "user:1", "/api/ai/analyze")
+    assert worker_b.limiter.hit(item, "user:1", "/api/ai/analyze")
+    assert worker_a.limiter.hit(item, "user:1", "/api/ai/analyze")
+    assert not worker_b.limiter.hit(item, "user:1", "/api/ai/analyze")
+    # Other clients are unaffected
+    assert worker_b.limiter.hit(item, "user:2", "/api/ai/analyze")
+
+
+def test_exhausted_clients_are_rejected_locally(redis_server):
+    """Once over quota, a client is turned away without touching Redis."""
+    worker = make_limiter(redis_server)
+    item = parse("2/hour")
+
+    assert worker.limiter.hit(item, "ip:1.2.3.4", "/api/auth/login")
+    assert worker.limiter.hit(item, "ip:1.2.3.4", "/api/auth/login")
+    backend_calls = worker.stats()["backend_calls"]
+
+    for _ in range(5):
+        assert not worker.limiter.hit(item, "ip:1.2.3.4", "/api/auth/login")
+
+    stats = worker.stats()
+    assert stats["backend_calls"] == backend_calls
+    assert stats["local_rejections"] == 5
+
+
+def test_redis_rejection_drains_local_bucket(redis_server):
+    """A worker that learns the shared quota is spent stops asking Redis."""
+    worker_a = make_limiter(redis_server)
+    worker_b = make_limiter(redis_server)
+    item = parse("2/hour")
+
+    worker_a.limiter.hit(item, "user:1", "scope")
+    worker_a.limiter.hit(item, "user:1", "scope")
+
+    assert not worker_b.limiter.hit(item, "user:1", "scope")
+    calls = worker_b.stats()["backend_calls"]
+    assert not worker_b.limiter.hit(item, "user:1", "scope")
+    assert worker_b.stats()["backend_calls"] == calls
+
+
+def test_key_prefers_authenticated_user():
+    token = create_access_token({"sub": "507f1f77bcf86cd799439011"})
+    request = make_request({"Authorization": f"Bearer {token}"})
+
+    assert rate_limit_key(request) == "user:507f1f77bcf86cd799439011"
+
+
+def test_key_falls_back_to_ip_for_invalid_token():
+    request = make_request({"Authorization": "Bearer not-a-jwt"})
+
+    assert rate_limit_key(request) == "ip:10.0.0.5"
+
+
+def test_forwarded_for_ignored_from_untrusted_peer(monkeypatch):
+    monkeypatch.setattr(limiter_module, "_trusted_proxies", [])
+    request = make_request({"X-Forwarded-For": "203.0.113.9"})
+
+    assert get_client_ip(request) == "10.0.0.5"
+
+
+def test_forwarded_for_resolved_through_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(
+        limiter_module, "_trusted_proxies", limiter_module._parse_networks(["10.0.0.0/8"])
+    )
+    request = make_request({"X-Forwarded-For": "198.51.100.7, 203.0.113.9, 10.1.2.3"})
+
+    # Right-most untrusted hop is the client; earlier entries are client-supplied
+    assert get_client_ip(request) == "203.0.113.9"
@@ -0,0 +1,38 @@
+"""Tests for the logging pipeline helpers."""
+
+import json
+import logging
+
+from app.core.logging_config import JSONFormatter, SamplingFilter, request_id_var
+
+
+def _record(name: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, "hello %s", ("world",), None)
+
+
+def test_sampling_matches_longest_prefix():
+    sampler = SamplingFilter({"app.services": 1.0, "app.services.refresh_token_service": 0.0})
+
+    assert sampler.filter(_record("app.services.ai_service"))
+    assert not sampler.filter(_record("app.services.refresh_token_service"))
+    assert sampler.filter(_record("app.api.goals"))
+
+
+def test_sampling_never_drops_warnings():
+    sampler = SamplingFilter({"app": 0.0})
+
+    assert sampler.filter(_record("app.api.goals", logging.WARNING))
+
+
+def test_json_formatter_includes_request_id():
+    token = request_id_var.set("abc123")
+    try:
+        record = _record("heka")
+        record.request_id = request_id_var.get()
+        entry = json.loads(JSONFormatter().format(record))
+    finally:
+        request_id_var.reset(token)
+
+    assert entry["msg"] == "hello world"
+    assert entry["request_id"] == "abc123"
+    assert entry["level"] == "INFO"
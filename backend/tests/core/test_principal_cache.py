@@ -0,0 +1,54 @@
+"""Tests for the in-process principal cache."""
+
+import time
+
+from app.core.principal_cache import PrincipalCache
+from app.models.user import UserInDB
+
+
+def _user(user_id: str = "507f1f77bcf86cd799439011") -> UserInDB:
+    return UserInDB(id=user_id, email="test@example.com", password_hash="x", name="Test", age=25)
+
+
+def test_hit_and_miss_counters():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    assert cache.get("token-a") is None
+
+    cache.put("token-a", {"sub": "1"}, _user())
+    claims, user = cache.get("token-a")
+
+    assert claims == {"sub": "1"}
+    assert user.email == "test@example.com"
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_entry_never_outlives_token_expiry():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    cache.put("token-a", {"sub": "1", "exp": time.time() - 1}, _user())
+
+    assert cache.get("token-a") is None
+
+
+def test_lru_eviction():
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    cache.put("a", {}, _user("507f1f77bcf86cd799439011"))
+    cache.put("b", {}, _user("507f1f77bcf86cd799439012"))
+    cache.get("a")
+    cache.put("c", {}, _user("507f1f77bcf86cd799439013"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_user_drops_all_tokens():
+    cache = PrincipalCache(max_size=10, ttl_seconds=60)
+    user = _user()
+    cache.put("a", {}, user)
+    cache.put("b", {}, user)
+
+    assert cache.invalidate_user(user.id) == 2
+    assert cache.get("a") is None
+    assert cache.get("b") is None
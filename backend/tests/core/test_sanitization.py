@@ -0,0 +1,58 @@
+"""Tests for sanitize_text, including equivalence with the previous implementation."""
+
+import random
+import re
+
+import pytest
+
+from app.core.sanitization import sanitize_text
+from loadtest.bench_sanitize import PAYLOADS, legacy_sanitize_text
+
+# Fragments that exercise every branch, plus case-folding and \w edge cases
+ATOMS = [
+    "$", "{", "(", "$where", "$WHERE", "$regex", "$Code", "$eval", "javascript:",
+    "JavaScript:", "on", "onclick", "oN", "=", " = ", "onload =", "\x00", " ", "\n",
+    "\t", ":", "a", "Z", "_", "9", "é", "İ", "ſ", "K", "$$where",
+]
+
+
+def outcome(func, text, max_length):
+    try:
+        return "ok", func(text, max_length)
+    except ValueError as e:
+        return "error", str(e)
+
+
+def test_matches_legacy_on_random_inputs():
+    rng = random.Random(20240611)
+    for _ in range(20000):
+        text = "".join(rng.choice(ATOMS) for _ in range(rng.randint(0, 40)))
+        max_length = rng.choice([None, 5, 20, 100])
+        assert outcome(sanitize_text, text, max_length) == outcome(legacy_sanitize_text, text, max_length), repr(text)
+
+
+@pytest.mark.parametrize("name,text", PAYLOADS)
+def test_matches_legacy_on_benchmark_payloads(name, text):
+    assert sanitize_text(text, 5000) == legacy_sanitize_text(text, 5000)
+
+
+@pytest.mark.parametrize("text,message", [
+    ("$" * 6, "too many '$' characters"),
+    ("{" * 11 + " javascript:", "too many '{' characters"),
+    ("(" * 21, "too many '(' characters"),
+    ("db.find({$where: 1})", r"dangerous pattern: \$where"),
+    # Earlier patterns are reported first regardless of position
+    ("JavaScript:go() $EVAL", r"dangerous pattern: \$eval"),
+    ('<img onerror = "x">', r"dangerous pattern: on\w+\s*="),
+])
+def test_rejections(text, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        sanitize_text(text)
+
+
+def test_strips_null_bytes_whitespace_and_checks_length():
+    assert sanitize_text("  hi\x00 there  ") == "hi there"
+    with pytest.raises(ValueError, match="maximum length of 3"):
+        sanitize_text("four", max_length=3)
+    with pytest.raises(ValueError, match="must be a string"):
+        sanitize_text(42)
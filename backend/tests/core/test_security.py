@@ -0,0 +1,40 @@
+"""Tests for off-loop password hashing."""
+
+import pytest
+
+from app.core import security
+from app.core.security import PasswordHasher, PasswordHashingBusyError
+
+
+@pytest.fixture(autouse=True)
+def cheap_rounds(monkeypatch):
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 4)
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify_roundtrip():
+    hasher = PasswordHasher(workers=1, max_pending=4)
+    hashed = await hasher.hash("Secret123")
+
+    assert await hasher.verify("Secret123", hashed)
+    assert not await hasher.verify("wrong", hashed)
+    assert hasher.stats()["pending"] == 0
+    hasher.shutdown()
+
+
+def test_needs_rehash_on_cost_change():
+    hashed = security.get_password_hash("Secret123", rounds=5)
+
+    assert security.get_hash_rounds(hashed) == 5
+    assert security.needs_rehash(hashed)
+    assert not security.needs_rehash(security.get_password_hash("Secret123"))
+    assert not security.needs_rehash("not-a-bcrypt-hash")
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_work():
+    hasher = PasswordHasher(workers=1, max_pending=0)
+
+    with pytest.raises(PasswordHashingBusyError):
+        await hasher.hash("Secret123")
+    assert hasher.stats()["rejected"] == 1
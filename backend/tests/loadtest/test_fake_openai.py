@@ -0,0 +1,103 @@
+"""Tests for the fake OpenAI server and the AI load benchmark."""
+
+import json
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.core.http_client import SharedHTTPClient
+from app.db.database import get_database
+from app.main import app
+from app.services.ai_service import ai_service
+from loadtest.bench_ai import percentile, run_benchmark, seed
+from loadtest.fake_openai import FakeOpenAIConfig, create_app
+
+
+def fake_client(**config) -> SharedHTTPClient:
+    fake = create_app(FakeOpenAIConfig(latency_ms=0, latency_jitter_ms=0, stream_chunk_ms=0, **config))
+    return SharedHTTPClient(transport=httpx.ASGITransport(app=fake))
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["heka_test_db"]
+
+
+@pytest.mark.asyncio
+async def test_prompts_get_deterministic_well_formed_answers(db, monkeypatch):
+    shared = fake_client(cached_prompt_ratio=0.5)
+    monkeypatch.setattr("app.services.llm_router.http_client", shared)
+    args = [{"_id": "507f1f77bcf86cd799439014", "title": "Chores", "category": "lifestyle"}]
+
+    goals, _ = await ai_service.generate_goal_suggestions(args, db)
+    again, _ = await ai_service.generate_goal_suggestions(args, db)
+    questions, _ = await ai_service.generate_checkin_questions(args, db)
+    payload, _ = ai_service.build_mediation_request("I feel tired.", "I feel blamed.", "lifestyle")
+    content, usage, _, _ = await ai_service._post_chat(payload, timeout=5, feature="mediation", db=db)
+    await shared.aclose()
+
+    assert goals == again and len(goals) == 3
+    assert all("question" in q for q in questions)
+    assert set(json.loads(content)) >= {"summary", "common_ground", "suggestions"}
+    assert usage.cached_prompt_tokens == usage.prompt_tokens // 2 > 0
+
+
+@pytest.mark.asyncio
+async def test_faults_are_injected():
+    fake = create_app(FakeOpenAIConfig(latency_ms=0, latency_jitter_ms=0, rate_limit_ratio=1.0))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fake), base_url="http://fake") as client:
+        limited = await client.post("/v1/chat/completions", json={"messages": []})
+        assert limited.status_code == 429
+        assert limited.headers["retry-after"] == "1"
+
+        await client.put("/_config", json={"rate_limit_ratio": 0, "malformed_ratio": 1})
+        malformed = await client.post("/v1/chat/completions", json={"messages": []})
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(malformed.json()["choices"][0]["message"]["content"])
+
+        stats = (await client.get("/_stats")).json()["counters"]
+        assert stats["rate_limited"] == 1 and stats["malformed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_reports_usage_last():
+    fake = create_app(FakeOpenAIConfig(latency_ms=0, latency_jitter_ms=0, stream_chunk_ms=0))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fake), base_url="http://fake") as client:
+        resp = await client.post("/v1/chat/completions", json={
+            "messages": [{"role": "user", "content": "hi"}],
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        })
+
+    events = [line[6:] for line in resp.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(e) for e in events[:-1]]
+    content = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks if c["choices"])
+    assert json.loads(content)["message"].startswith("fake response")
+    assert chunks[-1]["choices"] == [] and chunks[-1]["usage"]["completion_tokens"] > 0
+
+
+def test_percentile_interpolates():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_benchmark_drives_mediation_end_to_end(db, monkeypatch):
+    shared = fake_client()
+    monkeypatch.setattr("app.services.llm_router.http_client", shared)
+    app.dependency_overrides[get_database] = lambda: db
+    data = await seed(db, "mediate", 6)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        result = await run_benchmark(client, data.requests, concurrency=3)
+    app.dependency_overrides.clear()
+    await shared.aclose()
+
+    summary = result.summary()
+    assert summary["requests"] == summary["ok"] == 6
+    assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+    assert await db.ai_insights.count_documents({}) == 6
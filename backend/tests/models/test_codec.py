@@ -0,0 +1,65 @@
+"""Tests for MongoCodec: decoded documents must equal validated models."""
+
+import copy
+from datetime import date, datetime
+
+import pytest
+from bson import ObjectId
+
+from app.models.couple import CoupleInDB
+from app.models.relationship_checkin import RelationshipCheckInInDB
+from app.models.relationship_goal import GoalStatus, RelationshipGoalInDB
+from loadtest.bench_codec import documents, legacy_from_mongo
+
+USER_A = "507f1f77bcf86cd799439011"
+USER_B = "507f1f77bcf86cd799439012"
+
+
+@pytest.mark.parametrize("name,model,document", documents())
+def test_decode_matches_validation_and_round_trips(name, model, document):
+    original = copy.deepcopy(document)
+
+    decoded = model.from_mongo(document)
+
+    assert document == original
+    assert decoded == legacy_from_mongo(model, document)
+    assert decoded.model_dump() == legacy_from_mongo(model, document).model_dump()
+    assert decoded.to_mongo() == document
+
+
+def test_goal_fields_are_converted():
+    document = {
+        "_id": ObjectId(), "couple_id": ObjectId(USER_A), "created_by_user_id": ObjectId(USER_B),
+        "title": "Walk", "status": "paused", "target_date": datetime(2024, 12, 1),
+        "progress": [{"id": "not-an-object-id", "date": datetime(2024, 5, 1), "reactions": []}],
+        "extra_key": "ignored",
+    }
+
+    goal = RelationshipGoalInDB.from_mongo(document)
+
+    assert goal.id == str(document["_id"]) and goal.couple_id == USER_A
+    assert goal.status is GoalStatus.PAUSED
+    assert goal.target_date == date(2024, 12, 1)
+    assert goal.progress[0].id == "not-an-object-id"
+    assert goal.progress[0].date == date(2024, 5, 1)
+    # Defaults are filled in for missing fields, as validation would
+    assert goal.progress_updates == 0 and goal.progress[0].notes is None
+    assert not hasattr(goal, "extra_key")
+
+
+def test_unknown_enum_values_are_rejected():
+    with pytest.raises(ValueError):
+        RelationshipGoalInDB.from_mongo({"couple_id": USER_A, "created_by_user_id": USER_B, "title": "x",
+                                         "status": "archived"})
+
+
+def test_model_specific_hooks_still_apply():
+    couple = CoupleInDB.from_mongo({"_id": ObjectId(), "user1_id": ObjectId(USER_A), "user2_id": ObjectId(USER_B)})
+    assert couple.member_ids == [USER_A, USER_B]
+    assert couple.to_mongo()["member_ids"] == [ObjectId(USER_A), ObjectId(USER_B)]
+
+    checkin = RelationshipCheckInInDB.from_mongo({
+        "couple_id": ObjectId(USER_A), "week_start_date": datetime(2024, 6, 3),
+        "completed_by": [ObjectId(USER_A)], "completed_by_user_id": ObjectId(USER_B),
+    })
+    assert checkin.completed_by == [USER_A, USER_B]
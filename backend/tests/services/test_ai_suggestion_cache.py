@@ -0,0 +1,100 @@
+"""Tests for stale-while-revalidate and coalescing in the suggestion cache."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.services.ai_suggestion_cache import AISuggestionCacheService
+
+COUPLE_ID = "507f1f77bcf86cd799439013"
+
+
+@pytest.fixture
+async def db():
+    db = AsyncMongoMockClient()["heka_test_db"]
+    await db.ai_suggestion_cache.create_index(
+        [("couple_id", 1), ("suggestion_type", 1)], unique=True
+    )
+    return db
+
+
+def make_generator(calls, delay=0.05, title="Fresh"):
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return [{"title": title, "description": "d"}], ["a1"]
+    return generate
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_generation(db):
+    service = AISuggestionCacheService()
+    calls = []
+    generate = make_generator(calls)
+
+    results = await asyncio.gather(*(
+        service.get_or_generate(COUPLE_ID, "goals", generate, db) for _ in range(5)
+    ))
+
+    assert len(calls) == 1
+    assert all(r == [{"title": "Fresh", "description": "d"}] for r in results)
+    assert await db.ai_suggestion_cache.count_documents({}) == 1
+
+
+@pytest.mark.asyncio
+async def test_misses_coalesce_across_workers(db):
+    worker_a = AISuggestionCacheService(peer_poll_interval=0.01)
+    worker_b = AISuggestionCacheService(peer_poll_interval=0.01)
+    calls = []
+    generate = make_generator(calls, delay=0.1)
+
+    first, second = await asyncio.gather(
+        worker_a.get_or_generate(COUPLE_ID, "goals", generate, db),
+        worker_b.get_or_generate(COUPLE_ID, "goals", generate, db),
+    )
+
+    assert len(calls) == 1
+    assert first == second
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing(db):
+    service = AISuggestionCacheService()
+    await service.save_suggestions(COUPLE_ID, "checkins", [{"question": "Old?"}], [], db)
+    await service.invalidate_cache(COUPLE_ID, db=db)
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        return [{"question": "New?"}], []
+
+    served = await service.get_or_generate(COUPLE_ID, "checkins", generate, db)
+    assert served == [{"question": "Old?"}]
+
+    # Let the background refresh finish
+    await asyncio.gather(*service._inflight.values())
+    assert len(calls) == 1
+    fresh = await service.get_cached_suggestions(COUPLE_ID, "checkins", db)
+    assert fresh.suggestions == [{"question": "New?"}]
+    doc = await db.ai_suggestion_cache.find_one({"couple_id": ObjectId(COUPLE_ID)})
+    assert "refresh_started_at" not in doc
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_releases_lease(db):
+    service = AISuggestionCacheService()
+
+    async def failing():
+        raise RuntimeError("model down")
+
+    with pytest.raises(RuntimeError):
+        await service.get_or_generate(COUPLE_ID, "goals", failing, db)
+
+    calls = []
+    assert await service.get_or_generate(COUPLE_ID, "goals", make_generator(calls), db)
+    assert len(calls) == 1
+    entry = await service.get_cached_suggestions(COUPLE_ID, "goals", db)
+    assert entry.expires_at > datetime.utcnow() + timedelta(days=6)
@@ -0,0 +1,77 @@
+"""Tests for couple lookups and the member_ids backfill."""
+
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app import main
+from app.models.couple import CoupleInDB
+from app.services import couple_service
+
+USER_A = "507f1f77bcf86cd799439011"
+USER_B = "507f1f77bcf86cd799439012"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(couple_service, "_member_ids_backfilled", False)
+    return AsyncMongoMockClient()["heka_test_db"]
+
+
+@pytest.mark.asyncio
+async def test_new_couples_store_member_ids(db):
+    couple = CoupleInDB(user1_id=USER_A, user2_id=USER_B)
+    await db.couples.insert_one(couple.to_mongo())
+
+    doc = await db.couples.find_one({"member_ids": ObjectId(USER_B)})
+    assert doc is not None
+
+    found = await couple_service.find_couple_for_user(USER_A, db)
+    assert found.member_ids == [USER_A, USER_B]
+
+
+@pytest.mark.asyncio
+async def test_legacy_documents_found_before_and_after_backfill(db):
+    await db.couples.insert_one({
+        "user1_id": ObjectId(USER_A),
+        "user2_id": ObjectId(USER_B),
+        "status": "active",
+    })
+
+    # Before the backfill the legacy $or query still finds the couple
+    assert await couple_service.find_couple_for_user(USER_B, db) is not None
+
+    assert await couple_service.backfill_member_ids(db, batch_size=1) == 1
+    assert couple_service.is_backfill_complete()
+
+    doc = await db.couples.find_one({})
+    assert doc["member_ids"] == [ObjectId(USER_A), ObjectId(USER_B)]
+    assert await couple_service.find_couple_for_user(USER_B, db) is not None
+
+
+@pytest.mark.asyncio
+async def test_active_only_and_couple_scope(db):
+    couple = CoupleInDB(user1_id=USER_A, user2_id=USER_B, status="ended")
+    result = await db.couples.insert_one(couple.to_mongo())
+
+    assert await couple_service.find_couple_for_user(USER_A, db) is None
+    found = await couple_service.find_couple_for_user(
+        USER_A, db, couple_id=str(result.inserted_id), active_only=False
+    )
+    assert found is not None
+    assert await couple_service.find_couple_for_user(
+        USER_A, db, couple_id=str(ObjectId()), active_only=False
+    ) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_startup_backfill_is_logged(db, monkeypatch, caplog):
+    async def broken(db):
+        raise RuntimeError("primary stepped down")
+
+    monkeypatch.setattr(main, "backfill_member_ids", broken)
+    await main._backfill_member_ids(db)
+
+    assert "member_ids backfill failed" in caplog.text
+    assert "primary stepped down" in caplog.text
+    assert not couple_service.is_backfill_complete()
@@ -0,0 +1,186 @@
+"""Tests for the incrementally maintained couple summaries."""
+
+from datetime import date, datetime, timedelta
+
+import httpx
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.api.dependencies import get_current_user
+from app.db.database import get_database
+from app.main import app
+from app.models.argument import ArgumentInDB, ArgumentStatus
+from app.models.couple import CoupleInDB
+from app.models.couple_summary import SUMMARY_VERSION
+from app.models.relationship_goal import RelationshipGoalInDB
+from app.models.usage import UsageType
+from app.models.user import UserInDB
+from app.services.couple_summary_service import (
+    MAX_RECENT_ARGUMENTS,
+    couple_summary_service,
+)
+from app.services.subscription_service import subscription_service
+from app.services.usage_service import usage_service
+
+USER_ID = "507f1f77bcf86cd799439011"
+PARTNER_ID = "507f1f77bcf86cd799439012"
+
+
+@pytest.fixture
+async def db():
+    db = AsyncMongoMockClient()["heka_test_db"]
+    result = await db.couples.insert_one(CoupleInDB(user1_id=USER_ID, user2_id=PARTNER_ID).to_mongo())
+    db.couple_id = str(result.inserted_id)
+    return db
+
+
+async def _create_argument(db, title, created_at):
+    argument = ArgumentInDB(couple_id=db.couple_id, title=title, category="lifestyle", created_at=created_at)
+    result = await db.arguments.insert_one(argument.to_mongo())
+    argument.id = str(result.inserted_id)
+    await couple_summary_service.argument_created(argument, db)
+    return argument
+
+
+@pytest.mark.asyncio
+async def test_incremental_updates_match_a_rebuild(db):
+    await couple_summary_service.get(db.couple_id, db)
+    start = datetime(2026, 1, 1)
+
+    arguments = [
+        await _create_argument(db, f"Argument {i}", start + timedelta(days=i))
+        for i in range(MAX_RECENT_ARGUMENTS + 2)
+    ]
+    await db.arguments.update_one({"_id": ObjectId(arguments[-1].id)}, {"$set": {"status": "active"}})
+    await couple_summary_service.argument_status_changed(
+        db.couple_id, arguments[-1].id, ArgumentStatus.ACTIVE, db
+    )
+    await db.arguments.delete_one({"_id": ObjectId(arguments[-2].id)})
+    await couple_summary_service.argument_deleted(db.couple_id, arguments[-2].id, db)
+
+    goals = []
+    for title in ("Date night", "Walks"):
+        goal = RelationshipGoalInDB(couple_id=db.couple_id, title=title, created_by_user_id=USER_ID)
+        goal.id = str((await db.relationship_goals.insert_one(goal.to_mongo())).inserted_id)
+        await couple_summary_service.goal_created(goal, db)
+        goals.append(goal)
+    await db.relationship_goals.update_one({"_id": ObjectId(goals[0].id)}, {"$set": {"status": "completed"}})
+    await couple_summary_service.goal_closed(db.couple_id, goals[0].id, db)
+
+    checkin = {"couple_id": ObjectId(db.couple_id), "week_start_date": datetime(2026, 1, 5), "status": "pending"}
+    checkin["_id"] = (await db.relationship_checkins.insert_one(dict(checkin))).inserted_id
+    await couple_summary_service.checkin_changed(checkin, db)
+
+    for argument in arguments[:3]:
+        await usage_service.track_usage(db.couple_id, UsageType.ARGUMENT_RESOLUTION, argument.id, db=db)
+
+    summary = await couple_summary_service.get(db.couple_id, db)
+
+    assert [a.title for a in summary.recent_arguments] == [
+        "Argument 6", "Argument 4", "Argument 3", "Argument 2", "Argument 1"
+    ]
+    assert summary.recent_arguments[0].status == "active"
+    assert [g.title for g in summary.active_goals] == ["Walks"]
+    assert summary.latest_checkin.id == str(checkin["_id"])
+    assert couple_summary_service.usage_count(summary, UsageType.ARGUMENT_RESOLUTION) == 3
+    assert await couple_summary_service.check(db) == []
+
+
+@pytest.mark.asyncio
+async def test_check_reports_and_fixes_drift(db):
+    await couple_summary_service.get(db.couple_id, db)
+    # A write that bypassed the hooks
+    await db.arguments.insert_one(ArgumentInDB(couple_id=db.couple_id, title="Chores", category="lifestyle").to_mongo())
+
+    assert await couple_summary_service.check(db, fix=True) == [
+        {"couple_id": db.couple_id, "sections": ["recent_arguments"]}
+    ]
+    assert await couple_summary_service.check(db) == []
+
+
+@pytest.mark.asyncio
+async def test_rebuild_all_only_rebuilds_missing_and_outdated_summaries(db):
+    other = await db.couples.insert_one(CoupleInDB(user1_id=str(ObjectId()), user2_id=str(ObjectId())).to_mongo())
+    await couple_summary_service.get(db.couple_id, db)
+
+    assert await couple_summary_service.rebuild_all(db) == 1
+    assert await couple_summary_service.rebuild_all(db) == 0
+
+    await db.couple_summaries.update_one({"couple_id": other.inserted_id}, {"$set": {"version": SUMMARY_VERSION - 1}})
+    assert await couple_summary_service.rebuild_all(db) == 1
+    assert await couple_summary_service.rebuild_all(db, force=True) == 2
+
+
+@pytest.mark.asyncio
+async def test_subscription_updates_refresh_subscription_and_usage(db):
+    await couple_summary_service.get(db.couple_id, db)
+    subscription = await subscription_service.get_subscription(db.couple_id, db)
+    await usage_service.track_usage(db.couple_id, UsageType.ARGUMENT_RESOLUTION, str(ObjectId()), subscription, db)
+    summary = await couple_summary_service.get(db.couple_id, db)
+    assert couple_summary_service.usage_count(summary, UsageType.ARGUMENT_RESOLUTION) == 1
+
+    period_start = datetime.combine(date.today() + timedelta(days=30), datetime.min.time())
+    await subscription_service.update_subscription(subscription.id, {
+        "tier": "premium",
+        "status": "active",
+        "current_period_start": period_start,
+        "current_period_end": period_start + timedelta(days=30),
+    }, db)
+
+    summary = await couple_summary_service.get(db.couple_id, db)
+    assert summary.subscription.tier.value == "premium"
+    assert summary.usage.period_start == period_start
+    assert couple_summary_service.usage_count(summary, UsageType.ARGUMENT_RESOLUTION) == 0
+    assert couple_summary_service.check_usage_limit(summary, UsageType.ARGUMENT_RESOLUTION) == (True, 0, -1)
+
+
+@pytest.mark.asyncio
+async def test_trial_limit_is_enforced_from_the_summary(db):
+    user = UserInDB(id=USER_ID, email="u@example.com", password_hash="x", name="U", age=30)
+    app.dependency_overrides[get_database] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        for i in range(5):
+            created = await client.post(
+                "/api/arguments/create", json={"title": f"Argument {i}", "category": "lifestyle"}
+            )
+            assert created.status_code == 201
+        blocked = await client.post("/api/arguments/create", json={"title": "One more", "category": "lifestyle"})
+        usage = await client.get("/api/subscriptions/usage")
+    app.dependency_overrides.clear()
+
+    assert blocked.status_code == 403
+    assert blocked.json()["detail"].startswith("Trial limit reached. You've used 5/5")
+    assert usage.json()["usage_count"] == 5
+    assert await couple_summary_service.check(db) == []
+
+
+@pytest.mark.asyncio
+async def test_account_deletion_frees_the_partners_goal_slots(db):
+    user = UserInDB(id=USER_ID, email="u@example.com", password_hash="x", name="U", age=30)
+    partner = UserInDB(id=PARTNER_ID, email="p@example.com", password_hash="x", name="P", age=30)
+    current = {"user": user}
+    app.dependency_overrides[get_database] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: current["user"]
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        for i in range(10):
+            created = await client.post("/api/goals/create", json={"title": f"Goal {i}"})
+            assert created.status_code == 201
+        capped = await client.post("/api/goals/create", json={"title": "One more"})
+        deleted = await client.delete("/api/users/me/account", params={"confirmation": "DELETE"})
+
+        current["user"] = partner
+        overview = await client.get("/api/dashboard/overview")
+        created = await client.post("/api/goals/create", json={"title": "Our goal"})
+    app.dependency_overrides.clear()
+
+    assert capped.status_code == 400
+    assert deleted.status_code == 200
+    assert overview.json()["goals"] == []
+    assert created.status_code == 201
+    assert await couple_summary_service.check(db) == []
@@ -0,0 +1,102 @@
+"""Tests for the Mongo-backed job queue and worker."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.models.job import JobStatus, JobType
+from app.services.job_queue import PermanentJobError, job_queue_service
+from app.worker import JobWorker
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["heka_test_db"]
+
+
+async def _raw(db, job):
+    return await db.jobs.find_one({"_id": ObjectId(job.id)})
+
+
+@pytest.mark.asyncio
+async def test_claim_is_exclusive_and_complete_settles(db):
+    job = await job_queue_service.enqueue(JobType.HARMONY_REPORT, {"checkin_id": "x"}, db)
+
+    claimed = await job_queue_service.claim("worker-a", db)
+    assert claimed.id == job.id
+    assert claimed.status == JobStatus.RUNNING
+    assert claimed.attempts == 1
+    assert await job_queue_service.claim("worker-b", db) is None
+
+    assert await job_queue_service.complete(claimed, "worker-a", {"ok": True}, db)
+    doc = await _raw(db, job)
+    assert doc["status"] == "succeeded"
+    assert doc["result"] == {"ok": True}
+    assert doc["expires_at"] > datetime.utcnow()
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_then_dead_letter(db):
+    job = await job_queue_service.enqueue(JobType.HARMONY_REPORT, {}, db, max_attempts=2)
+
+    claimed = await job_queue_service.claim("w", db)
+    assert await job_queue_service.fail(claimed, "w", "boom", db) == JobStatus.QUEUED
+    doc = await _raw(db, job)
+    assert doc["run_at"] > datetime.utcnow()
+    # Not runnable until the backoff elapses
+    assert await job_queue_service.claim("w", db) is None
+
+    await db.jobs.update_one({"_id": doc["_id"]}, {"$set": {"run_at": datetime.utcnow()}})
+    claimed = await job_queue_service.claim("w", db)
+    assert claimed.attempts == 2
+    assert await job_queue_service.fail(claimed, "w", "boom again", db) == JobStatus.DEAD
+    doc = await _raw(db, job)
+    assert doc["status"] == "dead"
+    assert doc["last_error"] == "boom again"
+    assert doc["expires_at"] > datetime.utcnow()
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed_and_stale_worker_ignored(db):
+    job = await job_queue_service.enqueue(JobType.HARMONY_REPORT, {}, db)
+    stale = await job_queue_service.claim("crashed", db)
+    await db.jobs.update_one(
+        {"_id": ObjectId(job.id)},
+        {"$set": {"lease_until": datetime.utcnow() - timedelta(seconds=1)}}
+    )
+
+    reclaimed = await job_queue_service.claim("healthy", db)
+    assert reclaimed.id == job.id
+    assert reclaimed.attempts == 2
+
+    # The original worker finishing late must not clobber the new lease
+    assert not await job_queue_service.complete(stale, "crashed", {"late": True}, db)
+    assert (await _raw(db, job))["worker_id"] == "healthy"
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_handlers_and_dead_letters_permanent_errors(db):
+    async def ok(job, db):
+        return {"echo": job.payload["n"]}
+
+    async def refuse(job, db):
+        raise PermanentJobError("cannot ever succeed")
+
+    worker = JobWorker(db, handlers={
+        JobType.HARMONY_REPORT: ok,
+        JobType.MEDIATE_ARGUMENT: refuse,
+    })
+    good = await job_queue_service.enqueue(JobType.HARMONY_REPORT, {"n": 1}, db)
+    bad = await job_queue_service.enqueue(JobType.MEDIATE_ARGUMENT, {}, db)
+
+    assert await worker.run_once()
+    assert await worker.run_once()
+    assert not await worker.run_once()
+
+    assert (await _raw(db, good))["result"] == {"echo": 1}
+    bad_doc = await _raw(db, bad)
+    assert bad_doc["status"] == "dead"
+    assert bad_doc["attempts"] == 1
+    assert worker.stats()["succeeded"] == 1
@@ -0,0 +1,169 @@
+"""Tests for LLM provider routing: retries, failover, circuit breaking and hedging."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.models.llm_usage import TokenUsage
+from app.services.llm_router import (
+    CircuitBreaker,
+    LLMProvider,
+    LLMProviderError,
+    LLMRouter,
+    LLMUnavailableError,
+    OpenAICompatibleProvider,
+)
+from loadtest.fake_openai import FakeOpenAIConfig, create_app
+
+PAYLOAD = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hi"}]}
+
+
+async def no_sleep(_):
+    return None
+
+
+class StubProvider(LLMProvider):
+    """Plays back a script of results: a float is a delay before answering, an exception is raised."""
+
+    def __init__(self, name, script, breaker=None):
+        super().__init__(name, f"{name}-model", breaker or CircuitBreaker(3, 30))
+        self.script = list(script)
+        self.calls = 0
+
+    async def complete(self, payload, timeout):
+        self.calls += 1
+        step = self.script.pop(0) if self.script else 0.0
+        if isinstance(step, Exception):
+            raise step
+        await asyncio.sleep(step)
+        return f"answer from {self.name}", TokenUsage(prompt_tokens=1)
+
+    async def stream(self, payload, timeout):
+        self.calls += 1
+        step = self.script.pop(0) if self.script else 0.0
+        if isinstance(step, Exception):
+            raise step
+        yield {"choices": [{"delta": {"content": self.name}}]}
+
+
+def fake_provider(name, **config):
+    app = create_app(FakeOpenAIConfig(latency_ms=0, latency_jitter_ms=0, stream_chunk_ms=0, **config))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    return OpenAICompatibleProvider(name, "http://fake/v1", "key", f"{name}-model", client=client)
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_primary_fails_over_to_secondary():
+    primary = fake_provider("primary", rate_limit_ratio=1.0)
+    secondary = fake_provider("secondary")
+    router = LLMRouter([primary, secondary], max_attempts=2, sleep=no_sleep)
+
+    content, usage, served_by = await router.complete(PAYLOAD, timeout=5)
+
+    assert served_by is secondary
+    assert "fake response" in content and usage.prompt_tokens > 0
+    assert router.stats()["retries"] == 1 and router.stats()["failovers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_error_skips_retries():
+    primary = StubProvider("primary", [LLMProviderError("primary", "HTTP 400", 400, retryable=False)])
+    secondary = StubProvider("secondary", [])
+    router = LLMRouter([primary, secondary], max_attempts=3, sleep=no_sleep)
+
+    _, _, served_by = await router.complete(PAYLOAD, timeout=5)
+
+    assert served_by is secondary
+    assert primary.calls == 1
+    assert primary.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_is_skipped_then_probed():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: now[0])
+    errors = [LLMProviderError("primary", "HTTP 503", 503) for _ in range(2)]
+    primary = StubProvider("primary", errors, breaker=breaker)
+    secondary = StubProvider("secondary", [])
+    router = LLMRouter([primary, secondary], max_attempts=2, sleep=no_sleep)
+
+    await router.complete(PAYLOAD, timeout=5)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    _, _, served_by = await router.complete(PAYLOAD, timeout=5)
+    assert served_by is secondary and primary.calls == 2
+
+    now[0] = 31
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    _, _, served_by = await router.complete(PAYLOAD, timeout=5)
+    assert served_by is primary
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_fastest_answer_wins():
+    primary = StubProvider("primary", [5.0])
+    secondary = StubProvider("secondary", [0.0])
+    for _ in range(5):
+        primary.latency.add(0.01)
+    router = LLMRouter(
+        [primary, secondary], hedge_min_samples=5, hedge_min_delay_seconds=0.02, sleep=no_sleep
+    )
+
+    content, _, served_by = await asyncio.wait_for(router.complete(PAYLOAD, timeout=10), 1)
+
+    assert served_by is secondary and content == "answer from secondary"
+    assert router.stats()["hedges"] == router.stats()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_all_providers_down_raises_unavailable():
+    primary = fake_provider("primary", rate_limit_ratio=1.0)
+    router = LLMRouter([primary], max_attempts=3, sleep=no_sleep)
+
+    for _ in range(2):
+        with pytest.raises(LLMUnavailableError):
+            await router.complete(PAYLOAD, timeout=5)
+
+    assert primary.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(LLMUnavailableError) as exc:
+        await router.complete(PAYLOAD, timeout=5)
+    assert exc.value.retry_after >= 5
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_before_first_chunk():
+    primary = StubProvider("primary", [LLMProviderError("primary", "HTTP 502", 502)])
+    secondary = StubProvider("secondary", [])
+    router = LLMRouter([primary, secondary], max_attempts=1, sleep=no_sleep)
+
+    chunks = [(provider, chunk) async for provider, chunk in router.stream(PAYLOAD, timeout=5)]
+
+    assert [provider for provider, _ in chunks] == [secondary]
+    assert primary.breaker.state == CircuitBreaker.CLOSED  # one failure, below threshold
+
+
+@pytest.mark.asyncio
+async def test_garbled_stream_chunk_is_a_provider_failure():
+    garbled = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, content=b'data: {"choices": [{"del\n\n')
+    ))
+    primary = OpenAICompatibleProvider("primary", "http://garbled/v1", "key", "primary-model", client=garbled)
+    secondary = StubProvider("secondary", [])
+    router = LLMRouter([primary, secondary], max_attempts=1, sleep=no_sleep)
+
+    chunks = [(provider, chunk) async for provider, chunk in router.stream(PAYLOAD, timeout=5)]
+
+    assert [provider for provider, _ in chunks] == [secondary]
+    assert router.stats()["failovers"] == 1
+    await garbled.aclose()
+
+
+def test_provider_without_stream_fails_at_construction():
+    class CompleteOnly(LLMProvider):
+        async def complete(self, payload, timeout):
+            return "", TokenUsage()
+
+    with pytest.raises(TypeError, match="stream"):
+        CompleteOnly("partial", "model")
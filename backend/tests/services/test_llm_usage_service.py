@@ -0,0 +1,112 @@
+"""Tests for LLM token, cost and latency accounting."""
+
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.core.http_client import SharedHTTPClient
+from app.models.llm_usage import TokenUsage
+from app.services.ai_service import ai_service
+from app.services.llm_usage_service import (
+    calculate_cost,
+    latency_bucket,
+    llm_usage_service,
+)
+from app.services.prompt_registry import CHECKIN_QUESTIONS as CHECKINS
+
+COUPLE_ID = "507f1f77bcf86cd799439013"
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["heka_test_db"]
+
+
+def test_cached_prompt_tokens_billed_at_cached_rate():
+    usage = TokenUsage(prompt_tokens=1_000_000, cached_prompt_tokens=400_000, completion_tokens=100_000)
+
+    # gpt-4o-mini: 0.15 input, 0.075 cached, 0.60 output per 1M tokens
+    expected = 0.6 * 0.15 + 0.4 * 0.075 + 0.1 * 0.60
+    assert calculate_cost("gpt-4o-mini-2024-07-18", usage) == pytest.approx(expected)
+    assert calculate_cost("gpt-4o-mini", TokenUsage()) == 0
+
+
+def test_gemini_failover_is_not_priced_as_gpt_4():
+    usage = TokenUsage(prompt_tokens=1_000_000, completion_tokens=1_000_000)
+
+    assert calculate_cost("gemini-2.0-flash", usage) == pytest.approx(0.10 + 0.40)
+    assert calculate_cost("gemini-2.0-flash-001", usage) == pytest.approx(0.10 + 0.40)
+    # Unlisted Gemini models fall back to the family's Pro rates, not gpt-4's
+    assert calculate_cost("gemini-3-pro", usage) == pytest.approx(2.50 + 15.00)
+
+
+def test_from_openai_reads_cached_tokens():
+    usage = TokenUsage.from_openai({
+        "prompt_tokens": 120,
+        "completion_tokens": 30,
+        "prompt_tokens_details": {"cached_tokens": 64},
+    })
+
+    assert (usage.prompt_tokens, usage.cached_prompt_tokens, usage.completion_tokens) == (120, 64, 30)
+    assert usage.total_tokens == 150
+    assert TokenUsage.from_openai(None).total_tokens == 0
+
+
+def test_latency_bucket_bounds():
+    assert latency_bucket(250) == "le_250"
+    assert latency_bucket(251) == "le_500"
+    assert latency_bucket(10**6) == "le_inf"
+
+
+@pytest.mark.asyncio
+async def test_calls_fold_into_one_daily_rollup(db):
+    usage = TokenUsage(prompt_tokens=100, cached_prompt_tokens=20, completion_tokens=50)
+
+    await llm_usage_service.record(db, "mediation", "gpt-4o-mini", usage, 300, couple_id=COUPLE_ID)
+    await llm_usage_service.record(db, "mediation", "gpt-4o-mini", usage, 900, couple_id=COUPLE_ID)
+    await llm_usage_service.record(
+        db, "mediation", "gpt-4o-mini", TokenUsage(), 70, couple_id=COUPLE_ID, success=False
+    )
+
+    docs = await db.llm_usage_daily.find({}).to_list(length=None)
+    assert len(docs) == 1
+    doc = docs[0]
+    assert doc["couple_id"] == ObjectId(COUPLE_ID)
+    assert (doc["calls"], doc["errors"]) == (3, 1)
+    assert (doc["prompt_tokens"], doc["cached_prompt_tokens"], doc["completion_tokens"]) == (200, 40, 100)
+    assert doc["latency_ms_max"] == 900
+    assert doc["latency_hist"] == {"le_250": 1, "le_500": 1, "le_1000": 1}
+
+
+@pytest.mark.asyncio
+async def test_call_openai_records_usage(db, monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": json.dumps({"goals": []})}}],
+            "usage": {"prompt_tokens": 900, "completion_tokens": 40,
+                      "prompt_tokens_details": {"cached_tokens": 512}},
+        })
+
+    shared = SharedHTTPClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("app.services.llm_router.http_client", shared)
+
+    await ai_service._call_openai(CHECKINS, {"insights": "{}"}, feature="goal_suggestions", db=db, couple_id=COUPLE_ID)
+    await ai_service._call_openai(CHECKINS, {"insights": "{}"}, feature="goal_suggestions", db=db, couple_id=COUPLE_ID)
+    await shared.aclose()
+
+    day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    (row,) = await llm_usage_service.summarize(db, day, day + timedelta(days=1), couple_id=COUPLE_ID)
+    assert row["feature"] == "goal_suggestions"
+    assert row["model"] == ai_service.model
+    assert row["calls"] == 2
+    assert row["cached_prompt_tokens"] == 1024
+    assert row["cost_usd"] == pytest.approx(
+        2 * calculate_cost(ai_service.model, TokenUsage(
+            prompt_tokens=900, cached_prompt_tokens=512, completion_tokens=40
+        ))
+    )
+    assert sum(row["latency_hist"].values()) == 2
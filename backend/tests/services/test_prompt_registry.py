@@ -0,0 +1,84 @@
+"""Tests for the prompt registry and token-budgeted prompt building."""
+
+import pytest
+
+from app.services.ai_service import ai_service
+from app.services.prompt_registry import (
+    ListSection,
+    PromptRegistry,
+    TextSection,
+    compact_json,
+    estimate_tokens,
+    fit_sections,
+    prompt_registry,
+)
+
+
+def test_system_prefix_is_identical_across_requests():
+    short, _ = ai_service.build_mediation_request("I feel tired.", "I feel blamed.", "lifestyle")
+    long, _ = ai_service.build_mediation_request("a" * 5000, "b" * 5000, "finances")
+
+    assert short["messages"][0]["content"] == long["messages"][0]["content"]
+    assert short["messages"][0]["content"] == prompt_registry.get("mediation").system
+    assert "I feel tired." in short["messages"][1]["content"]
+
+
+def test_long_perspectives_are_trimmed_evenly_to_budget():
+    prompt = prompt_registry.get("mediation")
+    payload, _ = ai_service.build_mediation_request("a" * 9000, "b" * 9000 + "END", "lifestyle")
+    user = payload["messages"][1]["content"]
+
+    assert estimate_tokens(user) <= prompt.context_budget_tokens
+    assert abs(user.count("a") - user.count("b")) < 50
+    assert user.endswith("END")  # the tail of a perspective survives trimming
+    assert payload["max_tokens"] == prompt.max_tokens
+
+    # A short perspective is left whole; the long one gets the rest of the budget
+    payload, _ = ai_service.build_mediation_request("a" * 9000, "b" * 1000, "lifestyle")
+    user = payload["messages"][1]["content"]
+    assert user.count("b") == 1000 and user.count("a") > 5000
+
+
+def test_fixed_text_and_higher_priority_sections_are_kept():
+    fitted = fit_sections({
+        "note": "x" * 400,
+        "important": TextSection("i" * 400, priority=1),
+        "filler": TextSection("f" * 4000, priority=0),
+    }, budget_tokens=300)
+
+    assert fitted["note"] == "x" * 400
+    assert fitted["important"] == "i" * 400
+    assert estimate_tokens(fitted["filler"]) == 100
+
+
+def test_list_section_drops_least_relevant_items():
+    items = [compact_json({"summary": str(i) * 200}) for i in range(5)]
+
+    fitted = fit_sections({"insights": ListSection(items)}, budget_tokens=120)
+    assert fitted["insights"].splitlines() == items[:2]
+
+    floor = fit_sections({"insights": ListSection(items)}, budget_tokens=1)
+    assert floor["insights"] == items[0]
+
+
+def test_compact_json_has_no_padding():
+    assert compact_json({"a": [1, 2], "b": "é"}) == '{"a":[1,2],"b":"é"}'
+
+
+def test_prompt_limits_are_sized_per_prompt():
+    harmony = prompt_registry.get("harmony_report").build_payload("gpt-4o-mini", {
+        "user1_responses": "{}", "user2_responses": "{}",
+    })
+    goals = prompt_registry.get("goal_suggestions").build_payload("gpt-4o-mini", {"insights": "{}"})
+
+    assert "response_format" not in harmony
+    assert goals["response_format"] == {"type": "json_object"}
+    assert harmony["max_tokens"] < goals["max_tokens"] < prompt_registry.get("mediation").max_tokens
+    assert prompt_registry.versions()["mediation"] == "mediation@v1"
+
+
+def test_registry_rejects_duplicate_names():
+    registry = PromptRegistry()
+    registry.register(prompt_registry.get("mediation"))
+    with pytest.raises(ValueError):
+        registry.register(prompt_registry.get("mediation"))
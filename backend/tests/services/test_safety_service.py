@@ -0,0 +1,81 @@
+"""Tests for stored safety verdicts and their re-scoring."""
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.models.perspective import PerspectiveInDB, SafetyVerdict
+from app.services.safety_service import safety_service
+
+ARGUMENT_ID = "507f1f77bcf86cd799439021"
+USER_A = "507f1f77bcf86cd799439011"
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["heka_test_db"]
+
+
+def test_verdict_records_scanner_version_and_spans():
+    verdict = safety_service.scan_perspective("I had a panic attack.")
+
+    assert verdict.version == safety_service.version
+    assert verdict.concern_types == ["mental_health_crisis"]
+    assert verdict.matches == [{"type": "mental_health_crisis", "term": "panic attack", "start": 8, "end": 20}]
+
+
+def test_combine_uses_stored_verdicts_without_rescanning():
+    # The stored verdict wins over the content while its version is current
+    flagged = PerspectiveInDB(
+        argument_id=ARGUMENT_ID, user_id=USER_A, content="All fine.",
+        safety=SafetyVerdict(version=safety_service.version, concern_types=["violence"])
+    )
+    clean = safety_service.scan_perspective("We disagree about chores.")
+
+    check = safety_service.combine_verdicts(clean, safety_service.verdict_for(flagged))
+
+    assert check["concern_types"] == ["violence"]
+    assert safety_service.should_block_mediation(check)
+
+
+def test_stale_or_missing_verdicts_are_rescanned():
+    content = "Sometimes I feel suicidal."
+    stale = PerspectiveInDB(
+        argument_id=ARGUMENT_ID, user_id=USER_A, content=content,
+        safety=SafetyVerdict(version="old", concern_types=[])
+    )
+    legacy = PerspectiveInDB(argument_id=ARGUMENT_ID, user_id=USER_A, content=content)
+
+    for perspective in (stale, legacy):
+        assert safety_service.verdict_for(perspective).concern_types == ["self_harm"]
+
+
+def test_combined_check_matches_detect_safety_concerns():
+    p1, p2 = "I had a panic attack.", "He says you're crazy."
+
+    combined = safety_service.combine_verdicts(
+        safety_service.scan_perspective(p1), safety_service.scan_perspective(p2)
+    )
+
+    assert combined == safety_service.detect_safety_concerns(p1, p2)
+    assert [m["perspective"] for m in combined["matches"]] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_rescore_updates_only_stale_perspectives(db):
+    current = PerspectiveInDB(
+        argument_id=ARGUMENT_ID, user_id=USER_A, content="I want to die.",
+        safety=safety_service.scan_perspective("I want to die.")
+    )
+    stale = PerspectiveInDB(
+        argument_id=ARGUMENT_ID, user_id=USER_A, content="It was violent.",
+        safety=SafetyVerdict(version="old")
+    )
+    await db.perspectives.insert_many([current.to_mongo(), stale.to_mongo()])
+    await db.perspectives.insert_one({"content": "Pure substance abuse.", "user_id": USER_A})
+
+    assert await safety_service.rescore_perspectives(db, batch_size=1) == 2
+    assert await safety_service.rescore_perspectives(db) == 0
+
+    docs = await db.perspectives.find({}).to_list(length=None)
+    assert {d["safety"]["version"] for d in docs} == {safety_service.version}
+    assert [d["safety"]["concern_types"] for d in docs] == [["self_harm"], ["violence"], ["substance"]]